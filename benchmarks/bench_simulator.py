@@ -0,0 +1,97 @@
+"""Benchmark the tensor-contraction statevector simulator against a naive baseline.
+
+The baseline expands every gate to a full 2^n x 2^n matrix with Kronecker
+products and multiplies it into the state, which is what the engine avoids.
+
+    python benchmarks/bench_simulator.py --max-qubits 22 --naive-max-qubits 11
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "quantum_visualizer"))
+
+from gates import _P0, _P1, X, gate_matrix  # noqa: E402
+from simulator import StatevectorSimulator, zero_state  # noqa: E402
+
+
+def layered_circuit(num_qubits, depth, seed=0):
+    """Random rotations on every qubit followed by a brick-wall of CX gates"""
+    rng = np.random.default_rng(seed)
+    ops = []
+    for layer in range(depth):
+        for q in range(num_qubits):
+            ops.append(("h", [q]))
+            ops.append(("rz", [q], [float(rng.uniform(0, 2 * np.pi))]))
+        for q in range(layer % 2, num_qubits - 1, 2):
+            ops.append(("cx", [q, q + 1]))
+    return num_qubits, ops
+
+
+def _embed(factors, num_qubits):
+    """Kronecker product of per-qubit 2x2 factors ({qubit: matrix}), qubit 0 last"""
+    full = np.array([[1]], dtype=complex)
+    for q in reversed(range(num_qubits)):
+        full = np.kron(full, factors.get(q, np.eye(2, dtype=complex)))
+    return full
+
+
+def naive_run(circuit):
+    """Baseline: build the full operator for each gate and do a dense mat-vec"""
+    num_qubits, ops = circuit
+    state = zero_state(num_qubits)
+    for op in ops:
+        name, qubits = op[0], op[1]
+        if name == "cx":
+            control, target = qubits
+            full = _embed({control: _P0}, num_qubits) + _embed({control: _P1, target: X}, num_qubits)
+        else:
+            params = op[2] if len(op) > 2 else ()
+            full = _embed({qubits[0]: gate_matrix(name, params)}, num_qubits)
+        state = full @ state
+    return state
+
+
+def best_time(func, repeats):
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--min-qubits", type=int, default=4)
+    parser.add_argument("--max-qubits", type=int, default=20)
+    parser.add_argument("--naive-max-qubits", type=int, default=10,
+                        help="largest register for the full-matrix baseline (memory grows as 4^n)")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    engine = StatevectorSimulator()
+    print(f"{'qubits':>6} {'gates':>6} {'engine ms':>11} {'naive ms':>11} {'speed-up':>9}")
+    for n in range(args.min_qubits, args.max_qubits + 1):
+        circuit = layered_circuit(n, args.depth)
+        repeats = args.repeats if n < 18 else 1
+        engine_time, state = best_time(lambda: engine.run(circuit).state, repeats)
+
+        naive_cell, speedup_cell = "-", "-"
+        if n <= args.naive_max_qubits:
+            naive_time, reference = best_time(lambda: naive_run(circuit), repeats)
+            if not np.allclose(state, reference):
+                raise AssertionError(f"engine and baseline disagree at {n} qubits")
+            naive_cell = f"{naive_time * 1000:.2f}"
+            speedup_cell = f"{naive_time / engine_time:.1f}x"
+
+        print(f"{n:>6} {len(circuit[1]):>6} {engine_time * 1000:>11.2f} {naive_cell:>11} {speedup_cell:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,557 @@
+"""Headless benchmark suite for every visualization window and simulator kernel.
+
+Runs under Qt's offscreen platform. For each window it measures construction
+time, per-update latency percentiles while sweeping the window's controls,
+peak Python memory during the updates and the number of matplotlib figures
+created. Simulator and density kernels are timed the same way, and a small
+batch export checks that different sweep values render different files.
+Results are written as JSON so two runs can be compared:
+
+    python benchmarks/bench_visualizations.py --output before.json
+    python benchmarks/bench_visualizations.py --output after.json --compare before.json
+"""
+import argparse
+import gc
+import hashlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "quantum_visualizer"))
+
+# Metrics where larger is worse, used by --compare (p99 and max are too noisy
+# over a few dozen updates to flag regressions)
+LOWER_IS_BETTER = ("p50_ms", "p90_ms", "mean_ms", "construct_ms", "peak_kib",
+                   "figures_created", "figures_per_window")
+
+
+def latency_stats(samples):
+    """Latency percentiles in milliseconds for a list of durations in seconds"""
+    ms = np.asarray(samples) * 1000
+    return {
+        "count": len(ms),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p90_ms": float(np.percentile(ms, 90)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+class FigureCounter:
+    """Counts matplotlib Figure constructions while active"""
+
+    def __init__(self):
+        from matplotlib.figure import Figure
+        self.figure_class = Figure
+        self.original_init = Figure.__init__
+        self.count = 0
+
+    def __enter__(self):
+        original = self.original_init
+
+        def counting_init(fig, *args, **kwargs):
+            self.count += 1
+            original(fig, *args, **kwargs)
+        self.figure_class.__init__ = counting_init
+        return self
+
+    def __exit__(self, *exc):
+        self.figure_class.__init__ = self.original_init
+
+
+def measure(update, steps):
+    """Time ``update(step)`` for each step; returns latency stats"""
+    samples = []
+    for step in steps:
+        start = time.perf_counter()
+        update(step)
+        samples.append(time.perf_counter() - start)
+    return latency_stats(samples)
+
+
+def peak_memory(update, steps):
+    """Peak traced Python/NumPy allocation in KiB while running the updates"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    for step in steps:
+        update(step)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def slider_update(window, index):
+    """Move the index-th control and render synchronously, as a drag would"""
+    control = window.controls[index]
+    scheduler = getattr(window, "scheduler", None)
+    jobs = getattr(window, "jobs", None)
+
+    def update(value):
+        control.setValue(value)
+        if scheduler is not None:
+            scheduler.flush()
+        if jobs is not None:
+            # Includes the round trip through the worker pool
+            jobs.wait()
+    return update
+
+
+def combo_update(window, index):
+    control = window.controls[index]
+
+    def update(value):
+        control.setCurrentIndex(value % control.count())
+    return update
+
+
+def animation_update(window):
+    """One frame of the window's BlitAnimator, blitting like its timer does"""
+    animator = window.animator
+
+    def update(_):
+        animator._on_timeout()
+    return update
+
+
+def view_rotation(window):
+    """One mouse-drag step of the window's QPainter Bloch views, painted synchronously"""
+    def update(step):
+        for view in window.views:
+            view.set_view(view.azimuth + 2, 30 + 20 * np.sin(step / 10))
+            view.repaint()
+    return update
+
+
+def shots_update(window):
+    """Draw a fixed number of shots into the measurement histogram and redraw it"""
+    def update(shots):
+        window.run_shots(shots)
+    return update
+
+
+def circuit_pan(qubits, layers, columns, wires):
+    """Pan across a random-layer sample circuit with ``columns`` x ``wires`` in view"""
+    def make_update(window):
+        sample, qubit_control, layer_control = window.controls[:3]
+        qubit_control.setValue(qubits)
+        layer_control.setValue(layers)
+        sample.setCurrentIndex(2)
+        window.jobs.wait()
+        view = window.view[0]
+        view.fit(columns, wires)
+
+        def update(step):
+            window.pan(columns / 4 if step % 8 < 4 else -columns / 4)
+            window.scheduler.flush()
+        return update
+    return make_update
+
+
+def builder_edit(gates, wait_for_state=False):
+    """Drop and delete gates inside the visible part of a ``gates``-gate builder circuit"""
+    def make_update(window):
+        from PyQt6.QtWidgets import QApplication
+        editor, grid = window.editor, window.circuit_grid
+        window.controls[0].setValue(5)
+        rng = np.random.default_rng(0)
+        while len(grid) < gates:
+            editor.drop_gate("cx" if rng.random() < 0.3 else "ry", (0.4,), int(rng.integers(len(grid.columns) + 1)),
+                             int(rng.integers(grid.num_qubits)))
+        window.jobs.wait()
+
+        def update(step):
+            column, wire = step % 12, step % grid.num_qubits
+            if step % 2 and grid.at(column, wire) is not None:
+                editor.delete_gate(column, min(grid.at(column, wire).qubits))
+            else:
+                editor.drop_gate("h", (), column, wire)
+            QApplication.processEvents()  # Paints the changed columns
+            if wait_for_state:
+                window.jobs.wait()
+                window.scheduler.flush()
+        return update
+    return make_update
+
+
+def shown(builder):
+    """Builder of a page widget shown as its own window"""
+    def build():
+        window = builder()
+        window.resize(1000, 800)
+        window.show()
+        return window
+    return build
+
+
+def window_cases(main):
+    """(window name, builder, [(update name, make_update(window), steps)])"""
+    sweep = list(range(0, 101, 2)) * 2
+    return [
+        ("quantum_states", main.visualize_quantum_states, [
+            ("phase", lambda w: slider_update(w, 1), sweep),
+            ("state", lambda w: combo_update(w, 0), list(range(24))),
+        ]),
+        ("superposition", main.visualize_superposition, [
+            ("alpha", lambda w: slider_update(w, 0), sweep),
+            ("phase", lambda w: slider_update(w, 1), sweep),
+            ("rotate_view", view_rotation, list(range(120))),
+        ]),
+        ("entanglement", main.visualize_entanglement, [
+            ("state", lambda w: combo_update(w, 0), list(range(24))),
+            ("animation_frame", animation_update, list(range(120))),
+            ("rotate_view", view_rotation, list(range(120))),
+        ]),
+        ("bloch", main.visualize_bloch, [
+            ("rotate_view", view_rotation, list(range(120))),
+        ]),
+        ("interference", main.visualize_interference, [
+            ("path1", lambda w: slider_update(w, 0), sweep),
+            ("paths", lambda w: slider_update(w, 3), list(range(2, 33, 2))),
+        ]),
+        ("bloch_grid", main.visualize_bloch_grid, [
+            ("param", lambda w: slider_update(w, 2), list(range(0, 101, 4))),
+        ]),
+        ("measurement", main.visualize_measurement, [
+            ("qubits", lambda w: slider_update(w, 1), list(range(2, 17, 2))),
+            ("stream_frame", animation_update, list(range(60))),
+            ("shots_1e7", shots_update, [10 ** 7] * 5),
+        ]),
+        ("circuit", main.visualize_circuit_viewer, [
+            ("pan_labels_1k", circuit_pan(16, 40, 20, 10), list(range(40))),
+            ("pan_labels_150k", circuit_pan(50, 2000, 20, 10), list(range(40))),
+            ("pan_boxes_150k", circuit_pan(50, 2000, 100, 50), list(range(40))),
+            ("pan_density_150k", circuit_pan(50, 2000, 4000, 50), list(range(40))),
+        ]),
+        ("circuit_builder", shown(main.visualize_circuit_builder), [
+            ("edit_300", builder_edit(300), list(range(100))),
+            ("edit_300_with_state", builder_edit(300, wait_for_state=True), list(range(40))),
+        ]),
+    ]
+
+
+def close_window(app, window):
+    from window_manager import release_window
+    release_window(window)
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    gc.collect()
+
+
+def bench_windows(app, repeats):
+    import main
+    results = {}
+    for name, builder, updates in window_cases(main):
+        # Construction (the first build also pays for lazy imports; keep the best)
+        construct = []
+        with FigureCounter() as counter:
+            for _ in range(repeats):
+                start = time.perf_counter()
+                window = builder()
+                app.processEvents()
+                construct.append(time.perf_counter() - start)
+                close_window(app, window)
+        entry = {"construct_ms": min(construct) * 1000,
+                 "figures_per_window": counter.count // repeats,
+                 "updates": {}}
+
+        window = builder()
+        app.processEvents()
+        if name == "entanglement":
+            window.animator.start()
+        for update_name, make_update, steps in updates:
+            update = make_update(window)
+            update(steps[0])  # warm-up
+            with FigureCounter() as counter:
+                stats = measure(update, steps)
+            stats["figures_created"] = counter.count
+            stats["peak_kib"] = peak_memory(update, steps[:20])
+            entry["updates"][update_name] = stats
+            print(f"  {name:<15} {update_name:<16} p50 {stats['p50_ms']:7.2f} ms  "
+                  f"p99 {stats['p99_ms']:7.2f} ms  peak {stats['peak_kib']:8.0f} KiB  "
+                  f"figures {stats['figures_created']}", flush=True)
+        close_window(app, window)
+        results[name] = entry
+    return results
+
+
+def kernel_cases():
+    """(name, setup() -> update(step), steps) for simulator and density kernels"""
+    import tempfile
+
+    import backends
+    import circuit_view
+    import density
+    import incremental
+    import noise
+    import qasm
+    import recorder
+    import simulator
+    from gates import gate_matrix
+
+    def apply(n, name, qubits, params=()):
+        def setup():
+            state = simulator.zero_state(n) + 0j
+            state[:] = 1 / np.sqrt(len(state))
+            matrix = gate_matrix(name, params)
+            return lambda _: simulator.apply_gate(state, matrix, qubits, n)
+        return setup
+
+    def bloch_batch(batch, n):
+        def setup():
+            rng = np.random.default_rng(0)
+            states = rng.normal(size=(batch, 2 ** n)) + 1j * rng.normal(size=(batch, 2 ** n))
+            states /= np.linalg.norm(states, axis=-1, keepdims=True)
+            return lambda _: density.reduced_bloch_vectors(states, n)
+        return setup
+
+    def circuit_run(circuit, backend):
+        return lambda: (lambda _: backends.run(circuit, backend))
+
+    def fused_run(circuit, fusion_qubits):
+        def setup():
+            sim = simulator.StatevectorSimulator(fusion_qubits=fusion_qubits)
+            return lambda _: sim.run(circuit)
+        return setup
+
+    def edit_rerun(circuit, position):
+        def setup():
+            num_qubits, ops = circuit
+            ops = list(ops)
+            sim = incremental.IncrementalSimulator()
+            sim.run((num_qubits, ops))
+            k = int(position * (len(ops) - 1))
+            while len(ops[k]) < 3:  # The nearest rotation at or before it
+                k -= 1
+
+            def update(step):
+                # Alternate the edited gate's angle so every step is a real change
+                name, qubits, _ = ops[k]
+                ops[k] = (name, qubits, [0.1 * (step % 2 + 1)])
+                sim.run((num_qubits, ops), first_changed=k)
+            return update
+        return setup
+
+    def noisy_run(circuit, level, trajectories, workers):
+        model = noise.NoiseModel(level, level, level)
+        simulator = noise.TrajectorySimulator(model, trajectories, workers=workers, seed=0)
+        return lambda: (lambda _: simulator.run(circuit))
+
+    def trajectory_append():
+        directory = tempfile.mkdtemp()
+        rec = recorder.TrajectoryRecorder(os.path.join(directory, "append.npy"),
+                                          [("controls", "f8", (4,)), ("bloch", "f4", (2, 3))])
+        return lambda step: rec.append(step / 30, controls=[step, 0, 1, 2])
+
+    def trajectory_seek(frames):
+        def setup():
+            path = os.path.join(tempfile.mkdtemp(), "seek.npy")
+            rec = recorder.TrajectoryRecorder(path, [("controls", "f8", (4,))], chunk=frames)
+            rec._map["time"] = np.arange(frames) / 30
+            rec.count = frames
+            rec.close()
+            trajectory = recorder.Trajectory(path)
+            rng = np.random.default_rng(0)
+            return lambda _: trajectory[trajectory.index_at(rng.random() * trajectory.duration)]
+        return setup
+
+    def large_circuit(update):
+        def setup():
+            rng = np.random.default_rng(0)
+            ops = [("cx", sorted(rng.choice(50, 2, replace=False))) if rng.random() < 0.3
+                   else ("rz", [int(rng.integers(50))], [float(rng.uniform(0, np.pi))])
+                   for _ in range(100000)]
+            source = qasm.dumps_qasm(50, ops)
+            return lambda _: update(source)
+        return setup
+
+    ghz = (200, [("h", [0])] + [("cx", [q, q + 1]) for q in range(199)])
+    noisy = (8, [op for layer in range(8) for q in range(8)
+                 for op in (("ry", [q], [0.3 * (q + layer)]), ("cx", [q, (q + 1) % 8]))])
+    ising = (100, [op for step in range(10)
+                   for op in [("rzz", [q, q + 1], [0.4]) for q in range(99)] +
+                   [("rx", [q], [0.4]) for q in range(100)]])
+    layered = (16, [op for layer in range(8) for q in range(16)
+                    for op in (("h", [q]), ("rz", [q], [0.1 * (q + layer)]), ("cx", [q, (q + 1) % 16]))])
+    deep = (16, [op for layer in range(200)
+                 for op in [("ry", [q], [0.1 * layer]) for q in range(16)] +
+                 [("cx", [q, q + 1]) for q in range(layer % 2, 15, 2)]])
+    return [
+        ("apply_gate_1q_n20", apply(20, "h", [10]), range(10)),
+        ("apply_gate_diag_n20", apply(20, "rz", [10], [0.3]), range(10)),
+        ("apply_gate_2q_n20", apply(20, "cx", [3, 15]), range(10)),
+        ("reduced_bloch_120x2", bloch_batch(120, 2), range(50)),
+        ("reduced_bloch_1x20", bloch_batch(1, 20), range(5)),
+        ("statevector_layered_16q", circuit_run(layered, "statevector"), range(5)),
+        ("statevector_layered_16q_unfused", fused_run(layered, 0), range(5)),
+        ("incremental_edit_tail_16q", edit_rerun(deep, 0.99), range(10)),
+        ("incremental_edit_middle_16q", edit_rerun(deep, 0.5), range(3)),
+        ("stabilizer_ghz_200q", circuit_run(ghz, "stabilizer"), range(5)),
+        ("mps_ising_100q", circuit_run(ising, "mps"), range(3)),
+        ("noise_trajectories_8q_1cpu", noisy_run(noisy, 0.01, 2000, 1), range(3)),
+        ("noise_trajectories_8q", noisy_run(noisy, 0.01, 2000, None), range(3)),
+        ("qasm_parse_100k", large_circuit(qasm.parse_qasm), range(3)),
+        ("circuit_layout_100k", large_circuit(
+            lambda source: circuit_view.CircuitLayout(qasm.parse_qasm(source).circuit)), range(3)),
+        ("trajectory_append", trajectory_append, range(1000)),
+        ("trajectory_seek_1m", trajectory_seek(10 ** 6), range(200)),
+    ]
+
+
+def bench_kernels():
+    results = {}
+    for name, setup, steps in kernel_cases():
+        update = setup()
+        steps = list(steps)
+        update(steps[0])  # warm-up
+        stats = measure(update, steps)
+        stats["peak_kib"] = peak_memory(update, steps[:2])
+        results[name] = stats
+        print(f"  {name:<28} p50 {stats['p50_ms']:9.2f} ms  peak {stats['peak_kib']:9.0f} KiB",
+              flush=True)
+    return results
+
+
+# Two values of one parameter per visualization, each expected to change the image
+EXPORT_SWEEPS = {
+    "quantum_states": {"state": [0, 1]},
+    "superposition": {"alpha": [0, 50]},
+    "entanglement": {"state": [0, 3]},
+    "interference": {"path1": [0, 50]},
+    "bloch_grid": {"param": [0, 50]},
+    "measurement": {"shots": [0, 500]},
+    "bloch": {"theta": [0, 90]},
+    "circuit": {"qubits": [2, 3]},
+}
+
+
+def bench_export():
+    """Time a headless export and count renders identical to another one"""
+    import export
+    with tempfile.TemporaryDirectory() as out_dir:
+        jobs = export.expand_spec({"visualizations": EXPORT_SWEEPS})
+        start = time.perf_counter()
+        written = export.export({"visualizations": EXPORT_SWEEPS}, out_dir, workers=1,
+                                stream=io.StringIO())
+        elapsed = time.perf_counter() - start
+        digests = {}
+        for path in written:
+            with open(path, "rb") as f:
+                digests.setdefault(hashlib.md5(f.read()).hexdigest(), []).append(os.path.basename(path))
+    duplicates = [names for names in digests.values() if len(names) > 1]
+    for names in duplicates:
+        print(f"  DUPLICATE renders: {', '.join(names)}")
+    result = {"renders": len(jobs), "files": len(written), "mean_ms": elapsed / len(jobs) * 1000,
+              "duplicate_files": sum(len(names) - 1 for names in duplicates)}
+    print(f"  {result['renders']} renders, {result['files']} files, {result['mean_ms']:.0f} ms per render, "
+          f"{result['duplicate_files']} duplicate files", flush=True)
+    return result
+
+
+def environment():
+    import matplotlib
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit or None,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "qt_platform": os.environ.get("QT_QPA_PLATFORM"),
+    }
+
+
+def flatten(results, prefix=""):
+    """{"a": {"b": 1}} -> {"a.b": 1}, numbers only"""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)):
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(current, baseline, threshold):
+    """Print metrics that moved by more than ``threshold``; returns the regressions"""
+    now, before = flatten(current["results"]), flatten(baseline["results"])
+    regressions = []
+    print(f"\nCompared with {baseline['environment'].get('commit') or 'baseline'} "
+          f"(threshold {threshold:.0%}):")
+    for key in sorted(now.keys() & before.keys()):
+        if not key.endswith(LOWER_IS_BETTER) or before[key] <= 0:
+            continue
+        change = now[key] / before[key] - 1
+        if abs(change) >= threshold:
+            label = "REGRESSION" if change > 0 else "improved"
+            print(f"  {label:<10} {key:<55} {before[key]:10.2f} -> {now[key]:10.2f} ({change:+.0%})")
+            if change > 0:
+                regressions.append(key)
+    if not regressions:
+        print("  no regressions")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative change reported by --compare (default 0.2)")
+    parser.add_argument("--repeats", type=int, default=3, help="window constructions per window")
+    parser.add_argument("--skip-windows", action="store_true")
+    parser.add_argument("--skip-kernels", action="store_true")
+    parser.add_argument("--skip-export", action="store_true")
+    args = parser.parse_args(argv)
+
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    results = {}
+    if not args.skip_windows:
+        print("Windows:")
+        results["windows"] = bench_windows(app, args.repeats)
+    if not args.skip_kernels:
+        print("Kernels:")
+        results["kernels"] = bench_kernels()
+    if not args.skip_export:
+        # Last: the exporter switches matplotlib to Agg
+        print("Export:")
+        results["export"] = bench_export()
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+    status = 0
+    if results.get("export", {}).get("duplicate_files"):
+        # Different parameter values rendering the same file means the sweep is broken
+        status = 1
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import time
+
+from PyQt6.QtCore import Qt, QTimer
+
+import instrumentation
+
+
+class BlitAnimator:
+    """Timer-driven animation that blits only the moving artists of a canvas.
+
+    The static part of the figure (spheres, axes, labels, titles) is rendered
+    once and cached with ``copy_from_bbox``. Each frame restores that
+    background, lets ``frame_func`` move the animated artists, draws just
+    those artists and blits the result. The background is recaptured whenever
+    the canvas does a full draw, e.g. after a resize.
+
+    Without the timer, ``blit`` and ``release`` give the same fast path to
+    windows that redraw in response to a control, e.g. while a slider is
+    dragged.
+
+    Frames shown somewhere other than the canvas, e.g. on a QPainter Bloch
+    view, set ``redraw``: the timer then calls it instead of blitting and
+    leaves the canvas alone.
+    """
+
+    def __init__(self, canvas, artists, frame_func, fps=30, name="animation"):
+        self.canvas = canvas
+        self.name = name
+        self.artists = list(artists)
+        self.frame_func = frame_func
+        self.target_fps = fps
+        self.achieved_fps = 0.0
+        self.frame_count = 0
+        self.fps_callback = None
+        self.redraw = None
+
+        self._background = None
+        self._last_frame_time = None
+        self._fps_window_start = None
+        self._fps_window_frames = 0
+
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._on_timeout)
+        self._draw_cid = canvas.mpl_connect('draw_event', self._on_draw)
+
+    @property
+    def running(self):
+        return self.timer.isActive()
+
+    def set_target_fps(self, fps):
+        """Change the target frame rate, taking effect immediately if running"""
+        self.target_fps = max(1, fps)
+        if self.running:
+            self.timer.start(self._interval_ms())
+
+    def start(self):
+        self.frame_count = 0
+        self.achieved_fps = 0.0
+        self._fps_window_start = time.perf_counter()
+        self._fps_window_frames = 0
+        if self.redraw is None:
+            for artist in self.artists:
+                artist.set_animated(True)
+            # A full draw renders the static background and triggers _on_draw
+            self.canvas.draw()
+        self.timer.start(self._interval_ms())
+
+    def stop(self):
+        self.timer.stop()
+        if self.redraw is None:
+            self.release()
+            self.canvas.draw_idle()
+
+    def blit(self):
+        """Redraw just the animated artists now, outside the timer.
+
+        The first call marks the artists animated and does one full draw to
+        capture the background.
+        """
+        if self._background is None or not all(a.get_animated() for a in self.artists):
+            for artist in self.artists:
+                artist.set_animated(True)
+            self.canvas.draw()
+            return
+        with instrumentation.draw(self.canvas):
+            self.canvas.restore_region(self._background)
+            self._draw_artists()
+            self.canvas.blit(self.canvas.fig.bbox)
+
+    def release(self):
+        """Hand the artists back to normal drawing (full draws and savefig include them again)"""
+        for artist in self.artists:
+            artist.set_animated(False)
+        self._background = None
+
+    def disconnect(self):
+        """Stop the animation and detach from the canvas"""
+        self.timer.stop()
+        self.canvas.mpl_disconnect(self._draw_cid)
+
+    def _interval_ms(self):
+        return max(1, int(round(1000 / self.target_fps)))
+
+    def _on_draw(self, event):
+        # Cache everything except the animated artists, then put them back on top
+        if not self.running and not any(a.get_animated() for a in self.artists):
+            return
+        self._background = self.canvas.copy_from_bbox(self.canvas.fig.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.canvas.fig.draw_artist(artist)
+
+    def _on_timeout(self):
+        with instrumentation.update(self.name):
+            self.frame_func()
+            (self.redraw or self.blit)()
+
+        self.frame_count += 1
+        self._update_fps()
+
+    def _update_fps(self):
+        # Report the frame rate averaged over roughly half a second
+        self._fps_window_frames += 1
+        now = time.perf_counter()
+        if self._fps_window_start is None:
+            # Frames driven without start(), e.g. by a benchmark
+            self._fps_window_start = now
+        elapsed = now - self._fps_window_start
+        if elapsed >= 0.5:
+            self.achieved_fps = self._fps_window_frames / elapsed
+            self._fps_window_start = now
+            self._fps_window_frames = 0
+            if self.fps_callback is not None:
+                self.fps_callback(self.achieved_fps)
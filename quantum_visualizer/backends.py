@@ -0,0 +1,47 @@
+from gates import circuit_operations
+from mps import MPSSimulator
+from simulator import StatevectorSimulator
+from stabilizer import StabilizerSimulator, is_clifford
+
+
+# Simulation backends by name. Every backend has ``run(circuit, progress=None)``
+# returning a result with ``num_qubits``, ``bloch_vectors()``,
+# ``entanglement_entropies()``, ``sample(shots)`` and ``counts(shots)``; dense
+# backends also expose ``state``/``probabilities()``.
+BACKENDS = {
+    "statevector": StatevectorSimulator,
+    "stabilizer": StabilizerSimulator,
+    "mps": MPSSimulator,
+}
+
+# Non-Clifford circuits wider than this run on the MPS backend (16 MiB of amplitudes)
+MAX_STATEVECTOR_QUBITS = 20
+
+
+def select_backend(circuit):
+    """Name of the backend ``run`` uses for ``backend="auto"``"""
+    num_qubits, ops = circuit_operations(circuit)
+    if is_clifford((num_qubits, ops)):
+        return "stabilizer"
+    if num_qubits > MAX_STATEVECTOR_QUBITS:
+        return "mps"
+    return "statevector"
+
+
+def get_backend(name, **options):
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown backend '{name}', choose from {sorted(BACKENDS)}")
+    return backend(**options)
+
+
+def run(circuit, backend="auto", progress=None, **options):
+    """Simulate a circuit, picking the stabilizer backend for all-Clifford circuits
+    and the MPS backend for wide non-Clifford ones.
+
+    ``progress(fraction)`` is passed on to the backend, which calls it as gates
+    are applied; it may raise to abort the simulation.
+    """
+    if backend == "auto":
+        backend = select_backend(circuit)
+    return get_backend(backend, **options).run(circuit, progress=progress)
@@ -0,0 +1,76 @@
+import numpy as np
+
+import instrumentation
+from bloch_renderer import BlochSphere
+
+
+class BlochGrid:
+    """One small Bloch sphere per qubit, laid out in a grid on a single canvas.
+
+    Every cell shares the same precomputed sphere mesh. The state vectors are
+    animated artists: after a full draw each cell's static background is
+    cached, and ``set_vectors`` only restores, redraws and blits the cells
+    whose vector actually moved.
+    """
+
+    def __init__(self, canvas, num_qubits, columns=None, resolution=16, tolerance=1e-6):
+        self.canvas = canvas
+        self.num_qubits = num_qubits
+        self.columns = columns or int(np.ceil(np.sqrt(num_qubits)))
+        self.rows = int(np.ceil(num_qubits / self.columns))
+        self.tolerance = tolerance
+
+        canvas.fig.subplots_adjust(left=0.01, right=0.99, bottom=0.01, top=0.95,
+                                   wspace=0.05, hspace=0.25)
+        self.spheres = []
+        for q in range(num_qubits):
+            ax = canvas.fig.add_subplot(self.rows, self.columns, q + 1, projection='3d')
+            sphere = BlochSphere(ax, title=f"q{q}", resolution=resolution, compact=True)
+            for artist in sphere.dynamic_artists:
+                artist.set_animated(True)
+            self.spheres.append(sphere)
+
+        # NaN forces every cell to count as changed on the first update
+        self.vectors = np.full((num_qubits, 3), np.nan)
+        self.last_changed = np.arange(num_qubits)
+        self._backgrounds = None
+        self._draw_cid = canvas.mpl_connect('draw_event', self._on_draw)
+
+    def disconnect(self):
+        self.canvas.mpl_disconnect(self._draw_cid)
+
+    def _on_draw(self, event):
+        # Cache each cell's static background, then put the vectors back on top
+        self._backgrounds = [self.canvas.copy_from_bbox(sphere.ax.bbox) for sphere in self.spheres]
+        for sphere in self.spheres:
+            self._draw_cell_artists(sphere)
+
+    def _draw_cell_artists(self, sphere):
+        for artist in sphere.dynamic_artists:
+            self.canvas.fig.draw_artist(artist)
+
+    def set_vectors(self, vectors):
+        """Show a (num_qubits, 3) array of Bloch vectors; returns the indices that changed"""
+        vectors = np.asarray(vectors, dtype=float)
+        unchanged = np.all(np.abs(vectors - self.vectors) <= self.tolerance, axis=1)
+        changed = np.flatnonzero(~unchanged)
+        self.last_changed = changed
+        if not len(changed):
+            return changed
+
+        for q in changed:
+            self.spheres[q].set_vector(*vectors[q])
+        self.vectors[changed] = vectors[changed]
+
+        if self._backgrounds is None:
+            # Nothing cached yet: a full draw caches the cells and shows the vectors
+            self.canvas.draw()
+            return changed
+
+        with instrumentation.draw(self.canvas):
+            for q in changed:
+                sphere = self.spheres[q]
+                self.canvas.restore_region(self._backgrounds[q])
+                self._draw_cell_artists(sphere)
+                self.canvas.blit(sphere.ax.bbox)
+        return changed
@@ -0,0 +1,273 @@
+"""Bloch sphere painted straight onto a Qt widget, without matplotlib.
+
+mplot3d re-projects and depth-sorts every polygon of the sphere surface on
+each draw. ``BlochView`` instead keeps a fixed wireframe (a few latitude and
+longitude circles) and the coordinate axes as precomputed 3D polylines,
+projects them orthographically with one cached rotation matrix and paints
+them with QPainter. The silhouette of a sphere under orthographic projection
+is always a circle, so the translucent "surface" is a single ellipse.
+
+The projected wireframe is only recomputed when the view rotates or the
+widget is resized; moving the state vector or a point set repaints a few
+hundred line segments. Dragging with the mouse rotates the view, and
+double-clicking restores the default camera.
+
+The method names match ``bloch_renderer.BlochSphere``, so a window can
+drive either renderer with the same calls and keep its mplot3d figure for
+high-quality export.
+"""
+import numpy as np
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PyQt6.QtWidgets import QWidget
+
+import instrumentation
+
+# mplot3d's default camera, so both renderers open on the same view
+DEFAULT_AZIMUTH = -60.0
+DEFAULT_ELEVATION = 30.0
+# Degrees of rotation per pixel of mouse drag
+DRAG_DEGREES_PER_PIXEL = 0.5
+# Axes reach AXIS_LENGTH and labels sit at LABEL_DISTANCE, in sphere radii
+AXIS_LENGTH = 1.5
+LABEL_DISTANCE = 1.7
+BACKGROUND = "#253443"
+
+# Wireframes keyed by (latitudes, longitudes, segments), shared by every view
+_wireframe_cache = {}
+
+
+def wireframe(latitudes=5, longitudes=6, segments=48):
+    """(circles, segments + 1, 3) array of closed polylines on the unit sphere
+
+    ``latitudes`` circles of constant z (the equator included when the
+    count is odd) and ``longitudes`` great circles through the poles.
+    """
+    key = (latitudes, longitudes, segments)
+    circles = _wireframe_cache.get(key)
+    if circles is None:
+        t = np.linspace(0, 2 * np.pi, segments + 1)
+        polar = np.linspace(0, np.pi, latitudes + 2)[1:-1]
+        azimuth = np.linspace(0, np.pi, longitudes, endpoint=False)
+        lat = np.stack([np.outer(np.sin(polar), np.cos(t)),
+                        np.outer(np.sin(polar), np.sin(t)),
+                        np.repeat(np.cos(polar)[:, None], segments + 1, axis=1)], axis=-1)
+        lon = np.stack([np.outer(np.cos(azimuth), np.sin(t)),
+                        np.outer(np.sin(azimuth), np.sin(t)),
+                        np.repeat(np.cos(t)[None, :], longitudes, axis=0)], axis=-1)
+        circles = np.concatenate([lat, lon])
+        circles.setflags(write=False)
+        _wireframe_cache[key] = circles
+    return circles
+
+
+def view_matrix(azimuth, elevation):
+    """Rotation taking Bloch coordinates to (screen right, screen up, towards viewer)"""
+    a, e = np.radians(azimuth), np.radians(elevation)
+    return np.array([
+        [-np.sin(a), np.cos(a), 0.0],
+        [-np.sin(e) * np.cos(a), -np.sin(e) * np.sin(a), np.cos(e)],
+        [np.cos(e) * np.cos(a), np.cos(e) * np.sin(a), np.sin(e)],
+    ])
+
+
+def _polygon(points):
+    return QPolygonF([QPointF(x, y) for x, y in points])
+
+
+def _color(name, alpha=1.0):
+    color = QColor(name)
+    color.setAlphaF(alpha)
+    return color
+
+
+class BlochView(QWidget):
+    """Bloch sphere widget with the drawing API of ``BlochSphere``.
+
+    ``compact`` drops the basis labels and uses a sparser wireframe, for
+    small multiples.
+    """
+
+    def __init__(self, title=None, compact=False, show_vector=True, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(120, 120)
+        self.title = title
+        self.compact = compact
+        self.show_vector = show_vector
+        self.vector = np.zeros(3)
+        self.point_sets = {}
+        self.azimuth = DEFAULT_AZIMUTH
+        self.elevation = DEFAULT_ELEVATION
+        self.circles = wireframe(3, 4, 32) if compact else wireframe()
+
+        self._rotation = view_matrix(self.azimuth, self.elevation)
+        self._scene = None  # projected wireframe and axes, rebuilt on rotation or resize
+        self._drag_origin = None
+        instrumentation.register_canvas(self)
+
+    # --- BlochSphere-compatible drawing API ---
+
+    def set_vector(self, x, y, z):
+        """Move the state vector to the Bloch coordinates (x, y, z)"""
+        self.vector = np.array([x, y, z], dtype=float)
+        self.update()
+
+    def add_points(self, name, color='yellow', size=10, alpha=0.7, edgecolor=None):
+        """Create an empty, named set of markers that can later be moved with set_points"""
+        # Sizes follow scatter's ``s`` convention (points squared), as in BlochSphere
+        self.point_sets[name] = {"points": np.empty((0, 3)), "radius": np.sqrt(size) / 2,
+                                 "fill": _color(color, alpha), "edge": _color(edgecolor or color, alpha)}
+
+    def set_points(self, name, xs, ys, zs):
+        """Replace the coordinates of a named point set"""
+        self.point_sets[name]["points"] = np.column_stack([np.ravel(xs), np.ravel(ys), np.ravel(zs)])
+        self.update()
+
+    def set_preview(self, enabled):
+        """No-op: the wireframe is already cheaper than mplot3d's preview"""
+
+    def set_title(self, text):
+        self.title = text
+        self.update()
+
+    # --- Camera ---
+
+    def set_view(self, azimuth, elevation):
+        """Rotate the camera; elevation is clamped to the poles"""
+        self.azimuth = float(azimuth) % 360
+        self.elevation = float(np.clip(elevation, -90, 90))
+        self._rotation = view_matrix(self.azimuth, self.elevation)
+        self._scene = None
+        self.update()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._drag_origin = (event.position(), self.azimuth, self.elevation)
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._drag_origin is not None:
+            origin, azimuth, elevation = self._drag_origin
+            delta = event.position() - origin
+            # update() coalesces, so a fast drag still paints once per frame
+            self.set_view(azimuth - delta.x() * DRAG_DEGREES_PER_PIXEL,
+                          elevation + delta.y() * DRAG_DEGREES_PER_PIXEL)
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        self._drag_origin = None
+        super().mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        self.set_view(DEFAULT_AZIMUTH, DEFAULT_ELEVATION)
+
+    def resizeEvent(self, event):
+        self._scene = None
+        super().resizeEvent(event)
+
+    # --- Projection ---
+
+    def _geometry(self):
+        # Centre and pixels per unit radius, leaving room for the title and labels
+        top = 0 if self.title is None else self.fontMetrics().height() + 4
+        reach = 1.15 if self.compact else LABEL_DISTANCE + 0.15
+        width, height = self.width(), self.height() - top
+        return width / 2, top + height / 2, min(width, height) / (2 * reach)
+
+    def _project(self, points):
+        """Screen positions and depths of (..., 3) Bloch coordinates"""
+        cx, cy, scale = self._geometry()
+        view = points @ self._rotation.T
+        screen = np.stack([cx + scale * view[..., 0], cy - scale * view[..., 1]], axis=-1)
+        return screen, view[..., 2]
+
+    def _build_scene(self):
+        # Split each circle into runs in front of and behind the sphere, so
+        # the hidden half can be drawn faintly without depth-sorting
+        screen, depth = self._project(self.circles)
+        back, front = [], []
+        for points, z in zip(screen, depth):
+            facing = z >= 0
+            breaks = np.flatnonzero(facing[1:] != facing[:-1]) + 1
+            for run in np.split(np.arange(len(points)), breaks):
+                # Overlap runs by one vertex so the circle stays closed
+                run = np.append(run, run[-1] + 1) if run[-1] + 1 < len(points) else run
+                (front if facing[run[0]] else back).append(_polygon(points[run]))
+
+        length = 1.0 if self.compact else AXIS_LENGTH
+        axes = np.array([[[-length if self.compact else 0, 0, 0], [length, 0, 0]],
+                         [[0, -length if self.compact else 0, 0], [0, length, 0]],
+                         [[0, 0, -length if self.compact else 0], [0, 0, length]]])
+        axis_screen, _ = self._project(axes)
+        labels = []
+        if not self.compact:
+            anchors = np.array([[LABEL_DISTANCE, 0, 0], [0, LABEL_DISTANCE, 0],
+                                [0, 0, LABEL_DISTANCE], [0, 0, -LABEL_DISTANCE]])
+            label_screen, _ = self._project(anchors)
+            labels = list(zip(("|+x⟩", "|+y⟩", "|0⟩", "|1⟩"), label_screen))
+        self._scene = {"back": back, "front": front, "axes": axis_screen, "labels": labels}
+
+    # --- Painting ---
+
+    def paintEvent(self, event):
+        with instrumentation.draw(self):
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            self._paint(painter)
+            painter.end()
+
+    def _paint(self, painter):
+        if self._scene is None:
+            self._build_scene()
+        scene = self._scene
+        cx, cy, scale = self._geometry()
+        painter.fillRect(self.rect(), QColor(BACKGROUND))
+
+        if self.title is not None:
+            painter.setPen(QColor("white"))
+            painter.drawText(QRectF(0, 0, self.width(), self.fontMetrics().height() + 4),
+                             Qt.AlignmentFlag.AlignCenter, self.title)
+
+        # Silhouette with the translucent blue fill of the mplot3d surface
+        painter.setPen(QPen(_color("#8FA9C2", 0.6), 1))
+        painter.setBrush(_color("blue", 0.1))
+        painter.drawEllipse(QPointF(cx, cy), scale, scale)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+
+        painter.setPen(QPen(_color("#8FA9C2", 0.2), 1, Qt.PenStyle.DashLine))
+        for polyline in scene["back"]:
+            painter.drawPolyline(polyline)
+
+        width = 1 if self.compact else 2
+        for color, (start, end) in zip(("red", "green", "blue"), scene["axes"]):
+            painter.setPen(QPen(QColor(color), width))
+            painter.drawLine(QPointF(*start), QPointF(*end))
+
+        painter.setPen(QPen(_color("#8FA9C2", 0.5), 1))
+        for polyline in scene["front"]:
+            painter.drawPolyline(polyline)
+
+        if scene["labels"]:
+            painter.setPen(QColor("white"))
+            for text, (x, y) in scene["labels"]:
+                painter.drawText(QPointF(x - 12, y + 4), text)
+
+        for points in self.point_sets.values():
+            if not len(points["points"]):
+                continue
+            screen, _ = self._project(points["points"])
+            painter.setPen(QPen(points["edge"], 1))
+            painter.setBrush(points["fill"])
+            for x, y in screen:
+                painter.drawEllipse(QPointF(x, y), points["radius"], points["radius"])
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+
+        if self.show_vector:
+            (x0, y0), (x1, y1) = self._project(np.array([np.zeros(3), self.vector]))[0]
+            painter.setPen(QPen(QColor("yellow"), 2 if self.compact else 3,
+                                cap=Qt.PenCapStyle.RoundCap))
+            painter.drawLine(QPointF(x0, y0), QPointF(x1, y1))
+            radius = 2 if self.compact else 5
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor("red"))
+            painter.drawEllipse(QPointF(x1, y1), radius, radius)
@@ -0,0 +1,137 @@
+import numpy as np
+
+
+# Unit-sphere meshes keyed by resolution, shared by every BlochSphere
+_mesh_cache = {}
+
+
+def sphere_mesh(resolution=100):
+    """Return the (x, y, z) unit-sphere mesh, computed once per resolution"""
+    mesh = _mesh_cache.get(resolution)
+    if mesh is None:
+        u = np.linspace(0, 2 * np.pi, resolution)
+        v = np.linspace(0, np.pi, resolution)
+        x = np.outer(np.cos(u), np.sin(v))
+        y = np.outer(np.sin(u), np.sin(v))
+        z = np.outer(np.ones(np.size(u)), np.cos(v))
+        mesh = (x, y, z)
+        _mesh_cache[resolution] = mesh
+    return mesh
+
+
+class BlochSphere:
+    """Bloch sphere drawn once on a 3D axes, with state artists updated in place.
+
+    The sphere surface, coordinate axes, basis labels and pane styling are
+    created in the constructor. Afterwards only the state vector and any named
+    point sets are mutated, so an update touches a handful of artists instead
+    of rebuilding the whole scene with ``ax.clear()``.
+    """
+
+    def __init__(self, ax, title=None, resolution=100, show_vector=True, compact=False):
+        self.ax = ax
+        self.title = None
+        self.point_sets = {}
+        self.surface = None
+        if compact:
+            self._draw_compact(resolution)
+        else:
+            self._draw_static(resolution)
+
+        if title is not None:
+            self.title = ax.set_title(title, color='white', fontsize=8 if compact else None)
+
+        # State vector: a thick line from the origin plus a marker at the tip
+        self.vector_line, = ax.plot([0, 0], [0, 0], [0, 0], color='yellow',
+                                    linewidth=2 if compact else 3)
+        self.vector_tip, = ax.plot([0], [0], [0], linestyle='', marker='o',
+                                   color='red', markersize=4 if compact else 10)
+        self.vector_line.set_visible(show_vector)
+        self.vector_tip.set_visible(show_vector)
+
+    def _draw_static(self, resolution):
+        ax = self.ax
+        x, y, z = sphere_mesh(resolution)
+
+        # Plot the surface with transparency
+        self.surface = ax.plot_surface(x, y, z, color='b', alpha=0.1)
+
+        # Add axes
+        ax.quiver(0, 0, 0, 1.5, 0, 0, color='r', arrow_length_ratio=0.1)
+        ax.quiver(0, 0, 0, 0, 1.5, 0, color='g', arrow_length_ratio=0.1)
+        ax.quiver(0, 0, 0, 0, 0, 1.5, color='b', arrow_length_ratio=0.1)
+
+        # Add basis state labels
+        ax.text(1.7, 0, 0, "|+x⟩", color='white')
+        ax.text(0, 1.7, 0, "|+y⟩", color='white')
+        ax.text(0, 0, 1.7, "|0⟩", color='white')
+        ax.text(0, 0, -1.7, "|1⟩", color='white')
+
+        # Set equal aspect ratio
+        ax.set_box_aspect([1, 1, 1])
+        ax.set_xlim(-1.5, 1.5)
+        ax.set_ylim(-1.5, 1.5)
+        ax.set_zlim(-1.5, 1.5)
+
+        # Remove tick labels for cleaner look
+        ax.set_xticklabels([])
+        ax.set_yticklabels([])
+        ax.set_zticklabels([])
+
+        # Style for dark mode
+        ax.xaxis.pane.set_edgecolor("white")
+        ax.yaxis.pane.set_edgecolor("white")
+        ax.zaxis.pane.set_edgecolor("white")
+        ax.xaxis.pane.fill = False
+        ax.yaxis.pane.fill = False
+        ax.zaxis.pane.fill = False
+        ax.set_facecolor('#253443')
+
+    def _draw_compact(self, resolution):
+        # Small-multiple style for grids: low-resolution surface, plain axis
+        # lines instead of quivers, no labels, ticks or panes
+        ax = self.ax
+        x, y, z = sphere_mesh(resolution)
+        self.surface = ax.plot_surface(x, y, z, color='b', alpha=0.1, linewidth=0)
+        ax.plot([-1, 1], [0, 0], [0, 0], color='r', linewidth=0.5)
+        ax.plot([0, 0], [-1, 1], [0, 0], color='g', linewidth=0.5)
+        ax.plot([0, 0], [0, 0], [-1, 1], color='b', linewidth=0.5)
+        ax.set_box_aspect([1, 1, 1], zoom=1.4)
+        ax.set_xlim(-1, 1)
+        ax.set_ylim(-1, 1)
+        ax.set_zlim(-1, 1)
+        ax.set_axis_off()
+        ax.set_facecolor('#253443')
+
+    def set_vector(self, x, y, z):
+        """Move the state vector to the Bloch coordinates (x, y, z)"""
+        self.vector_line.set_data_3d([0, x], [0, y], [0, z])
+        self.vector_tip.set_data_3d([x], [y], [z])
+
+    def add_points(self, name, color='yellow', size=10, alpha=0.7, edgecolor=None):
+        """Create an empty, named set of markers that can later be moved with set_points"""
+        # Marker sizes follow scatter's ``s`` convention (points squared)
+        line, = self.ax.plot([], [], [], linestyle='', marker='o', color=color,
+                             markersize=np.sqrt(size), alpha=alpha,
+                             markeredgecolor=edgecolor or color)
+        self.point_sets[name] = line
+        return line
+
+    def set_points(self, name, xs, ys, zs):
+        """Replace the coordinates of a named point set"""
+        self.point_sets[name].set_data_3d(np.asarray(xs), np.asarray(ys), np.asarray(zs))
+
+    def set_preview(self, enabled):
+        """Hide the sphere surface, the most expensive artist to draw, for fast previews"""
+        self.surface.set_visible(not enabled)
+
+    def set_title(self, text):
+        if self.title is None:
+            self.title = self.ax.set_title(text, color='white')
+        else:
+            self.title.set_text(text)
+
+    @property
+    def dynamic_artists(self):
+        """Artists that change between updates"""
+        return [self.vector_line, self.vector_tip] + list(self.point_sets.values())
@@ -2,10 +2,20 @@ from qiskit.visualization import plot_bloch_vector
 import matplotlib.pyplot as plt
 import numpy as np
 
-def bloch_sphere():
-    bloch_vector = [1, 0, 0]  # X-axis
-    plot_bloch_vector(bloch_vector)
-    plt.show()
+def bloch_vector_from_angles(theta, phi):
+    """Cartesian Bloch vector for polar angle theta and azimuth phi (radians)"""
+    return [np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi), np.cos(theta)]
+
+def bloch_sphere(bloch_vector=None, show=True, ax=None):
+    """qiskit's mplot3d Bloch sphere, as a new pyplot figure or drawn into a 3D ``ax``"""
+    if bloch_vector is None:
+        bloch_vector = [1, 0, 0]  # X-axis
+    fig = plot_bloch_vector(bloch_vector, ax=ax)
+    if ax is not None:
+        return ax.figure
+    if show:
+        plt.show()
+    return fig
 
 if __name__ == "__main__":
     bloch_sphere()
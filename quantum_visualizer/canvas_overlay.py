@@ -0,0 +1,51 @@
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QLabel
+
+
+class CanvasOverlay(QLabel):
+    """Frame-rate and latency readout pinned to the corner of a canvas.
+
+    It is a Qt child widget rather than a matplotlib artist, so it costs
+    nothing to render in the figure and never appears in saved images.
+    """
+
+    def __init__(self, canvas):
+        super().__init__(canvas)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setStyleSheet("background-color: rgba(15, 32, 39, 200); color: #1ABC9C; "
+                           "font-family: monospace; font-size: 10px; padding: 3px; "
+                           "border-radius: 3px;")
+        self.move(4, 4)
+        self.fps = 0.0
+        self.last_draw_end = None
+        self.latency = None
+        self.totals = {}
+        self.draw_ms = 0.0
+        self._refresh()
+
+    def record_draw(self, end, duration, standalone=False):
+        # Exponential moving average of the interval between draws
+        if self.last_draw_end is not None:
+            interval = end - self.last_draw_end
+            if interval > 0:
+                fps = 1 / interval
+                self.fps = fps if self.fps == 0 else 0.8 * self.fps + 0.2 * fps
+        self.last_draw_end = end
+        self.draw_ms = duration * 1000
+        if standalone:
+            self._refresh()
+
+    def record_update(self, latency, totals):
+        self.latency = latency
+        self.totals = dict(totals)
+        self._refresh()
+
+    def _refresh(self):
+        lines = [f"{self.fps:5.1f} fps   draw {self.draw_ms:6.1f} ms"]
+        if self.latency is not None:
+            phases = "  ".join(f"{phase} {seconds * 1000:.1f}" for phase, seconds in self.totals.items())
+            lines.append(f"update {self.latency * 1000:6.1f} ms")
+            lines.append(phases)
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.raise_()
@@ -0,0 +1,420 @@
+"""Drag-and-drop circuit editing on a grid of wires and columns.
+
+``CircuitGrid`` holds the circuit as columns of gates on disjoint wires,
+the way the editor shows it, and flattens it column by column into the
+simulators' Operation list. Every edit reports the first column it
+changed, so the grid is never re-laid out as a whole: a gate dropped on
+free cells only changes its own column, and only a drop that needs a new
+column (or empties one) moves the columns to its right.
+
+``CircuitEditor`` paints the grid with QPainter and repaints only the
+columns an edit changed: paintEvent draws just the columns inside the
+region Qt asks for. Gates come from ``GateTile`` palette entries by drag
+and drop. A placed gate can be dragged to another cell, dragged off the
+editor or double-clicked to delete it, and the mouse wheel turns the angle
+of a rotation gate. ``edited`` carries the index of the first changed gate,
+which is what ``incremental.IncrementalSimulator`` resumes from.
+"""
+import json
+import time
+
+import numpy as np
+from PyQt6.QtCore import QMimeData, QPoint, QPointF, QRect, QRectF, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QDrag, QFont, QPainter, QPen
+from PyQt6.QtWidgets import QApplication, QLabel, QWidget
+
+import instrumentation
+from circuit_view import format_angle, gate_color
+from gates import Operation
+
+GATE_MIME = "application/x-quantum-visualizer-gate"
+# Gates offered by the palette, with the angle rotations start at
+PALETTE = [("h", ()), ("x", ()), ("y", ()), ("z", ()), ("s", ()), ("t", ()),
+           ("rx", (np.pi / 2,)), ("ry", (np.pi / 2,)), ("rz", (np.pi / 2,)),
+           ("cx", ()), ("cz", ()), ("swap", ())]
+# Placed on the dropped wire and the one below it (cx: control above target)
+TWO_QUBIT_GATES = {"cx", "cz", "swap"}
+ROTATION_GATES = {"rx", "ry", "rz"}
+ANGLE_STEP = np.pi / 8
+# Pixels per column and per wire, and the room left of wire 0 for labels
+CELL = 44
+LABEL_WIDTH = 40
+GATE_SIZE = 32
+BACKGROUND = "#253443"
+
+
+def gate_label(name, params=()):
+    if not params:
+        return name.upper()
+    return f"{name[0].upper()}{name[1:]}\n{format_angle(params[0])}"
+
+
+def _operation(name, params, wire):
+    qubits = (wire, wire + 1) if name in TWO_QUBIT_GATES else (wire,)
+    return Operation(name, qubits, tuple(params))
+
+
+class CircuitGrid:
+    """Columns of gates on disjoint wires; ``columns[c]`` maps every wire a
+    gate spans to that gate's Operation"""
+
+    def __init__(self, num_qubits):
+        self.num_qubits = num_qubits
+        self.columns = []
+        self.gate_count = 0
+
+    def __len__(self):
+        return self.gate_count
+
+    def operations(self):
+        """The circuit in column order, top wire first within a column"""
+        return [op for column in self.columns for wire, op in sorted(column.items()) if wire == min(op.qubits)]
+
+    def gate_index(self, column):
+        """Index in ``operations()`` of the first gate in ``column`` or later"""
+        return sum(len({id(op) for op in gates.values()}) for gates in self.columns[:column])
+
+    def at(self, column, wire):
+        """Operation covering a cell, or None"""
+        if 0 <= column < len(self.columns):
+            return self.columns[column].get(wire)
+        return None
+
+    def place(self, op, column):
+        """Add a gate at ``column`` (appended past the end); returns (column, inserted)
+
+        If a wire it spans is taken there, a new column is inserted for it
+        and the columns from there on move one to the right.
+        """
+        wires = range(min(op.qubits), max(op.qubits) + 1)
+        column = min(max(column, 0), len(self.columns))
+        inserted = column == len(self.columns) or any(w in self.columns[column] for w in wires)
+        if inserted:
+            self.columns.insert(column, {})
+        for w in wires:
+            self.columns[column][w] = op
+        self.gate_count += 1
+        return column, inserted
+
+    def remove(self, column, wire):
+        """Delete the gate covering a cell; returns (op, removed), where
+        ``removed`` says the emptied column was dropped"""
+        op = self.columns[column][wire]
+        for w in range(min(op.qubits), max(op.qubits) + 1):
+            del self.columns[column][w]
+        self.gate_count -= 1
+        removed = not self.columns[column]
+        if removed:
+            del self.columns[column]
+        return op, removed
+
+    def replace(self, column, wire, op):
+        """Swap the gate covering a cell for one on the same wires"""
+        old = self.columns[column][wire]
+        for w in range(min(old.qubits), max(old.qubits) + 1):
+            self.columns[column][w] = op
+
+    def set_num_qubits(self, num_qubits):
+        """Change the wire count, dropping gates on removed wires"""
+        self.num_qubits = num_qubits
+        columns = []
+        for gates in self.columns:
+            kept = {w: op for w, op in gates.items() if max(op.qubits) < num_qubits}
+            if kept:
+                columns.append(kept)
+        self.columns = columns
+        self.gate_count = len(self.operations())
+
+
+def _gate_mime(name, params, source=None):
+    mime = QMimeData()
+    mime.setData(GATE_MIME, json.dumps({"name": name, "params": list(params), "source": source}).encode())
+    return mime
+
+
+def _paint_box(painter, rect, name, params):
+    painter.setPen(QPen(QColor("white"), 1))
+    painter.setBrush(QColor(gate_color(name)))
+    painter.drawRoundedRect(rect, 4, 4)
+    label = gate_label(name, params)
+    painter.setFont(QFont("Arial", 10 if len(label) <= 2 else 7, QFont.Weight.Bold))
+    painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, label)
+
+
+class GateTile(QLabel):
+    """Palette entry that starts a drag carrying its gate"""
+
+    def __init__(self, name, params=(), parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.params = tuple(params)
+        self.setFixedSize(GATE_SIZE + 6, GATE_SIZE + 6)
+        self.setCursor(Qt.CursorShape.OpenHandCursor)
+        self.setToolTip(f"Drag {name.upper()} onto a wire")
+        self._press = None
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        _paint_box(painter, QRectF(3, 3, GATE_SIZE, GATE_SIZE), self.name, self.params)
+        painter.end()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._press = event.position().toPoint()
+
+    def mouseMoveEvent(self, event):
+        if self._press is None:
+            return
+        if (event.position().toPoint() - self._press).manhattanLength() < QApplication.startDragDistance():
+            return
+        self._press = None
+        drag = QDrag(self)
+        drag.setMimeData(_gate_mime(self.name, self.params))
+        drag.setPixmap(self.grab())
+        drag.setHotSpot(QPoint(self.width() // 2, self.height() // 2))
+        drag.exec(Qt.DropAction.CopyAction)
+
+    def mouseReleaseEvent(self, event):
+        self._press = None
+
+
+class CircuitEditor(QWidget):
+    """Grid editor for a CircuitGrid; put it in a QScrollArea for long circuits.
+
+    ``last_edit_ms`` is the time from the last edit to the end of the paint
+    that showed it.
+    """
+
+    edited = pyqtSignal(int)  # Index of the first gate that changed
+    repainted = pyqtSignal(float)  # Milliseconds from an edit to its repaint
+
+    def __init__(self, grid, parent=None):
+        super().__init__(parent)
+        self.grid = grid
+        self.setAcceptDrops(True)
+        self.drop_target = None  # (column, wire, span) under a drag
+        self.last_edit_ms = None
+        self._edit_started = None
+        self._press = None
+        self._resize()
+        instrumentation.register_canvas(self)
+
+    # --- Geometry ---
+
+    def _resize(self):
+        # One spare column to drop new gates into
+        self.setMinimumSize(LABEL_WIDTH + (len(self.grid.columns) + 1) * CELL,
+                            max(self.grid.num_qubits, 1) * CELL)
+
+    def column_rect(self, first, last=None):
+        """Widget area of columns first..last (to the right edge if last is None)"""
+        left = LABEL_WIDTH + first * CELL
+        right = self.width() if last is None else LABEL_WIDTH + (last + 1) * CELL
+        return QRect(left, 0, right - left, self.height())
+
+    def cell_at(self, position):
+        """(column, wire) under a widget position; the wire is clamped to the grid"""
+        column = max(int((position.x() - LABEL_WIDTH) // CELL), 0)
+        wire = min(max(int(position.y() // CELL), 0), self.grid.num_qubits - 1)
+        return column, wire
+
+    def _cell_rect(self, column, wire, span=1):
+        inset = (CELL - GATE_SIZE) / 2
+        return QRectF(LABEL_WIDTH + column * CELL + inset, wire * CELL + inset,
+                      GATE_SIZE, GATE_SIZE + (span - 1) * CELL)
+
+    # --- Edits ---
+
+    def set_num_qubits(self, num_qubits):
+        self.grid.set_num_qubits(num_qubits)
+        self._edited(0, shifted=True)
+
+    def clear(self):
+        self.grid.columns = []
+        self.grid.gate_count = 0
+        self._edited(0, shifted=True)
+
+    def _edited(self, column, shifted):
+        """Repaint from ``column`` (only that column unless others moved) and report it"""
+        self._edit_started = time.perf_counter()
+        if shifted:
+            self._resize()
+            self.update(self.column_rect(column))
+        else:
+            self.update(self.column_rect(column, column))
+        self.edited.emit(self.grid.gate_index(column))
+
+    def drop_gate(self, name, params, column, wire, source=None):
+        """Place a gate with its top wire at ``wire``, first removing it from
+        ``source`` (column, wire) when it is being moved"""
+        grid = self.grid
+        span = 2 if name in TWO_QUBIT_GATES else 1
+        if span > grid.num_qubits:
+            return
+        wire = min(wire, grid.num_qubits - span)
+        changed, shifted = column, False
+        if source is not None:
+            source_column, source_wire = source
+            _, removed = grid.remove(source_column, source_wire)
+            if removed:
+                shifted = True
+                if column > source_column:
+                    column -= 1
+            changed = min(changed, source_column)
+        column, inserted = grid.place(_operation(name, params, wire), column)
+        self._edited(min(changed, column), shifted or inserted)
+
+    def delete_gate(self, column, wire):
+        _, removed = self.grid.remove(column, wire)
+        self._edited(column, removed)
+
+    # --- Drag and drop ---
+
+    def _target(self, event):
+        data = json.loads(bytes(event.mimeData().data(GATE_MIME)).decode())
+        span = 2 if data["name"] in TWO_QUBIT_GATES else 1
+        column, wire = self.cell_at(event.position())
+        column = min(column, len(self.grid.columns))
+        return data, (column, min(wire, max(self.grid.num_qubits - span, 0)), span)
+
+    def _show_target(self, target):
+        # Repaint the column the indicator leaves and the one it enters
+        for old in (self.drop_target, target):
+            if old is not None:
+                self.update(self.column_rect(old[0], old[0]))
+        self.drop_target = target
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasFormat(GATE_MIME):
+            event.acceptProposedAction()
+            self._show_target(self._target(event)[1])
+
+    def dragMoveEvent(self, event):
+        if event.mimeData().hasFormat(GATE_MIME):
+            event.acceptProposedAction()
+            target = self._target(event)[1]
+            if target != self.drop_target:
+                self._show_target(target)
+
+    def dragLeaveEvent(self, event):
+        self._show_target(None)
+
+    def dropEvent(self, event):
+        if not event.mimeData().hasFormat(GATE_MIME):
+            return
+        data, (column, wire, _) = self._target(event)
+        self._show_target(None)
+        event.acceptProposedAction()
+        self.drop_gate(data["name"], data["params"], column, wire, data["source"])
+
+    # --- Mouse ---
+
+    def _gate_under(self, position):
+        column, wire = self.cell_at(position)
+        op = self.grid.at(column, wire)
+        return (column, min(op.qubits)) if op is not None else None
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._press = event.position().toPoint()
+
+    def mouseMoveEvent(self, event):
+        if self._press is None:
+            return
+        if (event.position().toPoint() - self._press).manhattanLength() < QApplication.startDragDistance():
+            return
+        cell = self._gate_under(QPointF(self._press))
+        self._press = None
+        if cell is None:
+            return
+        op = self.grid.at(*cell)
+        drag = QDrag(self)
+        drag.setMimeData(_gate_mime(op.name, op.params, source=list(cell)))
+        # Dropped anywhere outside the editor, the gate is deleted
+        if drag.exec(Qt.DropAction.MoveAction) == Qt.DropAction.IgnoreAction:
+            self.delete_gate(*cell)
+
+    def mouseReleaseEvent(self, event):
+        self._press = None
+
+    def mouseDoubleClickEvent(self, event):
+        cell = self._gate_under(event.position())
+        if cell is not None:
+            self.delete_gate(*cell)
+
+    def wheelEvent(self, event):
+        cell = self._gate_under(event.position())
+        op = self.grid.at(*cell) if cell is not None else None
+        if op is None or op.name not in ROTATION_GATES:
+            event.ignore()  # Scrolls the enclosing scroll area
+            return
+        steps = 1 if event.angleDelta().y() > 0 else -1
+        self.grid.replace(*cell, op._replace(params=(op.params[0] + steps * ANGLE_STEP,)))
+        self._edited(cell[0], shifted=False)
+
+    # --- Painting ---
+
+    def paintEvent(self, event):
+        with instrumentation.draw(self):
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            self._paint(painter, event.rect())
+            painter.end()
+        if self._edit_started is not None:
+            self.last_edit_ms = (time.perf_counter() - self._edit_started) * 1000
+            self._edit_started = None
+            self.repainted.emit(self.last_edit_ms)
+
+    def _paint(self, painter, rect):
+        painter.fillRect(rect, QColor(BACKGROUND))
+        columns = self.grid.columns
+        first = max((rect.left() - LABEL_WIDTH) // CELL, 0)
+        last = min((rect.right() - LABEL_WIDTH) // CELL, len(columns))
+
+        painter.setPen(QPen(QColor("#8FA9C2"), 1))
+        left, right = max(rect.left(), LABEL_WIDTH // 2), rect.right() + 1
+        for wire in range(self.grid.num_qubits):
+            y = wire * CELL + CELL / 2
+            painter.drawLine(QPointF(left, y), QPointF(right, y))
+        if rect.left() < LABEL_WIDTH:
+            painter.setPen(QColor("white"))
+            for wire in range(self.grid.num_qubits):
+                painter.drawText(QRectF(0, wire * CELL, LABEL_WIDTH // 2, CELL), Qt.AlignmentFlag.AlignCenter,
+                                 f"q{wire}")
+
+        if self.drop_target is not None and first <= self.drop_target[0] <= last:
+            column, wire, span = self.drop_target
+            painter.setPen(QPen(QColor("#1ABC9C"), 2, Qt.PenStyle.DashLine))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawRoundedRect(self._cell_rect(column, wire, span), 4, 4)
+
+        for column in range(first, min(last + 1, len(columns))):
+            for wire, op in sorted(columns[column].items()):
+                if wire == min(op.qubits):
+                    self._paint_gate(painter, column, op)
+
+    def _paint_gate(self, painter, column, op):
+        if len(op.qubits) == 1:
+            _paint_box(painter, self._cell_rect(column, op.qubits[0]), op.name, op.params)
+            return
+        x = LABEL_WIDTH + column * CELL + CELL / 2
+        ys = [q * CELL + CELL / 2 for q in op.qubits]
+        color = QColor(gate_color(op.name))
+        painter.setPen(QPen(color, 2))
+        painter.drawLine(QPointF(x, min(ys)), QPointF(x, max(ys)))
+        painter.setBrush(color)
+        if op.name == "swap":
+            for y in ys:
+                painter.drawLine(QPointF(x - 6, y - 6), QPointF(x + 6, y + 6))
+                painter.drawLine(QPointF(x - 6, y + 6), QPointF(x + 6, y - 6))
+            return
+        painter.drawEllipse(QPointF(x, ys[0]), 5, 5)
+        if op.name == "cz":
+            painter.drawEllipse(QPointF(x, ys[1]), 5, 5)
+            return
+        # cx target: ⊕
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawEllipse(QPointF(x, ys[1]), 10, 10)
+        painter.drawLine(QPointF(x - 10, ys[1]), QPointF(x + 10, ys[1]))
+        painter.drawLine(QPointF(x, ys[1] - 10), QPointF(x, ys[1] + 10))
@@ -0,0 +1,371 @@
+"""Virtualized circuit drawing: a column index built once, artists only for the viewport.
+
+``CircuitLayout`` places every gate once: each gate goes in the first
+column where all wires it spans (controls, targets and the wires between)
+are free. Gates are then stored sorted by column in a handful of flat
+integer arrays, about 30 bytes per gate, with an offset per column, so the
+gates in any range of columns are one contiguous slice.
+
+``CircuitView`` draws what lies inside its axes limits and nothing else,
+as a few collections whose size is capped by level of detail: labelled
+boxes when few gates are visible, plain boxes up to MAX_BOXES, and a gate
+density image beyond that or once columns shrink below a few pixels. Redraw time and memory therefore depend on the
+viewport, not on the length of the circuit.
+"""
+import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+from gates import CONTROLS, FIXED_GATES, NON_UNITARY_SKIP, PARAMETRIC_GATES, circuit_operations, gate_columns
+
+# How targets are marked; anything else is a box spanning its target wires
+TARGET_MARKERS = {"cx": "plus", "ccx": "plus", "cz": "dot", "ccz": "dot", "swap": "swap", "cswap": "swap"}
+GATE_COLORS = {"h": "#E74C3C", "x": "#1ABC9C", "y": "#1ABC9C", "z": "#1ABC9C", "measure": "#7F8C8D",
+               "reset": "#7F8C8D", "s": "#F39C12", "sdg": "#F39C12", "t": "#F39C12", "tdg": "#F39C12"}
+ROTATION_COLOR = "#9B59B6"
+DEFAULT_COLOR = "#3498DB"
+
+# Level of detail: most gates drawn with text labels, and as boxes at all;
+# columns narrower than MIN_BOX_PIXELS are shown as the density image
+MAX_LABELS = 200
+MAX_BOXES = 4000
+MIN_BOX_PIXELS = 4
+# Most wires drawn as lines (denser views show them through the density image)
+MAX_WIRE_LINES = 400
+# Initial view, and the narrowest view (short circuits are not stretched)
+DEFAULT_COLUMNS = 24
+MIN_VIEW_COLUMNS = 16
+DEFAULT_WIRES = 12
+BOX_SIZE = 0.7
+
+
+def gate_color(name):
+    if name in GATE_COLORS:
+        return GATE_COLORS[name]
+    base = name[len(name) - len(name.lstrip("c")):] if name in CONTROLS else name
+    if base in GATE_COLORS:
+        return GATE_COLORS[base]
+    if base[:1] in ("r", "u", "p"):
+        return ROTATION_COLOR
+    return DEFAULT_COLOR
+
+
+class CircuitLayout:
+    """Column index of a circuit in any form ``circuit_operations`` accepts.
+
+    Arrays are in column order: ``column``, ``low``/``high`` (wire span),
+    ``kind`` (index into ``names``), ``order`` (index into ``ops``) and the
+    gate's qubits as ``qubits[qubit_start[i]:qubit_start[i + 1]]``.
+    ``column_start[c]`` is the first gate of column c.
+    """
+
+    def __init__(self, circuit, labels=None):
+        num_qubits, ops = circuit_operations(circuit)
+        self.num_qubits = num_qubits
+        self.ops = ops
+        self.labels = list(labels) if labels is not None else [f"q{q}" for q in range(num_qubits)]
+        self.names = []
+        name_ids = {}
+        columns, self.num_columns = gate_columns(num_qubits, ops)
+        lows, highs, kinds = [], [], []
+        for op in ops:
+            kind = name_ids.get(op.name)
+            if kind is None:
+                kind = name_ids[op.name] = len(self.names)
+                self.names.append(op.name)
+            lows.append(min(op.qubits))
+            highs.append(max(op.qubits))
+            kinds.append(kind)
+
+        order = np.argsort(columns, kind="stable").astype(np.int32)
+        self.order = order
+        self.column = columns[order]
+        self.low = np.array(lows, dtype=np.int32)[order]
+        self.high = np.array(highs, dtype=np.int32)[order]
+        self.kind = np.array(kinds, dtype=np.int16)[order]
+        self.column_start = np.searchsorted(self.column, np.arange(self.num_columns + 1)).astype(np.int32)
+        counts = np.array([len(ops[i].qubits) for i in order], dtype=np.int32)
+        self.qubit_start = np.concatenate([[0], np.cumsum(counts)]).astype(np.int32)
+        self.qubits = np.fromiter((q for i in order for q in ops[i].qubits), dtype=np.int32,
+                                  count=int(self.qubit_start[-1]))
+
+        # Per-kind drawing attributes
+        self.kind_controls = np.array([CONTROLS.get(name, 0) for name in self.names], dtype=np.int32)
+        self.kind_colors = np.array([to_rgba(gate_color(name)) for name in self.names]).reshape(-1, 4)
+
+    def __len__(self):
+        return len(self.column)
+
+    @property
+    def nbytes(self):
+        """Memory of the index arrays (the Operation list is not counted)"""
+        return sum(a.nbytes for a in (self.order, self.column, self.low, self.high, self.kind,
+                                      self.column_start, self.qubit_start, self.qubits))
+
+    def visible(self, first_column, last_column, first_wire, last_wire):
+        """Positions of the gates overlapping columns and wires in the given inclusive ranges"""
+        first_column = min(max(first_column, 0), self.num_columns)
+        last_column = min(max(last_column + 1, first_column), self.num_columns)
+        start, stop = self.column_start[first_column], self.column_start[last_column]
+        inside = (self.low[start:stop] <= last_wire) & (self.high[start:stop] >= first_wire)
+        return start + np.flatnonzero(inside)
+
+    def operation(self, position):
+        return self.ops[self.order[position]]
+
+
+class CircuitView:
+    """Draws the viewport of a CircuitLayout on a matplotlib axes.
+
+    The view is the axes limits: x in columns, y in wires with qubit 0 at
+    the top. ``pan``, ``zoom`` and ``set_view`` move it; ``redraw`` replaces
+    the previous artists with ones for the new viewport, and the caller
+    draws the canvas.
+    """
+
+    def __init__(self, ax, layout):
+        self.ax = ax
+        self.layout = layout
+        self.artists = []
+        self.mode = ""
+        self.drawn = 0
+        ax.set_facecolor('#253443')
+        for spine in ax.spines.values():
+            spine.set_color('white')
+        ax.tick_params(colors='white')
+        ax.set_xlabel('Column', color='white')
+        ax.xaxis.set_major_locator(MaxNLocator(nbins=10, integer=True))
+        ax.yaxis.set_major_locator(MaxNLocator(nbins=24, integer=True, steps=[1, 2, 5, 10]))
+        ax.yaxis.set_major_formatter(FuncFormatter(self._wire_label))
+        ax.set_autoscale_on(False)
+        self.fit(DEFAULT_COLUMNS, DEFAULT_WIRES)
+
+    def _wire_label(self, value, _):
+        wire = int(round(value))
+        labels = self.layout.labels
+        return labels[wire] if 0 <= wire < len(labels) and abs(value - wire) < 1e-6 else ""
+
+    def set_layout(self, layout):
+        self.layout = layout
+        self.fit(DEFAULT_COLUMNS, DEFAULT_WIRES)
+
+    def view(self):
+        """(first column, last column, top wire, bottom wire) of the viewport, as floats"""
+        x0, x1 = self.ax.get_xlim()
+        y1, y0 = self.ax.get_ylim()
+        return x0, x1, y0, y1
+
+    def set_view(self, x0, x1, y0, y1):
+        """Show columns x0..x1 and wires y0..y1, kept within the circuit's extent"""
+        columns = max(self.layout.num_columns, MIN_VIEW_COLUMNS)
+        wires = max(self.layout.num_qubits, 1)
+        x0, x1 = _clamp_range(x0, x1, -0.5, columns - 0.5, min_width=2)
+        y0, y1 = _clamp_range(y0, y1, -0.5, wires - 0.5, min_width=1)
+        self.ax.set_xlim(x0, x1)
+        self.ax.set_ylim(y1, y0)
+
+    def fit(self, columns=None, wires=None):
+        """Show the first ``columns`` x ``wires`` cells, or the whole circuit"""
+        columns = max(self.layout.num_columns if columns is None else min(columns, self.layout.num_columns),
+                      MIN_VIEW_COLUMNS)
+        wires = self.layout.num_qubits if wires is None else min(wires, self.layout.num_qubits)
+        self.set_view(-0.5, columns - 0.5, -0.5, max(wires, 1) - 0.5)
+
+    def pan(self, columns=0.0, wires=0.0):
+        x0, x1, y0, y1 = self.view()
+        self.set_view(x0 + columns, x1 + columns, y0 + wires, y1 + wires)
+
+    def zoom(self, factor, x=None, y=None, axis="x"):
+        """Scale the viewport by ``factor`` (< 1 zooms in) about data point (x, y)"""
+        x0, x1, y0, y1 = self.view()
+        if axis in ("x", "both"):
+            x = (x0 + x1) / 2 if x is None else x
+            x0, x1 = x - (x - x0) * factor, x + (x1 - x) * factor
+        if axis in ("y", "both"):
+            y = (y0 + y1) / 2 if y is None else y
+            y0, y1 = y - (y - y0) * factor, y + (y1 - y) * factor
+        self.set_view(x0, x1, y0, y1)
+
+    def redraw(self, labels=True):
+        """Replace the drawn artists with those of the current viewport.
+
+        ``labels=False`` skips the gate labels, the costliest part of a
+        close-up view (for previews while panning).
+        """
+        for artist in self.artists:
+            artist.remove()
+        self.artists = []
+        x0, x1, y0, y1 = self.view()
+        first_column, last_column = int(np.ceil(x0 - 0.5)), int(np.floor(x1 + 0.5))
+        first_wire = max(int(np.ceil(y0 - 0.5)), 0)
+        last_wire = min(int(np.floor(y1 + 0.5)), self.layout.num_qubits - 1)
+        positions = self.layout.visible(first_column, last_column, first_wire, last_wire)
+        self.drawn = len(positions)
+
+        if last_wire - first_wire < MAX_WIRE_LINES:
+            wires = np.arange(first_wire, last_wire + 1)
+            left, right = max(x0, -0.5), min(x1, self.layout.num_columns - 0.5)
+            segments = np.stack([np.stack([np.full(len(wires), left), wires], axis=1),
+                                 np.stack([np.full(len(wires), right), wires], axis=1)], axis=1)
+            self._add(LineCollection(segments, colors='#7F8C8D', linewidths=1, zorder=1))
+
+        column_pixels = self.ax.get_window_extent().width / max(x1 - x0, 1e-9)
+        if len(positions) > MAX_BOXES or column_pixels < MIN_BOX_PIXELS:
+            self.mode = "density"
+            self._draw_density(positions, first_column, last_column, first_wire, last_wire)
+        else:
+            self.mode = "labels" if labels and len(positions) <= MAX_LABELS else "boxes"
+            self._draw_gates(positions, labels=self.mode == "labels")
+
+    def _add(self, artist):
+        """Track an artist for removal on the next redraw; collections are added to the axes here"""
+        if artist.axes is None:
+            self.ax.add_collection(artist, autolim=False)
+        self.artists.append(artist)
+        return artist
+
+    def _pixels_per_cell(self):
+        bbox = self.ax.get_window_extent()
+        x0, x1, y0, y1 = self.view()
+        return min(bbox.width / max(x1 - x0, 1e-9), bbox.height / max(y1 - y0, 1e-9))
+
+    def _draw_gates(self, positions, labels):
+        layout = self.layout
+        if not len(positions):
+            return
+        columns = layout.column[positions].astype(float)
+        kinds = layout.kind[positions]
+        names = [layout.names[k] for k in kinds]
+        cell = self._pixels_per_cell()
+        marker_size = max(cell * 0.3 * 72 / self.ax.figure.dpi, 1)
+
+        # Every qubit of every gate, flattened, with its rank inside the gate
+        counts = layout.qubit_start[positions + 1] - layout.qubit_start[positions]
+        flat = np.repeat(layout.qubit_start[positions], counts)
+        ends = np.cumsum(counts)
+        rank = np.arange(ends[-1]) - np.repeat(ends - counts, counts)
+        qubits = layout.qubits[flat + rank]
+        gate = np.repeat(np.arange(len(positions)), counts)
+        control = rank < np.repeat(layout.kind_controls[kinds], counts)
+
+        barrier = np.array([name == "barrier" for name in names])
+        marker = np.array([TARGET_MARKERS.get(name, "box") for name in names])
+        spans = (layout.low[positions] != layout.high[positions]) & ~barrier
+
+        # Vertical connectors of multi-qubit gates, dashed lines across barriers
+        low, high = layout.low[positions], layout.high[positions]
+        for mask, style, overhang in ((spans, 'solid', 0.0), (barrier, 'dashed', 0.4)):
+            if mask.any():
+                segments = np.stack([np.stack([columns[mask], low[mask] - overhang], axis=1),
+                                     np.stack([columns[mask], high[mask] + overhang], axis=1)], axis=1)
+                self._add(LineCollection(segments, colors='#ECF0F1', linewidths=1.2,
+                                         linestyles=style, zorder=2))
+
+        # Control dots and point-like targets
+        target = ~control & ~np.repeat(barrier, counts)
+        point = {style: target & (np.repeat(marker, counts) == style) for style in ("plus", "dot", "swap")}
+        dots = control | point["dot"]
+        if dots.any():
+            self._add_markers(columns[gate[dots]], qubits[dots], 'o', marker_size * 0.6, fill='#ECF0F1')
+        if point["plus"].any():
+            xs, ys = columns[gate[point["plus"]]], qubits[point["plus"]]
+            self._add_markers(xs, ys, 'o', marker_size * 1.2, fill='#1A2930', edge='#1ABC9C')
+            self._add_markers(xs, ys, '+', marker_size * 1.2, edge='#1ABC9C')
+        if point["swap"].any():
+            self._add_markers(columns[gate[point["swap"]]], qubits[point["swap"]], 'x', marker_size, edge='#ECF0F1')
+
+        # Boxes spanning each boxed gate's target wires
+        boxed = target & (np.repeat(marker, counts) == "box")
+        if boxed.any():
+            owners, first = np.unique(gate[boxed], return_index=True)
+            box_low = np.minimum.reduceat(qubits[boxed], first) - BOX_SIZE / 2
+            box_high = np.maximum.reduceat(qubits[boxed], first) + BOX_SIZE / 2
+            left, right = columns[owners] - BOX_SIZE / 2, columns[owners] + BOX_SIZE / 2
+            verts = np.stack([np.stack([left, box_low], 1), np.stack([right, box_low], 1),
+                              np.stack([right, box_high], 1), np.stack([left, box_high], 1)], axis=1)
+            self._add(PolyCollection(verts, facecolors=layout.kind_colors[kinds[owners]],
+                                     edgecolors='#1A2930', linewidths=0.5, zorder=3))
+            if labels:
+                self._draw_labels(positions, owners, columns, (box_low + box_high) / 2, cell)
+
+    def _draw_labels(self, positions, owners, columns, centres, cell):
+        """Gate names (and angles when zoomed in) as text-shaped markers.
+
+        Markers with the same text share one Line2D, whose glyph path Agg
+        renders once and stamps at every position; that is several times
+        cheaper than one Text artist per gate.
+        """
+        font = float(np.clip(cell * 0.22, 5, 11))
+        with_params = cell > 70
+        groups = {}  # (text, font size) -> ([x], [y])
+        for owner, centre in zip(owners, centres):
+            op = self.layout.operation(positions[owner])
+            name = "M" if op.name == "measure" else op.name.upper() if len(op.name) <= 2 else op.name
+            # Matrix parameters (e.g. of a unitary gate) have no short label
+            angles = [format_angle(p) for p in op.params if np.ndim(p) == 0] if with_params else []
+            if angles:
+                entries = [(name, font, centre - 0.12), (",".join(angles), font * 0.8, centre + 0.15)]
+            else:
+                entries = [(name, font, centre)]
+            for text, size, y in entries:
+                xs, ys = groups.setdefault((text, size), ([], []))
+                xs.append(columns[owner])
+                ys.append(y)
+        for (text, size), (xs, ys) in groups.items():
+            # Mathtext markers are scaled to fit their longer side into markersize
+            marker = "$\\mathrm{" + text.replace("_", "\\_") + "}$"
+            line = self._add_markers(xs, ys, marker, size * max(0.7, 0.6 * len(text)), fill='white')
+            line.set_zorder(4)
+
+    def _add_markers(self, xs, ys, marker, size, fill='none', edge=None):
+        line, = self.ax.plot(xs, ys, linestyle='none', marker=marker, markersize=size,
+                             markerfacecolor=fill, markeredgecolor=edge or fill, zorder=3)
+        self.artists.append(line)
+        return line
+
+    def _draw_density(self, positions, first_column, last_column, first_wire, last_wire):
+        """Gates per cell of a pixel-sized grid over the viewport, as one image"""
+        layout = self.layout
+        bbox = self.ax.get_window_extent()
+        num_columns = last_column - first_column + 1
+        num_wires = last_wire - first_wire + 1
+        bins_x = max(1, min(num_columns, int(bbox.width / 2)))
+        bins_y = max(1, min(num_wires, int(bbox.height / 2)))
+        x = (layout.column[positions] - first_column) * bins_x // num_columns
+        counts = np.zeros(bins_x * bins_y)
+        # A gate counts once on each end wire of its span (once in all for a single wire)
+        low, high = layout.low[positions], layout.high[positions]
+        wide = high != low
+        for wires, columns in ((low, x), (high[wide], x[wide])):
+            inside = (wires >= first_wire) & (wires <= last_wire)
+            y = (wires[inside] - first_wire) * bins_y // num_wires
+            counts += np.bincount(y * bins_x + columns[inside], minlength=bins_x * bins_y)
+        image = np.log1p(counts.reshape(bins_y, bins_x))
+        self._add(self.ax.imshow(image, cmap='viridis', interpolation='nearest', aspect='auto',
+                                 extent=(first_column - 0.5, last_column + 0.5, last_wire + 0.5, first_wire - 0.5),
+                                 vmin=0, vmax=max(float(image.max()), 1e-9), zorder=2))
+
+
+def format_angle(value):
+    """Multiples of π/8 as fractions of π, anything else as a number"""
+    ratio = value / np.pi
+    for denominator in (1, 2, 4, 8):
+        numerator = round(ratio * denominator)
+        if numerator and abs(ratio * denominator - numerator) < 1e-9:
+            numerator = "" if numerator == 1 else "-" if numerator == -1 else str(numerator)
+            return f"{numerator}π" + (f"/{denominator}" if denominator > 1 else "")
+    return f"{value:.3g}"
+
+
+def _clamp_range(low, high, lower, upper, min_width):
+    """Shift (and if needed shrink) [low, high] into [lower, upper], at least min_width wide"""
+    width = min(max(high - low, min_width), max(upper - lower, min_width))
+    low = min(max(low, lower), max(upper - width, lower))
+    return low, low + width
+
+
+def is_simulable(layout):
+    """True when the statevector simulator knows every gate (unknown QASM gates are only drawn)"""
+    known = set(FIXED_GATES) | set(PARAMETRIC_GATES) | NON_UNITARY_SKIP
+    return all(name in known for name in layout.names)
@@ -0,0 +1,121 @@
+import numpy as np
+
+
+_YY = np.kron(np.array([[0, -1j], [1j, 0]]), np.array([[0, -1j], [1j, 0]]))
+
+
+def partial_trace(states, keep, num_qubits):
+    """Reduced density matrices of a batch of pure states.
+
+    ``states`` has shape (..., 2**num_qubits); leading axes are a batch.
+    ``keep`` lists the qubits to keep. Returns (..., 2**k, 2**k) with the kept
+    qubits in ascending order, the lowest being the least significant bit.
+    The trace is a single batched matrix product: the state is permuted to
+    (batch, kept, traced) and multiplied by its own conjugate transpose.
+    """
+    states = np.asarray(states)
+    batch_shape = states.shape[:-1]
+    nb = len(batch_shape)
+    keep = sorted(keep)
+    traced = [q for q in range(num_qubits) if q not in keep]
+
+    psi = states.reshape(batch_shape + (2,) * num_qubits)
+    # Qubit q is tensor axis n - 1 - q; most significant kept qubit first
+    keep_axes = [nb + num_qubits - 1 - q for q in reversed(keep)]
+    traced_axes = [nb + num_qubits - 1 - q for q in reversed(traced)]
+    psi = np.moveaxis(psi, keep_axes + traced_axes, list(range(nb, nb + num_qubits)))
+    psi = psi.reshape(batch_shape + (2 ** len(keep), 2 ** len(traced)))
+    return psi @ np.conj(np.swapaxes(psi, -1, -2))
+
+
+def bloch_vector(rho):
+    """Bloch vectors (..., 3) of single-qubit density matrices (..., 2, 2)"""
+    rho = np.asarray(rho)
+    return np.stack([2 * rho[..., 0, 1].real,
+                     -2 * rho[..., 0, 1].imag,
+                     (rho[..., 0, 0] - rho[..., 1, 1]).real], axis=-1)
+
+
+def reduced_bloch_vectors(states, num_qubits):
+    """Bloch vectors (..., num_qubits, 3) of every single-qubit reduced state.
+
+    No density matrices are formed: for each qubit the batch is viewed as
+    (batch, high, 2, low) and ρ01 and ⟨Z⟩ are reduced directly from the two
+    halves, for all states of the batch at once. |ψ|² is computed once and
+    shared by every qubit.
+    """
+    states = np.asarray(states)
+    batch_shape = states.shape[:-1]
+    flat = states.reshape((-1, states.shape[-1]))
+    batch = flat.shape[0]
+    probs = flat.real ** 2 + flat.imag ** 2
+
+    vectors = np.empty((batch, num_qubits, 3))
+    for q in range(num_qubits):
+        shape = (batch, 2 ** (num_qubits - 1 - q), 2, 2 ** q)
+        view = flat.reshape(shape)
+        coherence = np.einsum('zab,zab->z', view[:, :, 0, :], np.conj(view[:, :, 1, :]))  # ρ01
+        marginals = probs.reshape(shape).sum(axis=(1, 3))
+        vectors[:, q, 0] = 2 * coherence.real
+        vectors[:, q, 1] = -2 * coherence.imag
+        vectors[:, q, 2] = marginals[:, 0] - marginals[:, 1]
+    return vectors.reshape(batch_shape + (num_qubits, 3))
+
+
+def von_neumann_entropy(rho):
+    """Entropy in bits of density matrices (..., d, d)"""
+    eigenvalues = np.clip(np.linalg.eigvalsh(rho), 0, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(eigenvalues > 1e-12, -eigenvalues * np.log2(eigenvalues), 0)
+    return terms.sum(axis=-1)
+
+
+def entanglement_entropy(states, subsystem, num_qubits):
+    """Entropy of entanglement between ``subsystem`` and the rest, for pure states"""
+    return von_neumann_entropy(partial_trace(states, subsystem, num_qubits))
+
+
+def bond_entropies(state, num_qubits):
+    """Entanglement entropy in bits across each cut of a pure state's qubit chain.
+
+    Entry k is the entropy of qubits 0..k against k+1..n-1, from the
+    eigenvalues of the Gram matrix on the smaller side of the cut, so no
+    2**n x 2**n density matrix is formed.
+    """
+    entropies = np.zeros(max(num_qubits - 1, 0))
+    for k in range(num_qubits - 1):
+        # Qubits 0..k are the low bits: columns of the (2**(n-k-1), 2**(k+1)) view
+        matrix = np.asarray(state).reshape(2 ** (num_qubits - k - 1), 2 ** (k + 1))
+        gram = matrix.conj().T @ matrix if k + 1 <= num_qubits - k - 1 else matrix @ matrix.conj().T
+        entropies[k] = von_neumann_entropy(gram)
+    return entropies
+
+
+def concurrence(rho):
+    """Wootters concurrence of two-qubit density matrices (..., 4, 4)"""
+    rho = np.asarray(rho)
+    rho_tilde = _YY @ np.conj(rho) @ _YY
+    eigenvalues = np.linalg.eigvals(rho @ rho_tilde)
+    roots = np.sort(np.sqrt(np.clip(eigenvalues.real, 0, None)), axis=-1)[..., ::-1]
+    return np.maximum(0, roots[..., 0] - roots[..., 1] - roots[..., 2] - roots[..., 3])
+
+
+def pure_concurrence(states):
+    """Concurrence |⟨ψ|Y⊗Y|ψ*⟩| of two-qubit pure states (..., 4)"""
+    states = np.asarray(states)
+    return np.abs(np.einsum('...i,ij,...j->...', np.conj(states), _YY, np.conj(states)))
+
+
+def state_summary(states, num_qubits):
+    """Reduced Bloch vectors plus entanglement measures for a batch of pure states.
+
+    Returns a dict with ``bloch`` (..., n, 3), ``entropy`` (entropy of qubit 0
+    against the rest) and, for two-qubit states, ``concurrence``.
+    """
+    summary = {
+        "bloch": reduced_bloch_vectors(states, num_qubits),
+        "entropy": entanglement_entropy(states, [0], num_qubits),
+    }
+    if num_qubits == 2:
+        summary["concurrence"] = pure_concurrence(states)
+    return summary
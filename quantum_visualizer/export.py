@@ -0,0 +1,301 @@
+"""Headless batch export of every visualization to image files.
+
+A sweep spec (JSON) lists, per visualization, the values of each parameter
+to render. Every combination of values becomes one job; jobs are spread
+over a process pool whose workers run matplotlib on Agg and Qt on the
+offscreen platform, so no window ever appears. Each worker builds a
+visualization window once and re-renders it for every job it receives by
+moving the window's own controls, exactly as a user would.
+
+Example spec::
+
+    {
+        "formats": ["png", "svg"],
+        "dpi": 100,
+        "visualizations": {
+            "superposition": {"alpha": {"start": 0, "stop": 100, "step": 10},
+                              "phase": [0, 50]},
+            "entanglement": {"state": [0, 1, 2, 3], "frame": {"start": 0, "stop": 120, "step": 30}},
+            "bloch": {"theta": [0, 45, 90], "phi": [0, 90]},
+            "circuit": {"qubits": [2, 3, 4]}
+        }
+    }
+
+Run with ``python quantum_visualizer/export.py spec.json --out renders``.
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+# Window background of the app; the figures' own face is white, and their
+# titles, labels and equations are drawn in white on top of this colour
+WINDOW_BACKGROUND = '#1A2930'
+
+
+def _control(index):
+    """Parameter setter for the index-th entry of a window's ``controls``"""
+    def setter(window, value):
+        control = window.controls[index]
+        if hasattr(control, "setCurrentIndex"):
+            control.setCurrentIndex(int(value))
+        else:
+            control.setValue(int(value))
+    return setter
+
+
+def _entanglement_frame(window, value):
+    window.show_frame(int(value))
+
+
+def _measurement_shots(window, value):
+    # Shots are drawn from the state the earlier parameters selected
+    window.jobs.wait()
+    window.run_shots(int(value))
+
+
+def _interference_aperture(window, value):
+    # Custom masks are picked in a file dialog, which a headless worker cannot show
+    if int(value) not in (0, 1):
+        raise ValueError("interference aperture must be 0 (double slit) or 1 (grating)")
+    _control(2)(window, value)
+
+
+# Qt windows: (builder in main.py, {parameter: setter}, canvas attributes).
+# Parameters are applied in the order listed here, not the order in the spec.
+WINDOW_VISUALIZATIONS = {
+    "quantum_states": ("visualize_quantum_states",
+                       {"state": _control(0), "phase": _control(1)}, ("canvas",)),
+    "superposition": ("visualize_superposition",
+                      {"alpha": _control(0), "phase": _control(1)}, ("bloch_canvas", "prob_canvas")),
+    "entanglement": ("visualize_entanglement",
+                     {"state": _control(0), "frame": _entanglement_frame}, ("canvas",)),
+    "interference": ("visualize_interference",
+                     {"aperture": _interference_aperture, "paths": _control(3), "grid": _control(4),
+                      "path1": _control(0), "path2": _control(1)}, ("canvas",)),
+    "bloch_grid": ("visualize_bloch_grid",
+                   {"preset": _control(0), "qubits": _control(1), "param": _control(2)}, ("canvas",)),
+    "measurement": ("visualize_measurement",
+                    {"preset": _control(0), "qubits": _control(1), "param": _control(2),
+                     "shots": _measurement_shots}, ("canvas",)),
+}
+
+# Parameters that trigger an action rather than set a control, and the value
+# a job that does not sweep them renders with
+ACTION_DEFAULTS = {
+    "entanglement": {"frame": 0},
+    "measurement": {"shots": 0},
+}
+
+# Plain matplotlib figures: parameters and their defaults
+FIGURE_VISUALIZATIONS = {
+    "bloch": {"theta": 90, "phi": 0},  # degrees; the default is the X axis
+    "circuit": {"qubits": 2},
+}
+
+VISUALIZATIONS = sorted(WINDOW_VISUALIZATIONS) + sorted(FIGURE_VISUALIZATIONS)
+
+
+def parameter_values(value):
+    """Expand one spec entry: a scalar, a list, or {"start", "stop", "step"}"""
+    if isinstance(value, dict):
+        values = np.arange(value.get("start", 0), value["stop"], value.get("step", 1))
+        if values.dtype.kind == "f":
+            # Keeps 0.1 * 3 from becoming 0.30000000000000004 in file names
+            values = np.round(values, 10)
+        return values.tolist()
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def expand_spec(spec):
+    """List of (visualization, params) jobs: the cartesian product of each sweep"""
+    jobs = []
+    for name, sweep in spec.get("visualizations", {}).items():
+        if name in WINDOW_VISUALIZATIONS:
+            known = WINDOW_VISUALIZATIONS[name][1]
+        elif name in FIGURE_VISUALIZATIONS:
+            known = FIGURE_VISUALIZATIONS[name]
+        else:
+            raise ValueError(f"Unknown visualization '{name}', choose from {VISUALIZATIONS}")
+        sweep = sweep or {}
+        unknown = set(sweep) - set(known)
+        if unknown:
+            raise ValueError(f"Unknown parameters {sorted(unknown)} for '{name}', "
+                             f"choose from {sorted(known)}")
+
+        keys = [key for key in known if key in sweep]
+        for values in itertools.product(*(parameter_values(sweep[key]) for key in keys)):
+            jobs.append((name, dict(zip(keys, values))))
+    return jobs
+
+
+def output_stem(name, params):
+    """File name without extension, e.g. ``superposition_alpha-30_phase-0``"""
+    return "_".join([name] + [f"{key}-{value}" for key, value in params.items()])
+
+
+# Per-process state, set up by _init_worker
+_worker = {}
+
+
+def _init_worker():
+    # Must run before matplotlib or Qt are imported in this process
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ["MPLBACKEND"] = "Agg"
+    import matplotlib
+    matplotlib.use("Agg")
+    from PyQt6.QtWidgets import QApplication
+    _worker["app"] = QApplication.instance() or QApplication([])
+    _worker["windows"] = {}
+
+
+def _control_values(window):
+    """Value of each of a window's controls, None for plain buttons"""
+    values = []
+    for control in window.controls:
+        if hasattr(control, "currentIndex"):
+            values.append(control.currentIndex())
+        elif hasattr(control, "value"):
+            values.append(control.value())
+        else:
+            values.append(None)
+    return values
+
+
+def _window_figures(name, params):
+    import main
+    builder, setters, canvases = WINDOW_VISUALIZATIONS[name]
+    if name not in _worker["windows"]:
+        # One window per visualization and worker, reused for every job
+        window = getattr(main, builder)()
+        _worker["windows"][name] = (window, _control_values(window))
+    window, defaults = _worker["windows"][name]
+
+    # Start from the window's initial controls, so parameters this job does
+    # not sweep never keep the values an earlier job left behind
+    for index, value in enumerate(defaults):
+        if value is not None:
+            _control(index)(window, value)
+    params = dict(ACTION_DEFAULTS.get(name, {}), **params)
+    for key, setter in setters.items():
+        if key in params:
+            setter(window, params[key])
+    scheduler = getattr(window, "scheduler", None)
+    if scheduler is not None:
+        # Slider-driven windows render on a timer; draw the final values now
+        scheduler.flush()
+    jobs = getattr(window, "jobs", None)
+    if jobs is not None:
+        # Wait for simulations running off the GUI thread
+        jobs.wait()
+    _worker["app"].processEvents()
+
+    figures = []
+    for attr in canvases:
+        canvas = getattr(window, attr)
+        canvas.draw()
+        suffix = attr[:-len("canvas")].rstrip("_") if len(canvases) > 1 else ""
+        figures.append((suffix, canvas.fig))
+    return figures, WINDOW_BACKGROUND, lambda: None
+
+
+def _plain_figures(name, params):
+    import matplotlib.pyplot as plt
+    values = dict(FIGURE_VISUALIZATIONS[name], **params)
+    if name == "bloch":
+        import bloch_visualizer
+        vector = bloch_visualizer.bloch_vector_from_angles(math.radians(values["theta"]),
+                                                           math.radians(values["phi"]))
+        figures = [("", bloch_visualizer.bloch_sphere(vector, show=False))]
+    else:
+        import visualize_circuit
+        qc = visualize_circuit.sample_circuit(int(values["qubits"]))
+        circuit_fig, amplitude_fig, _ = visualize_circuit.circuit_figures(qc)
+        figures = [("diagram", circuit_fig), ("amplitudes", amplitude_fig)]
+
+    def close():
+        for _, fig in figures:
+            plt.close(fig)
+    # These figures are styled for their own face colour
+    return figures, None, close
+
+
+def render_jobs(jobs, out_dir, formats, dpi):
+    """Render a chunk of jobs in this worker; returns the files written"""
+    written = []
+    for name, params in jobs:
+        if name in WINDOW_VISUALIZATIONS:
+            figures, facecolor, close = _window_figures(name, params)
+        else:
+            figures, facecolor, close = _plain_figures(name, params)
+        stem = output_stem(name, params)
+        for suffix, fig in figures:
+            for fmt in formats:
+                path = os.path.join(out_dir, f"{stem}_{suffix}.{fmt}" if suffix else f"{stem}.{fmt}")
+                fig.savefig(path, format=fmt, dpi=dpi, facecolor=facecolor or fig.get_facecolor())
+                written.append(path)
+        close()
+    return written
+
+
+def chunk_jobs(jobs, workers):
+    """Split jobs into contiguous chunks so each worker reuses its windows"""
+    if not jobs:
+        return []
+    size = max(1, math.ceil(len(jobs) / (workers * 4)))
+    return [jobs[i:i + size] for i in range(0, len(jobs), size)]
+
+
+def export(spec, out_dir, workers=None, formats=None, dpi=None, stream=sys.stdout):
+    """Render every job of a sweep spec into ``out_dir`` and return the written paths"""
+    formats = formats or spec.get("formats", ["png"])
+    dpi = dpi or spec.get("dpi", 100)
+    workers = workers or os.cpu_count() or 1
+    jobs = expand_spec(spec)
+    os.makedirs(out_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    written = []
+    if workers == 1:
+        _init_worker()
+        written = render_jobs(jobs, out_dir, formats, dpi)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(render_jobs, chunk, out_dir, formats, dpi)
+                       for chunk in chunk_jobs(jobs, workers)]
+            for future in as_completed(futures):
+                written.extend(future.result())
+                print(f"  {len(written)} files written", file=stream)
+
+    elapsed = time.perf_counter() - start
+    print(f"Exported {len(jobs)} renders ({len(written)} files) to {out_dir} "
+          f"in {elapsed:.1f} s with {workers} worker(s)", file=stream)
+    return sorted(written)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render quantum visualizations to image files")
+    parser.add_argument("spec", help="JSON sweep spec (see the module docstring)")
+    parser.add_argument("--out", default="renders", help="output directory")
+    parser.add_argument("--format", action="append", choices=["png", "svg", "pdf"],
+                        help="output format, may be repeated (default: the spec's, else png)")
+    parser.add_argument("--dpi", type=int, help="raster resolution (default: the spec's, else 100)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+    export(spec, args.out, workers=args.workers, formats=args.format, dpi=args.dpi)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+from collections import namedtuple
+
+import numpy as np
+
+
+# A single circuit instruction in the simulators' own format. ``qubits`` uses
+# Qiskit's ordering: for multi-qubit gates the first qubit is the least
+# significant bit of the gate matrix index (for cx that is the control).
+Operation = namedtuple("Operation", ["name", "qubits", "params", "matrix"], defaults=((), None))
+
+# Instructions that do not change the statevector
+NON_UNITARY_SKIP = {"barrier", "measure", "delay", "id", "i"}
+
+_SQRT1_2 = 1 / np.sqrt(2)
+_P0 = np.array([[1, 0], [0, 0]], dtype=complex)
+_P1 = np.array([[0, 0], [0, 1]], dtype=complex)
+_I2 = np.eye(2, dtype=complex)
+
+
+def _controlled(u):
+    """Controlled-U with the control on the least significant (first) qubit"""
+    dim = u.shape[0]
+    return np.kron(np.eye(dim), _P0) + np.kron(u, _P1)
+
+
+def _rx(theta):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -1j * s], [-1j * s, c]], dtype=complex)
+
+
+def _ry(theta):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([[c, -s], [s, c]], dtype=complex)
+
+
+def _rz(theta):
+    return np.array([[np.exp(-0.5j * theta), 0], [0, np.exp(0.5j * theta)]], dtype=complex)
+
+
+def _rzz(theta):
+    phase = np.exp(0.5j * theta)
+    return np.diag([phase.conjugate(), phase, phase, phase.conjugate()])
+
+
+def _p(lam):
+    return np.array([[1, 0], [0, np.exp(1j * lam)]], dtype=complex)
+
+
+def _u(theta, phi, lam):
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    return np.array([
+        [c, -np.exp(1j * lam) * s],
+        [np.exp(1j * phi) * s, np.exp(1j * (phi + lam)) * c],
+    ], dtype=complex)
+
+
+X = np.array([[0, 1], [1, 0]], dtype=complex)
+Y = np.array([[0, -1j], [1j, 0]], dtype=complex)
+Z = np.array([[1, 0], [0, -1]], dtype=complex)
+H = np.array([[1, 1], [1, -1]], dtype=complex) * _SQRT1_2
+S = np.array([[1, 0], [0, 1j]], dtype=complex)
+T = np.array([[1, 0], [0, np.exp(0.25j * np.pi)]], dtype=complex)
+SX = 0.5 * np.array([[1 + 1j, 1 - 1j], [1 - 1j, 1 + 1j]], dtype=complex)
+SWAP = np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, 1, 0, 0], [0, 0, 0, 1]], dtype=complex)
+
+FIXED_GATES = {
+    "id": _I2,
+    "x": X,
+    "y": Y,
+    "z": Z,
+    "h": H,
+    "s": S,
+    "sdg": S.conj().T,
+    "t": T,
+    "tdg": T.conj().T,
+    "sx": SX,
+    "sxdg": SX.conj().T,
+    "cx": _controlled(X),
+    "cy": _controlled(Y),
+    "cz": _controlled(Z),
+    "ch": _controlled(H),
+    "swap": SWAP,
+    "ccx": _controlled(_controlled(X)),
+    "ccz": _controlled(_controlled(Z)),
+    "cswap": _controlled(SWAP),
+}
+
+PARAMETRIC_GATES = {
+    "rx": _rx,
+    "ry": _ry,
+    "rz": _rz,
+    "p": _p,
+    "u1": _p,
+    "u2": lambda phi, lam: _u(np.pi / 2, phi, lam),
+    "u": _u,
+    "u3": _u,
+    "crx": lambda theta: _controlled(_rx(theta)),
+    "cry": lambda theta: _controlled(_ry(theta)),
+    "crz": lambda theta: _controlled(_rz(theta)),
+    "cp": lambda lam: _controlled(_p(lam)),
+    "cu1": lambda lam: _controlled(_p(lam)),
+    "rzz": _rzz,
+}
+
+# Leading control qubits of controlled gates (Qiskit order: controls first)
+CONTROLS = {"cx": 1, "cy": 1, "cz": 1, "ch": 1, "crx": 1, "cry": 1, "crz": 1, "cp": 1, "cu1": 1,
+            "cu": 1, "cu3": 1, "ccx": 2, "ccz": 2, "cswap": 1}
+
+
+def gate_matrix(name, params=()):
+    """Return the unitary of a named gate in Qiskit's qubit ordering"""
+    if name in FIXED_GATES:
+        return FIXED_GATES[name]
+    if name in PARAMETRIC_GATES:
+        return PARAMETRIC_GATES[name](*params)
+    raise ValueError(f"Unknown gate '{name}'")
+
+
+def gate_columns(num_qubits, ops):
+    """(columns, num_columns): the column of each Operation when every gate goes
+    in the first column where all wires it spans (the wires between its qubits
+    included) are free. Gates with lower columns never depend on later ones.
+    """
+    columns = np.empty(len(ops), dtype=np.int32)
+    frontier = [0] * num_qubits  # First free column of each wire
+    for i, op in enumerate(ops):
+        qubits = op.qubits
+        if len(qubits) == 1:
+            column = frontier[qubits[0]]
+            frontier[qubits[0]] = column + 1
+        else:
+            low, high = min(qubits), max(qubits)
+            column = max(frontier[low:high + 1])
+            frontier[low:high + 1] = [column + 1] * (high - low + 1)
+        columns[i] = column
+    return columns, max(frontier, default=0)
+
+
+def _param(value):
+    # Angles become floats; matrix parameters (e.g. of a UnitaryGate) stay arrays
+    if isinstance(value, np.ndarray):
+        return value
+    return float(value)
+
+
+def circuit_operations(circuit):
+    """Convert a circuit to ``(num_qubits, [Operation, ...])``.
+
+    Accepts a Qiskit ``QuantumCircuit`` (parameters must be bound) or a
+    ``(num_qubits, ops)`` pair where each op is an Operation or a
+    ``(name, qubits[, params])`` tuple.
+    """
+    if hasattr(circuit, "data") and hasattr(circuit, "find_bit"):
+        ops = []
+        for instruction in circuit.data:
+            gate = instruction.operation
+            qubits = tuple(circuit.find_bit(q).index for q in instruction.qubits)
+            params = tuple(_param(p) for p in gate.params) if gate.name not in NON_UNITARY_SKIP else ()
+            matrix = None
+            if gate.name not in FIXED_GATES and gate.name not in PARAMETRIC_GATES \
+                    and gate.name not in NON_UNITARY_SKIP and hasattr(gate, "to_matrix"):
+                matrix = np.asarray(gate.to_matrix(), dtype=complex)
+            ops.append(Operation(gate.name, qubits, params, matrix))
+        return circuit.num_qubits, ops
+
+    num_qubits, raw_ops = circuit
+    ops = []
+    for op in raw_ops:
+        if not isinstance(op, Operation):
+            op = Operation(op[0], tuple(op[1]), tuple(op[2]) if len(op) > 2 else ())
+        ops.append(op)
+    return num_qubits, ops
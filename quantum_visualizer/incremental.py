@@ -0,0 +1,153 @@
+"""Incremental re-simulation of edited circuits from checkpointed states.
+
+``IncrementalSimulator`` runs the statevector simulator column by column
+(the columns of ``gates.gate_columns``, the same the circuit viewer draws)
+and keeps the state after every ``interval`` columns. When the circuit is
+run again after an edit, the gates before the first changed gate are
+compared, every checkpoint that only depends on unchanged gates is kept,
+and simulation resumes from the last of them. Editing a gate near the end
+of a deep circuit therefore costs the gates after the edit plus at most
+one interval, not the whole circuit.
+
+Each checkpoint is a full 2**n statevector, so ``max_bytes`` bounds how
+many are kept: when a circuit has more intervals than the budget allows,
+the interval doubles (and every other checkpoint is dropped) until they fit.
+The initial state counts against the budget but is kept even when it alone
+exceeds it.
+"""
+import threading
+
+import numpy as np
+
+from gates import circuit_operations, gate_columns
+from simulator import StatevectorResult, StatevectorSimulator, zero_state
+
+DEFAULT_INTERVAL = 1
+DEFAULT_MAX_BYTES = 64 * 2 ** 20
+
+
+def _same(a, b):
+    # Operations can carry matrices, which namedtuple equality cannot compare
+    if a is b:
+        return True
+    if a.name != b.name or tuple(a.qubits) != tuple(b.qubits):
+        return False
+    if a.matrix is None or b.matrix is None:
+        return a.matrix is b.matrix and tuple(a.params) == tuple(b.params)
+    # An attached matrix stands for the parameters, which may be arrays themselves
+    return a.matrix is b.matrix or np.array_equal(a.matrix, b.matrix)
+
+
+class IncrementalSimulator:
+    """Statevector simulator that re-simulates only what an edit changed.
+
+    ``interval`` is the number of columns between checkpoints (the finest
+    spacing; the memory budget may widen it) and ``max_bytes`` the memory
+    all checkpoints may use together. ``stats()`` describes the last run.
+    Runs are serialized, so one instance can serve a JobRunner whose
+    superseded jobs may still be finishing.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, max_bytes=DEFAULT_MAX_BYTES, dtype=np.complex128,
+                 simulator=None):
+        self.interval = max(1, int(interval))
+        self.max_bytes = max_bytes
+        self.dtype = dtype
+        self.simulator = simulator if simulator is not None else StatevectorSimulator(dtype)
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """Forget the last circuit and every checkpoint"""
+        self.num_qubits = None
+        self.ops = []
+        self.columns = np.empty(0, dtype=np.int32)
+        self.checkpoints = {}  # Column c -> state after every gate in columns < c
+        self.spacing = self.interval
+        self.last_run = {"resumed_at": 0, "columns": 0, "simulated_columns": 0, "simulated_gates": 0}
+
+    @property
+    def nbytes(self):
+        return sum(state.nbytes for state in self.checkpoints.values())
+
+    def stats(self):
+        return dict(self.last_run, checkpoints=len(self.checkpoints), nbytes=self.nbytes,
+                    max_bytes=self.max_bytes, spacing=self.spacing)
+
+    def _spacing(self, num_columns, state_bytes):
+        # Finest power-of-two multiple of ``interval`` whose checkpoints fit the
+        # budget; the initial state at column 0 is always kept and counts against it
+        capacity = max(0, self.max_bytes // state_bytes - 1)
+        spacing = self.interval
+        while (num_columns - 1) // spacing > capacity:
+            spacing *= 2
+        return spacing
+
+    def _valid_columns(self, num_qubits, ops, columns, first_changed):
+        # Checkpoints at columns <= the returned one hold only unchanged gates
+        if num_qubits != self.num_qubits:
+            return -1  # Another register: not even the initial state carries over
+        common = min(len(ops), len(self.ops))
+        if first_changed is None:
+            first_changed = 0
+            while first_changed < common and _same(ops[first_changed], self.ops[first_changed]):
+                first_changed += 1
+        first_changed = min(first_changed, common)
+        # Gates before the first change sit in the same columns in both circuits
+        # (a column only depends on earlier gates), so the valid prefix ends at
+        # the first column holding a changed gate in either of them
+        valid = np.inf
+        for changed in (columns[first_changed:], self.columns[first_changed:]):
+            if len(changed):
+                valid = min(valid, int(changed.min()))
+        return valid
+
+    def run(self, circuit, first_changed=None, progress=None):
+        """Simulate ``circuit``, resuming from the checkpoints of the previous run.
+
+        ``first_changed`` is the index of the first gate that differs from the
+        previous circuit, if the caller knows it; otherwise the gates are
+        compared. ``progress(fraction)`` covers the gates actually simulated.
+        """
+        with self._lock:
+            return self._run(circuit, first_changed, progress)
+
+    def _run(self, circuit, first_changed, progress):
+        num_qubits, ops = circuit_operations(circuit)
+        columns, num_columns = gate_columns(num_qubits, ops)
+        valid = self._valid_columns(num_qubits, ops, columns, first_changed)
+
+        state_bytes = 2 ** num_qubits * np.dtype(self.dtype).itemsize
+        spacing = self._spacing(num_columns, state_bytes)
+        checkpoints = {column: state for column, state in self.checkpoints.items()
+                       if column <= valid and column % spacing == 0}
+        checkpoints.setdefault(0, zero_state(num_qubits, self.dtype))
+        start = max(checkpoints)
+        state = checkpoints[start]
+
+        # Gates of the remaining columns in column order, which is equivalent to
+        # circuit order; each interval is cut at the first gate past it
+        remaining = np.flatnonzero(columns >= start)
+        remaining = remaining[np.argsort(columns[remaining], kind="stable")]
+        boundaries = np.arange(start + spacing, num_columns, spacing)
+        cuts = np.searchsorted(columns[remaining], boundaries)
+        total = len(remaining)
+        next_report = 0
+        for boundary, (lo, hi) in zip(list(boundaries) + [None], zip(np.r_[0, cuts], np.r_[cuts, total])):
+            segment = [ops[i] for i in remaining[lo:hi]]
+            if segment:
+                if progress is not None and lo >= next_report:
+                    progress(lo / total)
+                    next_report = lo + max(1, total // 100)
+                state = self.simulator.run((num_qubits, segment), initial_state=state).state
+            if boundary is not None:
+                checkpoints[int(boundary)] = state
+
+        self.num_qubits, self.ops, self.columns = num_qubits, ops, columns
+        self.checkpoints = checkpoints
+        self.spacing = spacing
+        self.last_run = {"resumed_at": start, "columns": num_columns,
+                         "simulated_columns": max(num_columns - start, 0), "simulated_gates": total}
+        measured = [q for op in ops if op.name == "measure" for q in op.qubits]
+        # The result owns its state; checkpoints are never handed out
+        return StatevectorResult(state if total else state.copy(), num_qubits, measured)
@@ -0,0 +1,186 @@
+"""Opt-in timing of every visualization update, split into phases.
+
+An update is a call wrapped with ``timed_update(name)`` (or ``update(name)``
+as a context manager). It starts in the "compute" phase; ``mark("artists")``
+inside the update switches phases without re-indenting the code, and
+``MatplotlibCanvas.draw`` and the blitting helpers record "draw" time for
+their canvas. Time spent drawing is taken out of whichever phase was running.
+
+While enabled, every MatplotlibCanvas shows a small overlay with its frame
+rate, last update latency and the per-phase split, and all phase segments are
+kept for ``dump_trace``, which writes Chrome trace-event JSON (open it in
+chrome://tracing or ui.perfetto.dev). When disabled every hook returns after
+a single flag check.
+"""
+import contextlib
+import functools
+import json
+import time
+import weakref
+from collections import deque
+
+PHASES = ("compute", "artists", "draw")
+
+enabled = False
+# (update name, phase, start, duration) in seconds since ``_origin``
+events = deque(maxlen=200000)
+_origin = time.perf_counter()
+_canvases = weakref.WeakSet()
+_overlays = weakref.WeakKeyDictionary()  # canvas -> CanvasOverlay
+_frames = []  # stack of in-progress updates
+_null = contextlib.nullcontext()
+
+
+class _Frame:
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.phase = "compute"
+        self.phase_start = self.start
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self.canvases = []
+
+    def close_segment(self, now):
+        duration = now - self.phase_start
+        if duration > 0:
+            self.totals[self.phase] = self.totals.get(self.phase, 0.0) + duration
+            events.append((self.name, self.phase, self.phase_start - _origin, duration))
+
+
+def set_enabled(value):
+    """Turn instrumentation on or off and show or hide the canvas overlays"""
+    global enabled
+    enabled = bool(value)
+    _frames.clear()
+    for canvas in list(_canvases):
+        overlay = _overlays.get(canvas)
+        if enabled and overlay is None:
+            from canvas_overlay import CanvasOverlay
+            overlay = _overlays[canvas] = CanvasOverlay(canvas)
+        if overlay is not None:
+            overlay.setVisible(enabled)
+
+
+def register_canvas(canvas):
+    """Called by each MatplotlibCanvas so it can get an overlay"""
+    _canvases.add(canvas)
+    if enabled:
+        set_enabled(True)
+
+
+def update(name):
+    """Context manager timing one update of the named window"""
+    if not enabled:
+        return _null
+    return _update(name)
+
+
+@contextlib.contextmanager
+def _update(name):
+    outer = _frames[-1] if _frames else None
+    frame = _Frame(name)
+    if outer is not None:
+        # A nested update pauses the one that called it
+        outer.close_segment(frame.start)
+    _frames.append(frame)
+    try:
+        yield frame
+    finally:
+        now = time.perf_counter()
+        frame.close_segment(now)
+        if _frames and _frames[-1] is frame:
+            _frames.pop()
+        if outer is not None:
+            outer.phase_start = now
+        latency = now - frame.start
+        events.append((name, "update", frame.start - _origin, latency))
+        for canvas in frame.canvases:
+            overlay = _overlays.get(canvas)
+            if overlay is not None:
+                overlay.record_update(latency, frame.totals)
+
+
+def timed_update(name):
+    """Decorator form of ``update`` for a window's update function"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            with _update(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def mark(phase):
+    """End the current phase of the running update and start ``phase``"""
+    if not enabled or not _frames:
+        return
+    frame = _frames[-1]
+    now = time.perf_counter()
+    frame.close_segment(now)
+    frame.phase = phase
+    frame.phase_start = now
+
+
+def draw(canvas):
+    """Context manager timing a full draw or blit of ``canvas``"""
+    if not enabled:
+        return _null
+    return _draw(canvas)
+
+
+@contextlib.contextmanager
+def _draw(canvas):
+    frame = _frames[-1] if _frames else None
+    start = time.perf_counter()
+    if frame is not None:
+        frame.close_segment(start)
+    try:
+        yield
+    finally:
+        now = time.perf_counter()
+        duration = now - start
+        events.append((frame.name if frame else "idle", "draw", start - _origin, duration))
+        if frame is not None:
+            # Resume the interrupted phase after the draw
+            frame.totals["draw"] += duration
+            frame.phase_start = now
+            if canvas not in frame.canvases:
+                frame.canvases.append(canvas)
+        overlay = _overlays.get(canvas)
+        if overlay is not None:
+            overlay.record_draw(now, duration, standalone=frame is None)
+
+
+def summary():
+    """{update name: {phase: (updates, mean ms per update)}} over the recorded events
+
+    A phase can run several times within one update, so its time is summed
+    per update; draws outside any update are averaged per draw.
+    """
+    totals = {}
+    for name, phase, _, duration in events:
+        count, total = totals.setdefault(name, {}).get(phase, (0, 0.0))
+        totals[name][phase] = (count + 1, total + duration)
+    result = {}
+    for name, phases in totals.items():
+        updates = phases.get("update", (0, 0.0))[0]
+        result[name] = {phase: (updates or count, 1000 * total / (updates or count))
+                        for phase, (count, total) in phases.items()}
+    return result
+
+
+def dump_trace(path):
+    """Write the recorded phases as Chrome trace-event JSON; returns the event count"""
+    names = sorted({name for name, *_ in events})
+    threads = {name: i + 1 for i, name in enumerate(names)}
+    trace = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+             for name, tid in threads.items()]
+    for name, phase, start, duration in events:
+        trace.append({"name": phase, "cat": name, "ph": "X", "pid": 1, "tid": threads[name],
+                      "ts": round(start * 1e6, 1), "dur": round(duration * 1e6, 1)})
+    with open(path, "w") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+    return len(events)
@@ -0,0 +1,136 @@
+import itertools
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from PyQt6.QtCore import QCoreApplication, QEventLoop, QObject, pyqtSignal
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when a newer job with the same key has superseded it"""
+
+
+class JobContext:
+    """Handed to thread jobs as their ``progress`` callback"""
+
+    def __init__(self, runner, job_id):
+        self.runner = runner
+        self.job_id = job_id
+        self.cancelled = threading.Event()
+
+    def progress(self, fraction):
+        """Report progress in [0, 1]; raises JobCancelled once the job is superseded"""
+        if self.cancelled.is_set():
+            raise JobCancelled()
+        self.runner._progress.emit(self.job_id, float(fraction))
+
+
+class JobRunner(QObject):
+    """Runs simulation work off the GUI thread and delivers results as Qt signals.
+
+    Jobs are submitted under a key, e.g. the name of the plot they feed.
+    Submitting a new job for a key supersedes the previous one: it is
+    cancelled if it has not started, asked to stop at its next progress
+    report if it has, and its result is dropped in any case. So only the
+    latest slider position ever reaches ``result``.
+
+    The default pool is threads, which suits NumPy kernels that release the
+    GIL. With ``processes=True`` jobs run in a process pool; the function and
+    arguments must then be picklable and progress reporting is unavailable.
+    """
+
+    result = pyqtSignal(str, object)  # key, return value
+    progress = pyqtSignal(str, float)  # key, fraction done
+    failed = pyqtSignal(str, str)  # key, error message
+
+    # Worker threads talk to the GUI thread through these queued signals
+    _done = pyqtSignal(int, object)
+    _progress = pyqtSignal(int, float)
+
+    def __init__(self, workers=None, processes=False, parent=None):
+        super().__init__(parent)
+        self.processes = processes
+        if processes:
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=workers or 2,
+                                               thread_name_prefix="quantum-job")
+        self._ids = itertools.count(1)
+        self._current = {}  # key -> job id of the latest job
+        self._jobs = {}  # job id -> (key, future, context)
+        self._done.connect(self._on_done)
+        self._progress.connect(self._on_progress)
+        # Counters for the status line and benchmarks
+        self.submitted = 0
+        self.superseded = 0
+
+    def submit(self, key, func, *args, report_progress=False, **kwargs):
+        """Run ``func(*args, **kwargs)`` in the pool; returns the job id.
+
+        With ``report_progress=True`` the function also gets a ``progress``
+        keyword argument to call with the fraction done.
+        """
+        self.cancel(key)
+        job_id = next(self._ids)
+        context = JobContext(self, job_id)
+        if report_progress:
+            if self.processes:
+                raise ValueError("progress reporting needs a thread pool")
+            kwargs["progress"] = context.progress
+
+        future = self.executor.submit(func, *args, **kwargs)
+        self._current[key] = job_id
+        self._jobs[job_id] = (key, future, context)
+        self.submitted += 1
+        future.add_done_callback(lambda f: self._done.emit(job_id, f))
+        return job_id
+
+    def cancel(self, key):
+        """Supersede the running job for ``key``, if any"""
+        job_id = self._current.pop(key, None)
+        if job_id is None:
+            return
+        _, future, context = self._jobs[job_id]
+        context.cancelled.set()
+        future.cancel()
+        self.superseded += 1
+
+    def busy(self, key=None):
+        return key in self._current if key is not None else bool(self._current)
+
+    def wait(self, timeout=None):
+        """Process events until every current job has delivered (for exports and benchmarks)"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while self._current:
+            if deadline is not None and time.perf_counter() > deadline:
+                return False
+            QCoreApplication.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+            time.sleep(0.001)
+        return True
+
+    def shutdown(self):
+        for key in list(self._current):
+            self.cancel(key)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _on_progress(self, job_id, fraction):
+        key = self._jobs.get(job_id, (None,))[0]
+        if key is not None and self._current.get(key) == job_id:
+            self.progress.emit(key, fraction)
+
+    def _on_done(self, job_id, future):
+        key, _, _ = self._jobs.pop(job_id)
+        if self._current.get(key) != job_id:
+            return  # superseded: drop the result
+        del self._current[key]
+        if future.cancelled():
+            return
+        error = future.exception()
+        if isinstance(error, JobCancelled):
+            return
+        if error is not None:
+            message = "".join(traceback.format_exception_only(type(error), error)).strip()
+            self.failed.emit(key, message)
+            return
+        self.result.emit(key, future.result())
@@ -0,0 +1,111 @@
+import importlib
+import sys
+import threading
+import time
+
+
+# (module name, seconds, thread name) for every module loaded through timed_import
+import_timings = []
+_timings_lock = threading.Lock()
+
+# Called with (name, seconds) after each timed import, e.g. to print a profile line
+import_callback = None
+
+
+def timed_import(name):
+    """Import a module by name, recording how long the import took"""
+    # Always go through importlib: a module another thread is still importing is
+    # already in sys.modules, and import_module waits for it to finish
+    imported = name in sys.modules
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - start
+    if imported:
+        return module
+
+    with _timings_lock:
+        import_timings.append((name, elapsed, threading.current_thread().name))
+    if import_callback is not None:
+        import_callback(name, elapsed)
+    return module
+
+
+class LazyModule:
+    """Stand-in for a module that is only imported on first attribute access.
+
+    ``np = LazyModule("numpy")`` lets code keep writing ``np.linspace(...)``
+    while the cost of importing numpy moves from application start-up to the
+    first time a visualization actually needs it.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = timed_import(self._name)
+        return self._module
+
+    @property
+    def loaded(self):
+        return self._module is not None or self._name in sys.modules
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+def prewarm(names):
+    """Import the given modules on a background thread and return the thread.
+
+    Python's import lock makes this safe to race with the GUI thread: if a
+    button needs a module that is still being pre-warmed, its import simply
+    waits for the background one to finish.
+    """
+    def worker():
+        for name in names:
+            try:
+                timed_import(name)
+            except ImportError:
+                # Optional module; the button that needs it will report the error
+                pass
+
+    thread = threading.Thread(target=worker, name="prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+class StartupProfiler:
+    """Collects named start-up phases and prints them with the lazy import timings"""
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.marks = []
+        self._last = self.start
+
+    def mark(self, label, at=None):
+        now = time.perf_counter() if at is None else at
+        self.marks.append((label, now - self._last))
+        self._last = now
+
+    def report(self, stream=None):
+        stream = stream or sys.stdout
+        print("Start-up profile", file=stream)
+        print("-" * 48, file=stream)
+        for label, seconds in self.marks:
+            print(f"{label:<36}{seconds * 1000:>9.1f} ms", file=stream)
+        total = self._last - self.start
+        print("-" * 48, file=stream)
+        print(f"{'total to first event loop tick':<36}{total * 1000:>9.1f} ms", file=stream)
+
+        with _timings_lock:
+            timings = list(import_timings)
+        if timings:
+            print("\nLazy imports so far", file=stream)
+            for name, seconds, thread in timings:
+                print(f"{name:<28}{thread:<8}{seconds * 1000:>9.1f} ms", file=stream)
+        stream.flush()
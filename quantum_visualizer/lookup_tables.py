@@ -0,0 +1,90 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+class ParameterTable:
+    """Precomputed values of a function on a slider's integer grid.
+
+    ``compute(t)`` receives an array of normalized parameters ``t`` in [0, 1]
+    (slider position / resolution) and returns one row per parameter, e.g.
+    Bloch coordinates or a whole sampled waveform. Positions are grouped into
+    blocks that are computed with one vectorized call the first time any of
+    their positions is read. Blocks live in an LRU cache capped at
+    ``max_bytes``, so a 0-100 slider is simply a single precomputed array
+    while a 0-100000 slider only keeps the neighbourhood being dragged over.
+    """
+
+    def __init__(self, compute, resolution=100, block_size=128, max_bytes=32 * 2 ** 20):
+        self.compute = compute
+        self.resolution = resolution
+        self.block_size = block_size
+        self.max_bytes = max_bytes
+        self._blocks = OrderedDict()  # block index -> (block_size, ...) array
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return self.resolution + 1
+
+    def __getitem__(self, position):
+        """Row for an integer slider position (a view into the cached block)"""
+        position = int(position)
+        if not 0 <= position <= self.resolution:
+            raise IndexError(f"slider position {position} outside 0..{self.resolution}")
+        block_index, offset = divmod(position, self.block_size)
+        block = self._blocks.get(block_index)
+        if block is None:
+            self.misses += 1
+            block = self._compute_block(block_index)
+        else:
+            self.hits += 1
+            self._blocks.move_to_end(block_index)
+        return block[offset]
+
+    def precompute(self):
+        """Fill every block now (memory permitting) instead of on first access"""
+        for block_index in range(self.resolution // self.block_size + 1):
+            if block_index not in self._blocks:
+                self._compute_block(block_index)
+        return self
+
+    def _compute_block(self, block_index):
+        start = block_index * self.block_size
+        stop = min(start + self.block_size, self.resolution + 1)
+        block = np.asarray(self.compute(np.arange(start, stop) / self.resolution))
+        block.flags.writeable = False  # Rows are shared with every caller
+
+        self._blocks[block_index] = block
+        self.nbytes += block.nbytes
+        # Evict least recently used blocks, always keeping the one just built
+        while self.nbytes > self.max_bytes and len(self._blocks) > 1:
+            _, evicted = self._blocks.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+        return block
+
+    def stats(self):
+        return {"blocks": len(self._blocks), "nbytes": self.nbytes, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+
+def phasor_rows(t):
+    """Columns (cos φ, sin φ, φ) for φ = 2π t"""
+    phi = 2 * np.pi * t
+    return np.stack([np.cos(phi), np.sin(phi), phi], axis=1)
+
+
+def phase_factor_rows(t):
+    """e^{iφ} for φ = 2π t, as a (len(t), 1) complex column"""
+    return np.exp(2j * np.pi * t)[:, None]
+
+
+def superposition_rows(t):
+    """Columns (α, β, sin θ, cos θ, |α|², |β|²) for α = t, β = √(1-α²), θ = 2 arccos α"""
+    beta = np.sqrt(1 - t ** 2)
+    theta = 2 * np.arccos(t)
+    return np.stack([t, beta, np.sin(theta), np.cos(theta), t ** 2, beta ** 2], axis=1)
+
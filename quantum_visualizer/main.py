@@ -1,18 +1,68 @@
+import time
+_startup_begin = time.perf_counter()
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget, 
     QLabel, QFrame, QHBoxLayout, QSplitter, QStackedWidget,
-    QComboBox, QSlider, QSpinBox, QGroupBox, QGridLayout
+    QComboBox, QSlider, QSpinBox, QGroupBox, QGridLayout, QMessageBox, QFileDialog, QScrollBar,
+    QScrollArea, QInputDialog
 )
 from PyQt6.QtCore import Qt, QSize, pyqtSlot, QTimer
 from PyQt6.QtGui import QFont, QIcon, QPixmap, QColor, QPalette, QLinearGradient, QGradient
 import sys
 import os
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from mpl_toolkits.mplot3d import Axes3D
-from bloch_visualizer import bloch_sphere  # Import from the correct file
-from visualize_circuit import draw_circuit
+import argparse
+from lazy_imports import LazyModule, StartupProfiler, prewarm
+import lazy_imports
+import instrumentation
+from animation import BlitAnimator
+from scheduler import RenderScheduler
+from window_manager import WindowManager, format_bytes
+from jobs import JobRunner
+
+_startup_imports_done = time.perf_counter()
+
+# Heavy modules are imported on first use so the main window appears quickly
+np = LazyModule("numpy")
+plt = LazyModule("matplotlib.pyplot")
+mcollections = LazyModule("matplotlib.collections")
+mcolors = LazyModule("matplotlib.colors")
+mpl_canvas = LazyModule("mpl_canvas")  # Qt Agg backend + mplot3d
+bloch_renderer = LazyModule("bloch_renderer")
+bloch_painter = LazyModule("bloch_painter")  # QPainter Bloch views, no mplot3d
+simulator = LazyModule("simulator")
+density = LazyModule("density")
+backends = LazyModule("backends")
+bloch_grid = LazyModule("bloch_grid")
+lookup_tables = LazyModule("lookup_tables")
+interference = LazyModule("interference")
+sampling = LazyModule("sampling")
+trajectory_panel = LazyModule("trajectory_panel")  # record / replay bar
+bloch_visualizer = LazyModule("bloch_visualizer")  # qiskit
+visualize_circuit = LazyModule("visualize_circuit")  # qiskit for its sample circuit
+qasm = LazyModule("qasm")
+circuit_view = LazyModule("circuit_view")
+optimizer = LazyModule("optimizer")
+incremental = LazyModule("incremental")
+circuit_builder = LazyModule("circuit_builder")  # drag-and-drop editor widgets
+noise = LazyModule("noise")
+unitary_cache = LazyModule("unitary_cache")
+
+# Modules loaded in the background after the window is shown (--prewarm)
+PREWARM_MODULES = ["numpy", "matplotlib.pyplot", "mpl_canvas", "bloch_renderer", "bloch_painter", "simulator",
+                   "density", "backends", "bloch_grid", "lookup_tables", "interference", "sampling",
+                   "trajectory_panel", "qasm", "circuit_view", "optimizer", "incremental", "circuit_builder",
+                   "noise", "unitary_cache", "qiskit", "bloch_visualizer",
+                   "visualize_circuit"]
+
+# Positions of the continuous-parameter sliders (0..SLIDER_STEPS). Per-tick
+# values come from lookup tables over this grid, so raising it costs memory
+# only for the blocks actually visited.
+SLIDER_STEPS = 100
+
+# Bloch sphere renderers a window can switch between: the projected QPainter
+# view for interaction, or mplot3d, the figure that batch export always saves
+BLOCH_RENDERERS = ["Fast 2D", "mplot3d"]
 
 
 class StyledButton(QPushButton):
@@ -41,13 +91,6 @@ class StyledButton(QPushButton):
             self.setIconSize(QSize(24, 24))
 
 
-class MatplotlibCanvas(FigureCanvas):
-    def __init__(self, width=8, height=6, dpi=100):
-        self.fig = plt.figure(figsize=(width, height), dpi=dpi)
-        super().__init__(self.fig)
-        self.setStyleSheet("background-color: transparent;")
-
-
 class InfoPanel(QFrame):
     def __init__(self, title, description):
         super().__init__()
@@ -118,7 +161,7 @@ def visualize_quantum_states():
     
     # Add a spin parameter control
     phase_control = QSlider(Qt.Orientation.Horizontal)
-    phase_control.setRange(0, 100)
+    phase_control.setRange(0, SLIDER_STEPS)
     phase_control.setValue(0)
     phase_control.setStyleSheet("""
         QSlider::groove:horizontal {
@@ -150,59 +193,51 @@ def visualize_quantum_states():
     layout.addWidget(controls_frame)
     
     # Create matplotlib canvas for visualization
-    canvas = MatplotlibCanvas(width=8, height=5)
+    canvas = mpl_canvas.MatplotlibCanvas(width=8, height=5)
     layout.addWidget(canvas)
     
     # Plot example quantum states
     ax = canvas.fig.add_subplot(111)
     
-    # Define some common quantum states for visualization
-    # |0>, |1>, |+>, |-> states probabilities in computational basis
-    states = {
-        "|0>": [1, 0],
-        "|1>": [0, 1],
-        "|+>": [0.5, 0.5],
-        "|->": [0.5, 0.5],
-        "|+i>": [0.5, 0.5],
-        "|-i>": [0.5, 0.5]
-    }
-    
-    # Phases for the states
-    phases = {
-        "|0>": [0, 0],
-        "|1>": [0, 0],
-        "|+>": [0, 0],
-        "|->": [0, np.pi],
-        "|+i>": [0, np.pi/2],
-        "|-i>": [0, -np.pi/2]
+    # Preparation circuits for some common quantum states; their amplitudes
+    # come from the statevector simulator rather than a hand-typed table
+    preparations = {
+        "|0>": [],
+        "|1>": [("x", [0])],
+        "|+>": [("h", [0])],
+        "|->": [("x", [0]), ("h", [0])],
+        "|+i>": [("h", [0]), ("s", [0])],
+        "|-i>": [("h", [0]), ("sdg", [0])]
     }
-    
-    def update_plot(state_idx=None):
+    sim = simulator.StatevectorSimulator()
+    states = {name: sim.run((1, ops)).state for name, ops in preparations.items()}
+    # e^{iφ} for every phase slider position (a table row per position rather
+    # than a cached gate matrix: the phase is a scalar, not a unitary to apply)
+    phase_factors = lookup_tables.ParameterTable(lookup_tables.phase_factor_rows, SLIDER_STEPS)
+    
+    @instrumentation.timed_update("quantum_states")
+    def update_plot(state_idx=None, preview=False):
+        instrumentation.mark("artists")
         ax.clear()
         # If a state is selected from the dropdown
         if state_idx is not None:
+            instrumentation.mark("compute")
             state_name = state_selector.currentText().replace("⟩", ">").replace("⟨", "<")
             
-            # Get phase adjustment from slider (0 to 2π)
-            phase_adj = phase_control.value() * (2 * np.pi / 100)
-            
-            # Apply phase adjustment to the selected state
-            current_phases = phases[state_name].copy()
-            current_phases = [p + phase_adj for p in current_phases]
-            
-            # For real part (based on phase)
-            probs = states[state_name]
-            reals = [prob * np.cos(phase) for prob, phase in zip(probs, current_phases)]
-            # For imaginary part (based on phase)
-            imags = [prob * np.sin(phase) for prob, phase in zip(probs, current_phases)]
+            # Apply the slider's phase (0 to 2π) to the selected state
+            amplitudes = states[state_name] * phase_factors[phase_control.value()][0]
+            reals = amplitudes.real
+            imags = amplitudes.imag
+            instrumentation.mark("artists")
             
             x_pos = np.array([0, 1])
             
             # Plot real parts
             ax.bar(x_pos, reals, 0.35, label=f"Real", alpha=0.7, color='#3498DB')
             
-            # Plot imaginary parts with hatching
-            ax.bar(x_pos + 0.35, imags, 0.35, label=f"Imag", alpha=0.7, color='#E74C3C', hatch='///')
+            # Plot imaginary parts with hatching (skipped in slider-drag previews)
+            ax.bar(x_pos + 0.35, imags, 0.35, label=f"Imag", alpha=0.7, color='#E74C3C',
+                   hatch=None if preview else '///')
             
             ax.set_title(f'Quantum State: {state_selector.currentText()}', color='white')
         else:
@@ -211,11 +246,9 @@ def visualize_quantum_states():
             width = 0.2
             
             # Plot the probability amplitudes for each state
-            for i, (state_name, probs) in enumerate(states.items()):
-                # For real part (based on phase)
-                reals = [prob * np.cos(phase) for prob, phase in zip(probs, phases[state_name])]
-                # For imaginary part (based on phase)
-                imags = [prob * np.sin(phase) for prob, phase in zip(probs, phases[state_name])]
+            for i, (state_name, amplitudes) in enumerate(states.items()):
+                reals = amplitudes.real
+                imags = amplitudes.imag
                 
                 x_pos = np.array([0, 1]) + i * width * 2
                 
@@ -232,7 +265,8 @@ def visualize_quantum_states():
         ax.set_ylabel('Amplitude', color='white')
         ax.set_xticks([0.3, 1.3])
         ax.set_xticklabels(['|0⟩', '|1⟩'])
-        ax.legend(loc='upper right')
+        if not preview:
+            ax.legend(loc='upper right')
         
         # Style the plot for dark mode
         ax.set_facecolor('#253443')
@@ -248,7 +282,10 @@ def visualize_quantum_states():
     
     # Connect controls to update function
     state_selector.currentIndexChanged.connect(update_plot)
-    phase_control.valueChanged.connect(lambda: update_plot(state_selector.currentIndex()))
+    # Phase changes are coalesced into at most one redraw per frame
+    scheduler = RenderScheduler(
+        lambda preview: update_plot(state_selector.currentIndex(), preview), parent=state_window)
+    scheduler.attach(phase_control)
     
     # Description label
     description = QLabel(
@@ -260,13 +297,21 @@ def visualize_quantum_states():
     description.setStyleSheet("color: #ECF0F1; margin: 20px 0;")
     layout.addWidget(description)
     
+    # Record / replay bar
+    trajectory = trajectory_panel.TrajectoryPanel(
+        "quantum_states", (state_selector, phase_control),
+        parent=state_window)
+    layout.addWidget(trajectory)
+    
     # Set the layout and show the window
     state_window.setLayout(layout)
     state_window.show()
     
     # Keep a reference to prevent garbage collection
     state_window.canvas = canvas
+    state_window.scheduler = scheduler
     state_window.controls = (state_selector, phase_control)  # Keep references
+    state_window.trajectory = trajectory
     
     return state_window
 
@@ -329,161 +374,206 @@ def visualize_entanglement():
         }
     """)
     
+    # Target frame rate and achieved frame rate
+    fps_control = QSpinBox()
+    fps_control.setRange(1, 60)
+    fps_control.setValue(30)
+    fps_control.setSuffix(" fps")
+    fps_control.setStyleSheet("background-color: #2C3E50; color: white; padding: 3px;")
+    
+    fps_display = QLabel("-- fps")
+    fps_display.setStyleSheet("color: white; font-family: monospace;")
+    
+    # Bloch sphere renderer
+    renderer_selector = QComboBox()
+    renderer_selector.addItems(BLOCH_RENDERERS)
+    renderer_selector.setStyleSheet(state_selector.styleSheet().replace("min-width: 200px", "min-width: 90px"))
+    
     # Labels
     state_label = QLabel("Bell State:")
     state_label.setStyleSheet("color: white;")
+    fps_label = QLabel("Target:")
+    fps_label.setStyleSheet("color: white;")
     
     # Add widgets to controls
     controls_layout.addWidget(state_label)
     controls_layout.addWidget(state_selector)
     controls_layout.addStretch()
+    renderer_label = QLabel("Renderer:")
+    renderer_label.setStyleSheet("color: white;")
+    controls_layout.addWidget(renderer_label)
+    controls_layout.addWidget(renderer_selector)
+    controls_layout.addWidget(fps_label)
+    controls_layout.addWidget(fps_control)
+    controls_layout.addWidget(fps_display)
     controls_layout.addWidget(animate_btn)
     
     layout.addWidget(controls_frame)
     
     # Create matplotlib canvas for visualization
-    canvas = MatplotlibCanvas(width=8, height=5)
-    layout.addWidget(canvas)
+    canvas = mpl_canvas.MatplotlibCanvas(width=8, height=5)
     
     # Prepare subplot grid
     ax1 = canvas.fig.add_subplot(121, projection='3d')
     ax2 = canvas.fig.add_subplot(122, projection='3d')
     
-    # Function to create a Bloch sphere
-    def create_bloch_sphere(ax):
-        # Draw Bloch sphere
-        u = np.linspace(0, 2 * np.pi, 100)
-        v = np.linspace(0, np.pi, 100)
-        x = 1 * np.outer(np.cos(u), np.sin(v))
-        y = 1 * np.outer(np.sin(u), np.sin(v))
-        z = 1 * np.outer(np.ones(np.size(u)), np.cos(v))
-        
-        # Plot the surface with transparency
-        ax.plot_surface(x, y, z, color='b', alpha=0.1)
-        
-        # Add axes
-        ax.quiver(0, 0, 0, 1.5, 0, 0, color='r', arrow_length_ratio=0.1)
-        ax.quiver(0, 0, 0, 0, 1.5, 0, color='g', arrow_length_ratio=0.1)
-        ax.quiver(0, 0, 0, 0, 0, 1.5, color='b', arrow_length_ratio=0.1)
-        
-        # Add basis state labels
-        ax.text(1.7, 0, 0, "|+x⟩", color='white')
-        ax.text(0, 1.7, 0, "|+y⟩", color='white')
-        ax.text(0, 0, 1.7, "|0⟩", color='white')
-        ax.text(0, 0, -1.7, "|1⟩", color='white')
-        
-        # Set equal aspect ratio
-        ax.set_box_aspect([1, 1, 1])
-        ax.set_xlim(-1.5, 1.5)
-        ax.set_ylim(-1.5, 1.5)
-        ax.set_zlim(-1.5, 1.5)
-        
-        # Remove tick labels for cleaner look
-        ax.set_xticklabels([])
-        ax.set_yticklabels([])
-        ax.set_zticklabels([])
-        
-        # Style for dark mode - fixed to use Matplotlib 3.x API
-        ax.xaxis.pane.set_edgecolor("white")
-        ax.yaxis.pane.set_edgecolor("white")
-        ax.zaxis.pane.set_edgecolor("white")
-        ax.xaxis.pane.fill = False
-        ax.yaxis.pane.fill = False
-        ax.zaxis.pane.fill = False
-        ax.set_facecolor('#253443')
-    
-    def update_visualization(bell_state_idx):
-        ax1.clear()
-        ax2.clear()
-        
-        # Create the Bloch spheres
-        create_bloch_sphere(ax1)
-        create_bloch_sphere(ax2)
-        
-        # Title for each Bloch sphere
-        ax1.set_title("Qubit 1", color='white')
-        ax2.set_title("Qubit 2", color='white')
-        
-        # Random points for visualization
-        num_points = 100
-        # Create random points on the Bloch sphere
-        theta = np.random.uniform(0, np.pi, num_points)
-        phi = np.random.uniform(0, 2 * np.pi, num_points)
-        
-        # Convert to Cartesian coordinates
-        x1 = np.sin(theta) * np.cos(phi)
-        y1 = np.sin(theta) * np.sin(phi)
-        z1 = np.cos(theta)
-        
-        # Handle different Bell states
-        bell_state = bell_state_idx
-        if bell_state == 0:  # Φ+
-            # Correlated in X and Z, anti-correlated in Y
-            x2 = x1
-            y2 = -y1
-            z2 = z1
-            title_text = "Bell State: Φ+ = (|00⟩ + |11⟩)/√2"
-        elif bell_state == 1:  # Φ-
-            # Anti-correlated in X and Y, correlated in Z
-            x2 = -x1
-            y2 = -y1
-            z2 = z1
-            title_text = "Bell State: Φ- = (|00⟩ - |11⟩)/√2"
-        elif bell_state == 2:  # Ψ+
-            # Correlated in X, anti-correlated in Y and Z
-            x2 = x1
-            y2 = -y1
-            z2 = -z1
-            title_text = "Bell State: Ψ+ = (|01⟩ + |10⟩)/√2"
-        elif bell_state == 3:  # Ψ-
-            # Anti-correlated in X, Y, and Z
-            x2 = -x1
-            y2 = -y1
-            z2 = -z1
-            title_text = "Bell State: Ψ- = (|01⟩ - |10⟩)/√2"
-        
-        # Plot the points
-        qubit1_scatter = ax1.scatter(x1, y1, z1, color='yellow', s=10, alpha=0.7)
-        
-        # For qubit 2, show fewer points for clarity
-        sample_indices = np.random.choice(num_points, 20, replace=False)
-        qubit2_scatter = ax2.scatter(x2[sample_indices], y2[sample_indices], z2[sample_indices], 
-                    color='yellow', s=30, alpha=0.7)
-        
-        # Add a special point to emphasize correlation
-        highlight_idx = np.random.randint(0, num_points)
-        highlight1 = ax1.scatter([x1[highlight_idx]], [y1[highlight_idx]], [z1[highlight_idx]], 
-                    color='red', s=100, edgecolors='white')
-        highlight2 = ax2.scatter([x2[highlight_idx]], [y2[highlight_idx]], [z2[highlight_idx]], 
-                    color='red', s=100, edgecolors='white')
+    # Build both Bloch spheres once; updates only move the vector and trail artists
+    sphere1 = bloch_renderer.BlochSphere(ax1, title="Qubit 1")
+    sphere2 = bloch_renderer.BlochSphere(ax2, title="Qubit 2")
+    suptitle = canvas.fig.suptitle("", color='white', fontsize=14)
+    
+    # The same two spheres as QPainter views; drag either one to rotate it
+    views_frame = QWidget()
+    views_layout = QGridLayout(views_frame)
+    view_title = QLabel()
+    view_title.setFont(QFont('Arial', 14))
+    view_title.setStyleSheet("color: white;")
+    view_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+    view1 = bloch_painter.BlochView(title="Qubit 1")
+    view2 = bloch_painter.BlochView(title="Qubit 2")
+    views_layout.addWidget(view_title, 0, 0, 1, 2)
+    views_layout.addWidget(view1, 1, 0)
+    views_layout.addWidget(view2, 1, 1)
+    views_layout.setRowStretch(1, 1)
+    
+    # Both renderers are kept up to date (moving mplot3d artists is cheap);
+    # only the one shown is drawn
+    qubit_spheres = [(sphere1, view1), (sphere2, view2)]
+    for pair in qubit_spheres:
+        for sphere in pair:
+            sphere.add_points("trail", color='yellow', size=10, alpha=0.7)
+    bloch_stack = QStackedWidget()
+    bloch_stack.addWidget(views_frame)
+    bloch_stack.addWidget(canvas)
+    layout.addWidget(bloch_stack)
+    
+    # Entanglement measures of the current state
+    metrics_display = QLabel()
+    metrics_display.setStyleSheet("color: white; font-family: monospace;")
+    metrics_display.setAlignment(Qt.AlignmentFlag.AlignCenter)
+    layout.addWidget(metrics_display)
+    
+    # Bell states are Ry(θ) on qubit 0, CX, then X/Z corrections; θ = π/2 gives
+    # the Bell state itself and the animation sweeps θ to vary the entanglement
+    bell_corrections = [
+        [("cx", [0, 1])],
+        [("cx", [0, 1]), ("z", [0])],
+        [("cx", [0, 1]), ("x", [1])],
+        [("cx", [0, 1]), ("x", [1]), ("z", [0])]
+    ]
+    bell_titles = [
+        "Bell State: Φ+ = (|00⟩ + |11⟩)/√2",
+        "Bell State: Φ- = (|00⟩ - |11⟩)/√2",
+        "Bell State: Ψ+ = (|01⟩ + |10⟩)/√2",
+        "Bell State: Ψ- = (|01⟩ - |10⟩)/√2"
+    ]
+    cycle_frames = 120
+    trail_length = 30
+    sim = simulator.StatevectorSimulator()
+    cycles = {}
+    
+    def entangling_cycle(bell_state_idx):
+        # The state is linear in (cos θ/2, sin θ/2), so the whole cycle comes
+        # from two simulations and one batched partial trace
+        if bell_state_idx not in cycles:
+            circuit = (2, bell_corrections[bell_state_idx])
+            from_0 = sim.run(circuit).state
+            from_1 = sim.run(circuit, initial_state=[0, 1, 0, 0]).state
+            theta = np.pi / 2 + np.linspace(0, 2 * np.pi, cycle_frames, endpoint=False)
+            states = (np.cos(theta / 2)[:, None] * from_0 + np.sin(theta / 2)[:, None] * from_1)
+            cycles[bell_state_idx] = (theta, density.state_summary(states, 2))
+        return cycles[bell_state_idx]
+    
+    frame = [0]  # Using a list to allow modification in nested scope
+    
+    def update_points(bell_state_idx, advance=True):
+        theta, summary = entangling_cycle(bell_state_idx)
+        if advance:
+            frame[0] = (frame[0] + 1) % cycle_frames
+        i = frame[0]
+        instrumentation.mark("artists")
+        
+        # True reduced Bloch vectors of each qubit, with a trail of recent
+        # reduced states while animating
+        bloch = summary["bloch"]
+        recent = np.arange(i - trail_length + 1, i + 1) % cycle_frames if animator.running else []
+        for q, pair in enumerate(qubit_spheres):
+            for sphere in pair:
+                sphere.set_vector(*bloch[i, q])
+                sphere.set_points("trail", *bloch[recent, q].T)
+        
+        metrics_display.setText(
+            f"Ry angle θ = {np.degrees(theta[i]) % 360:5.1f}°   "
+            f"Concurrence C = {summary['concurrence'][i]:.2f}   "
+            f"Entanglement entropy S = {summary['entropy'][i]:.2f} bit"
+        )
         
         # Set subtitle based on Bell state
-        canvas.fig.suptitle(title_text, color='white', fontsize=14)
-        
-        # Draw the figure
-        canvas.draw()
-        
-        return qubit1_scatter, qubit2_scatter, highlight1, highlight2
+        suptitle.set_text(bell_titles[bell_state_idx])
+        view_title.setText(bell_titles[bell_state_idx])
+    
+    def draw_spheres():
+        # Synchronous like canvas.draw(), so update timings include the paint
+        if renderer_selector.currentIndex() == 0:
+            view1.repaint()
+            view2.repaint()
+        else:
+            canvas.draw()
+    
+    def show_frame(index):
+        # Jump to a frame of the animation cycle (the batch exporter then draws the canvas)
+        frame[0] = index % cycle_frames
+        update_points(state_selector.currentIndex(), advance=False)
+        draw_spheres()
     
-    # Animation timer
-    animation_timer = QTimer()
-    animation_active = [False]  # Using a list to allow modification in nested scope
+    @instrumentation.timed_update("entanglement")
+    def update_visualization(bell_state_idx):
+        # Selecting a Bell state shows the maximally entangled point of the cycle
+        frame[0] = 0
+        update_points(bell_state_idx, advance=False)
+        
+        # Full draw; while animating this also recaptures the blit background
+        draw_spheres()
+    
+    # Animation engine: only the vectors and trails are redrawn and blitted each frame
+    animated_artists = sphere1.dynamic_artists + sphere2.dynamic_artists
+    animator = BlitAnimator(canvas, animated_artists,
+                            lambda: update_points(state_selector.currentIndex()),
+                            fps=fps_control.value(), name="entanglement")
+    animator.fps_callback = lambda fps: fps_display.setText(f"{fps:.1f} fps")
+    fps_control.valueChanged.connect(animator.set_target_fps)
+    
+    def set_renderer(index):
+        bloch_stack.setCurrentIndex(index)
+        if index == 0:
+            # Animation frames repaint the views instead of blitting the canvas
+            animator.release()
+            animator.redraw = draw_spheres
+        else:
+            # Open mplot3d on the views' camera; a running animation
+            # recaptures its blit background on the next frame
+            animator.redraw = None
+            for ax, view in ((ax1, view1), (ax2, view2)):
+                ax.view_init(elev=view.elevation, azim=view.azimuth)
+        update_points(state_selector.currentIndex(), advance=False)
+        draw_spheres()
+    
+    renderer_selector.currentIndexChanged.connect(set_renderer)
     
     def toggle_animation():
-        if animation_active[0]:
-            animation_timer.stop()
+        if animator.running:
+            animator.stop()
             animate_btn.setText("Start Animation")
-            animation_active[0] = False
+            fps_display.setText("-- fps")
+            update_visualization(state_selector.currentIndex())
         else:
-            animation_timer.start(300)  # Update every 300 ms
+            animator.start()
             animate_btn.setText("Stop Animation")
-            animation_active[0] = True
     
     animate_btn.clicked.connect(toggle_animation)
-    animation_timer.timeout.connect(lambda: update_visualization(state_selector.currentIndex()))
     
-    # Initialize the first visualization
-    update_visualization(0)
+    # Initialize the first visualization on the selected renderer
+    set_renderer(renderer_selector.currentIndex())
     
     # Connect state selector to update function
     state_selector.currentIndexChanged.connect(update_visualization)
@@ -494,21 +584,51 @@ def visualize_entanglement():
         "<p>Bell states are maximally entangled quantum states of two qubits. When two qubits are entangled, "
         "measuring one qubit instantaneously determines the state of the other, regardless of the distance "
         "between them. This non-local correlation has no classical analog.</p>"
-        "<p>The red points highlight a correlated measurement outcome - notice how measuring one qubit "
-        "affects the other qubit's state based on the specific Bell state.</p>"
+        "<p>Each sphere shows the true reduced state of one qubit, obtained by tracing out the other. "
+        "For a Bell state both vectors shrink to the centre: each qubit on its own is maximally mixed, "
+        "and all of the information sits in the correlations. The animation sweeps the entangling "
+        "rotation so you can watch the vectors shrink as concurrence and entropy rise.</p>"
     )
     description.setWordWrap(True)
     description.setStyleSheet("color: #ECF0F1; margin: 20px 0;")
     layout.addWidget(description)
     
+    # Record / replay bar; recordings also keep the reduced states of every frame
+    def capture_frame():
+        theta, summary = entangling_cycle(state_selector.currentIndex())
+        i = frame[0]
+        return {"frame": i, "bloch": summary["bloch"][i], "concurrence": summary["concurrence"][i],
+                "entropy": summary["entropy"][i]}
+    
+    def replay_frame(record, preview):
+        if preview:
+            # Scrubbing: blit the vectors like an animation frame
+            frame[0] = record["frame"] % cycle_frames
+            update_points(state_selector.currentIndex(), advance=False)
+            (animator.redraw or animator.blit)()
+        else:
+            if not animator.running:
+                animator.release()
+            show_frame(record["frame"])
+    
+    trajectory = trajectory_panel.TrajectoryPanel(
+        "entanglement", (state_selector, fps_control),
+        fields=[("frame", "i4", ()), ("bloch", "f8", (2, 3)), ("concurrence", "f8", ()), ("entropy", "f8", ())],
+        capture=capture_frame, restore=replay_frame, parent=ent_window)
+    layout.addWidget(trajectory)
+    
     # Set the layout and show the window
     ent_window.setLayout(layout)
     ent_window.show()
     
     # Keep references to prevent garbage collection
     ent_window.canvas = canvas
-    ent_window.timer = animation_timer
-    ent_window.controls = (state_selector, animate_btn)
+    ent_window.views = (view1, view2)
+    ent_window.animator = animator
+    ent_window.show_frame = show_frame
+    ent_window.timer = animator.timer
+    ent_window.controls = (state_selector, animate_btn, fps_control, renderer_selector)
+    ent_window.trajectory = trajectory
     
     return ent_window
 
@@ -537,8 +657,8 @@ def visualize_superposition():
     
     # Alpha parameter (|0⟩ coefficient)
     alpha_slider = QSlider(Qt.Orientation.Horizontal)
-    alpha_slider.setRange(0, 100)
-    alpha_slider.setValue(71)  # sqrt(0.5) ≈ 0.71
+    alpha_slider.setRange(0, SLIDER_STEPS)
+    alpha_slider.setValue(round(0.71 * SLIDER_STEPS))  # sqrt(0.5) ≈ 0.71
     alpha_slider.setStyleSheet("""
         QSlider::groove:horizontal {
             height: 8px;
@@ -555,7 +675,7 @@ def visualize_superposition():
     
     # Phase parameter
     phase_slider = QSlider(Qt.Orientation.Horizontal)
-    phase_slider.setRange(0, 100)
+    phase_slider.setRange(0, SLIDER_STEPS)
     phase_slider.setValue(0)
     phase_slider.setStyleSheet(alpha_slider.styleSheet())
     
@@ -577,6 +697,25 @@ def visualize_superposition():
     phase_label = QLabel("Relative Phase:")
     phase_label.setStyleSheet("color: white;")
     
+    # Bloch sphere renderer
+    renderer_selector = QComboBox()
+    renderer_selector.addItems(BLOCH_RENDERERS)
+    renderer_selector.setStyleSheet("""
+        QComboBox {
+            background-color: #2C3E50;
+            color: white;
+            border-radius: 4px;
+            padding: 5px;
+        }
+        QComboBox QAbstractItemView {
+            background-color: #2C3E50;
+            color: white;
+            selection-background-color: #1ABC9C;
+        }
+    """)
+    renderer_label = QLabel("Bloch Renderer:")
+    renderer_label.setStyleSheet("color: white;")
+    
     # Add all controls to the grid
     controls_layout.addWidget(alpha_label, 0, 0)
     controls_layout.addWidget(alpha_slider, 0, 1)
@@ -586,6 +725,8 @@ def visualize_superposition():
     controls_layout.addWidget(phase_label, 2, 0)
     controls_layout.addWidget(phase_slider, 2, 1)
     controls_layout.addWidget(phase_display, 2, 2)
+    controls_layout.addWidget(renderer_label, 3, 0)
+    controls_layout.addWidget(renderer_selector, 3, 1)
     
     layout.addWidget(controls_frame)
     
@@ -593,13 +734,17 @@ def visualize_superposition():
     canvas_frame = QFrame()
     canvas_layout = QHBoxLayout(canvas_frame)
     
-    # Bloch sphere visualization
-    bloch_canvas = MatplotlibCanvas(width=4, height=4)
+    # Bloch sphere visualization: a QPainter view, or the mplot3d canvas that export saves
+    bloch_canvas = mpl_canvas.MatplotlibCanvas(width=4, height=4)
+    bloch_view = bloch_painter.BlochView(title="Bloch Sphere Representation")
+    bloch_stack = QStackedWidget()
+    bloch_stack.addWidget(bloch_view)
+    bloch_stack.addWidget(bloch_canvas)
     
     # Probability visualization
-    prob_canvas = MatplotlibCanvas(width=4, height=4)
+    prob_canvas = mpl_canvas.MatplotlibCanvas(width=4, height=4)
     
-    canvas_layout.addWidget(bloch_canvas)
+    canvas_layout.addWidget(bloch_stack)
     canvas_layout.addWidget(prob_canvas)
     layout.addWidget(canvas_frame)
     
@@ -609,133 +754,94 @@ def visualize_superposition():
     # Set up the probability visualization
     prob_ax = prob_canvas.fig.add_subplot(111)
     
-    def create_bloch_sphere(ax):
-        # Draw Bloch sphere
-        u = np.linspace(0, 2 * np.pi, 100)
-        v = np.linspace(0, np.pi, 100)
-        x = 1 * np.outer(np.cos(u), np.sin(v))
-        y = 1 * np.outer(np.sin(u), np.sin(v))
-        z = 1 * np.outer(np.ones(np.size(u)), np.cos(v))
-        
-        # Plot the surface with transparency
-        ax.plot_surface(x, y, z, color='b', alpha=0.1)
-        
-        # Add axes
-        ax.quiver(0, 0, 0, 1.5, 0, 0, color='r', arrow_length_ratio=0.1)
-        ax.quiver(0, 0, 0, 0, 1.5, 0, color='g', arrow_length_ratio=0.1)
-        ax.quiver(0, 0, 0, 0, 0, 1.5, color='b', arrow_length_ratio=0.1)
-        
-        # Add basis state labels
-        ax.text(1.7, 0, 0, "|+x⟩", color='white')
-        ax.text(0, 1.7, 0, "|+y⟩", color='white')
-        ax.text(0, 0, 1.7, "|0⟩", color='white')
-        ax.text(0, 0, -1.7, "|1⟩", color='white')
-        
-        # Set equal aspect ratio
-        ax.set_box_aspect([1, 1, 1])
-        ax.set_xlim(-1.5, 1.5)
-        ax.set_ylim(-1.5, 1.5)
-        ax.set_zlim(-1.5, 1.5)
-        
-        # Remove tick labels for cleaner look
-        ax.set_xticklabels([])
-        ax.set_yticklabels([])
-        ax.set_zticklabels([])
-        
-        # Style for dark mode - fixed to use Matplotlib 3.x API
-        ax.xaxis.pane.set_edgecolor("white")
-        ax.yaxis.pane.set_edgecolor("white")
-        ax.zaxis.pane.set_edgecolor("white")
-        ax.xaxis.pane.fill = False
-        ax.yaxis.pane.fill = False
-        ax.zaxis.pane.fill = False
-        ax.set_facecolor('#253443')
-    
-    def update_visualization():
-        # Clear previous plots
-        bloch_ax.clear()
-        prob_ax.clear()
-        
-        # Create the Bloch sphere
-        create_bloch_sphere(bloch_ax)
-        
-        # Get values from sliders
-        alpha_val = alpha_slider.value() / 100.0
-        beta_val = np.sqrt(1 - alpha_val**2)
-        phase_val = phase_slider.value() * (2 * np.pi / 100.0)
+    # Build the Bloch sphere once; updates only move the state vector
+    bloch = bloch_renderer.BlochSphere(bloch_ax, title="Bloch Sphere Representation")
+    
+    # Build the probability chart once; updates only change bar heights and texts
+    states = ['|0⟩', '|1⟩']
+    bar_positions = np.arange(len(states))
+    prob_bars = prob_ax.bar(bar_positions, [0, 0], width=0.5, color='#3498DB', alpha=0.7,
+                            label='Probability')
+    prob_texts = [prob_ax.text(i, 0, "", ha='center', color='white') for i in bar_positions]
+    eq_label = prob_ax.text(0.5, -0.15, "", ha='center', color='white',
+                            transform=prob_ax.transAxes, fontsize=12)
+    
+    # Style the probability plot
+    prob_ax.set_ylabel('Probability', color='white')
+    prob_ax.set_title('Measurement Probabilities', color='white')
+    prob_ax.set_ylim(0, 1)
+    prob_ax.set_xticks(bar_positions)
+    prob_ax.set_xticklabels(states)
+    
+    # Style plots for dark mode
+    prob_ax.set_facecolor('#253443')
+    for spine in prob_ax.spines.values():
+        spine.set_color('white')
+    prob_ax.tick_params(colors='white')
+    
+    # Amplitudes, Bloch angles and probabilities for every slider position,
+    # for |ψ⟩ = α|0⟩ + β·e^(iφ)|1⟩ with θ = 2·arccos(α). The rows hold the
+    # results directly, so no Ry/phase matrices are built or cached per tick
+    amplitude_table = lookup_tables.ParameterTable(lookup_tables.superposition_rows, SLIDER_STEPS)
+    phasor_table = lookup_tables.ParameterTable(lookup_tables.phasor_rows, SLIDER_STEPS)
+    
+    @instrumentation.timed_update("superposition")
+    def update_visualization(preview=False):
+        # Look up the values for the slider positions
+        alpha_val, beta_val, sin_theta, cos_theta, p0, p1 = amplitude_table[alpha_slider.value()]
+        cos_phi, sin_phi, phase_val = phasor_table[phase_slider.value()]
         
         # Update displays
         alpha_display.setText(f"α = {alpha_val:.2f}")
         beta_display.setText(f"β = {beta_val:.2f}")
         phase_display.setText(f"Phase = {phase_val:.2f}")
         
-        # Calculate state vector
-        # |ψ⟩ = α|0⟩ + β·e^(iφ)|1⟩
-        # Convert to Bloch sphere coordinates
-        theta = 2 * np.arccos(alpha_val)
-        phi = phase_val
-        
-        # Calculate point on Bloch sphere
-        x = np.sin(theta) * np.cos(phi)
-        y = np.sin(theta) * np.sin(phi)
-        z = np.cos(theta)
-        
-        # Plot state vector on Bloch sphere
-        bloch_ax.quiver(0, 0, 0, x, y, z, color='yellow', linewidth=3, arrow_length_ratio=0.15)
-        bloch_ax.scatter([x], [y], [z], color='red', s=100)
-        
-        # Set title for Bloch sphere
-        bloch_ax.set_title("Bloch Sphere Representation", color='white')
-        
-        # Plot probability amplitudes in bar chart
-        states = ['|0⟩', '|1⟩']
-        probs = [alpha_val**2, beta_val**2]
-        
-        # Real and imaginary components
-        real_part = [alpha_val, beta_val * np.cos(phase_val)]
-        imag_part = [0, beta_val * np.sin(phase_val)]
-        
-        # Bar positions
-        bar_positions = np.arange(len(states))
-        
-        # Plot real parts
-        prob_ax.bar(bar_positions, probs, width=0.5, color='#3498DB', alpha=0.7,
-                  label='Probability')
-        
-        # Style the probability plot
-        prob_ax.set_ylabel('Probability', color='white')
-        prob_ax.set_title('Measurement Probabilities', color='white')
-        prob_ax.set_ylim(0, 1)
-        prob_ax.set_xticks(bar_positions)
-        prob_ax.set_xticklabels(states)
-        
-        # Add text labels with probabilities
-        for i, p in enumerate(probs):
-            prob_ax.text(i, p + 0.05, f"{p:.2f}", ha='center', color='white')
-        
-        # Add equation of current state at the bottom
+        # Point on the Bloch sphere
+        x = sin_theta * cos_phi
+        y = sin_theta * sin_phi
+        z = cos_theta
+        
+        instrumentation.mark("artists")
+        # Move the state vector on the Bloch sphere; drop the surface while dragging
+        bloch.set_vector(x, y, z)
+        bloch.set_preview(preview)
+        bloch_view.set_vector(x, y, z)
+        
+        # Update probability bars and their labels
+        probs = [p0, p1]
+        for bar, text, p in zip(prob_bars, prob_texts, probs):
+            bar.set_height(p)
+            text.set_y(p + 0.05)
+            text.set_text(f"{p:.2f}")
+        
+        # Equation of current state at the bottom
         eq_text = f"|ψ⟩ = {alpha_val:.2f}|0⟩ + "
         if phase_val == 0:
             eq_text += f"{beta_val:.2f}|1⟩"
         else:
             eq_text += f"{beta_val:.2f}e^{phase_val:.2f}i|1⟩"
-        
-        prob_ax.text(0.5, -0.15, eq_text, ha='center', color='white', 
-                    transform=prob_ax.transAxes, fontsize=12)
-        
-        # Style plots for dark mode
-        prob_ax.set_facecolor('#253443')
-        for spine in prob_ax.spines.values():
-            spine.set_color('white')
-        prob_ax.tick_params(colors='white')
+        eq_label.set_text(eq_text)
         
         # Update the canvases
-        bloch_canvas.draw()
+        if renderer_selector.currentIndex() == 0:
+            bloch_view.repaint()
+        else:
+            bloch_canvas.draw()
         prob_canvas.draw()
     
-    # Connect sliders to update function
-    alpha_slider.valueChanged.connect(update_visualization)
-    phase_slider.valueChanged.connect(update_visualization)
+    # Connect sliders through a scheduler that renders at most once per frame
+    scheduler = RenderScheduler(update_visualization, parent=super_window)
+    scheduler.attach(alpha_slider)
+    scheduler.attach(phase_slider)
+    
+    def set_renderer(index):
+        # mplot3d opens on the camera the view was dragged to
+        bloch_stack.setCurrentIndex(index)
+        if index == 1:
+            bloch_ax.view_init(elev=bloch_view.elevation, azim=bloch_view.azimuth)
+            bloch_canvas.draw()
+    
+    renderer_selector.currentIndexChanged.connect(set_renderer)
     
     # Initial visualization
     update_visualization()
@@ -753,24 +859,99 @@ def visualize_superposition():
     description.setStyleSheet("color: #ECF0F1; margin: 20px 0;")
     layout.addWidget(description)
     
+    # Record / replay bar
+    trajectory = trajectory_panel.TrajectoryPanel(
+        "superposition", (alpha_slider, phase_slider),
+        parent=super_window)
+    layout.addWidget(trajectory)
+    
     # Set the layout and show the window
     super_window.setLayout(layout)
     super_window.show()
     
     # Keep references to prevent garbage collection
     super_window.bloch_canvas = bloch_canvas
+    super_window.views = (bloch_view,)
     super_window.prob_canvas = prob_canvas
-    super_window.controls = (alpha_slider, phase_slider)
+    super_window.scheduler = scheduler
+    super_window.controls = (alpha_slider, phase_slider, renderer_selector)
+    super_window.trajectory = trajectory
     
     return super_window
 
 
+def visualize_bloch():
+    """Bloch sphere of the |+⟩ state (the X axis) with a selectable renderer"""
+    bloch_window = QWidget()
+    bloch_window.setWindowTitle("Bloch Sphere")
+    bloch_window.setGeometry(200, 200, 600, 650)
+    bloch_window.setStyleSheet("background-color: #1A2930;")
+    
+    layout = QVBoxLayout()
+    
+    # Bloch sphere renderer
+    renderer_selector = QComboBox()
+    renderer_selector.addItems(BLOCH_RENDERERS)
+    renderer_selector.setStyleSheet("""
+        QComboBox {
+            background-color: #2C3E50;
+            color: white;
+            border-radius: 4px;
+            padding: 5px;
+        }
+        QComboBox QAbstractItemView {
+            background-color: #2C3E50;
+            color: white;
+            selection-background-color: #1ABC9C;
+        }
+    """)
+    renderer_label = QLabel("Bloch Renderer:")
+    renderer_label.setStyleSheet("color: white;")
+    
+    controls_layout = QHBoxLayout()
+    controls_layout.addWidget(renderer_label)
+    controls_layout.addWidget(renderer_selector)
+    controls_layout.addStretch()
+    layout.addLayout(controls_layout)
+    
+    # The QPainter view opens first; qiskit and its mplot3d figure are only
+    # loaded the first time that renderer is selected
+    view = bloch_painter.BlochView(title="Bloch Sphere")
+    view.set_vector(1, 0, 0)
+    bloch_stack = QStackedWidget()
+    bloch_stack.addWidget(view)
+    layout.addWidget(bloch_stack)
+    canvas = [None]  # Using a list to allow modification in nested scope
+    
+    def set_renderer(index):
+        # qiskit lays its axes out in its own frame, so the figure keeps its
+        # default camera rather than the one the view was dragged to
+        if index == 1 and canvas[0] is None:
+            canvas[0] = mpl_canvas.MatplotlibCanvas(width=5, height=5)
+            bloch_ax = canvas[0].fig.add_subplot(111, projection='3d')
+            bloch_visualizer.bloch_sphere(show=False, ax=bloch_ax)
+            bloch_stack.addWidget(canvas[0])
+            canvas[0].draw()
+        bloch_stack.setCurrentIndex(index)
+    
+    renderer_selector.currentIndexChanged.connect(set_renderer)
+    
+    bloch_window.setLayout(layout)
+    bloch_window.show()
+    
+    # Keep references to prevent garbage collection
+    bloch_window.views = (view,)
+    bloch_window.controls = (renderer_selector,)
+    
+    return bloch_window
+
+
 def visualize_interference():
     """Function to visualize quantum interference effects"""
     # Create a new window for interference visualization
     interf_window = QWidget()
     interf_window.setWindowTitle("Quantum Interference Visualization")
-    interf_window.setGeometry(200, 200, 900, 700)
+    interf_window.setGeometry(200, 200, 1200, 750)
     interf_window.setStyleSheet("background-color: #1A2930;")
     
     layout = QVBoxLayout()
@@ -796,9 +977,9 @@ def visualize_interference():
     controls_frame.setStyleSheet("background-color: #253443; border-radius: 6px; padding: 10px;")
     controls_layout = QGridLayout(controls_frame)
     
-    # Phase controls for two paths
+    # Phase controls for the first and last path; paths in between step linearly
     path1_phase = QSlider(Qt.Orientation.Horizontal)
-    path1_phase.setRange(0, 100)
+    path1_phase.setRange(0, SLIDER_STEPS)
     path1_phase.setValue(0)
     path1_phase.setStyleSheet("""
         QSlider::groove:horizontal {
@@ -815,8 +996,8 @@ def visualize_interference():
     """)
     
     path2_phase = QSlider(Qt.Orientation.Horizontal)
-    path2_phase.setRange(0, 100)
-    path2_phase.setValue(50)  # Default to π (out of phase)
+    path2_phase.setRange(0, SLIDER_STEPS)
+    path2_phase.setValue(SLIDER_STEPS // 2)  # Default to π (out of phase)
     path2_phase.setStyleSheet(path1_phase.styleSheet())
     
     # Phase display labels
@@ -826,104 +1007,245 @@ def visualize_interference():
     path2_display = QLabel("Path 2 Phase = π")
     path2_display.setStyleSheet("color: white; font-family: monospace;")
     
+    # Aperture whose sub-apertures (slits, grating lines, mask zones) are the paths
+    aperture_selector = QComboBox()
+    aperture_selector.addItems(["Double slit", "Grating", "Custom mask..."])
+    aperture_selector.setStyleSheet("""
+        QComboBox {
+            background-color: #2C3E50;
+            color: white;
+            border-radius: 4px;
+            padding: 5px;
+            min-width: 120px;
+        }
+        QComboBox QAbstractItemView {
+            background-color: #2C3E50;
+            color: white;
+            selection-background-color: #1ABC9C;
+        }
+    """)
+    
+    path_count = QSpinBox()
+    path_count.setRange(2, MAX_INTERFERENCE_PATHS)
+    path_count.setValue(2)
+    path_count.setEnabled(False)  # A double slit always has two paths
+    path_count.setStyleSheet("background-color: #2C3E50; color: white; padding: 3px;")
+    
+    # FFT grid size; larger grids resolve the aperture edges more finely
+    grid_selector = QComboBox()
+    grid_selector.addItems(["512", "1024", "2048", "4096"])
+    grid_selector.setCurrentIndex(1)
+    grid_selector.setStyleSheet(aperture_selector.styleSheet())
+    
+    # Status line: far-field grid, FFT time and spectrum memory
+    far_field_status = QLabel()
+    far_field_status.setStyleSheet("color: white; font-family: monospace;")
+    
     # Add controls to layout
-    controls_layout.addWidget(QLabel("Path 1 Phase:"), 0, 0)
+    path1_label = QLabel("Path 1 Phase:")
+    path2_label = QLabel("Path 2 Phase:")
+    controls_layout.addWidget(path1_label, 0, 0)
     controls_layout.addWidget(path1_phase, 0, 1)
     controls_layout.addWidget(path1_display, 0, 2)
     
-    controls_layout.addWidget(QLabel("Path 2 Phase:"), 1, 0)
+    controls_layout.addWidget(path2_label, 1, 0)
     controls_layout.addWidget(path2_phase, 1, 1)
     controls_layout.addWidget(path2_display, 1, 2)
     
+    aperture_row = QHBoxLayout()
+    for text, widget in [("Aperture:", aperture_selector), ("Paths:", path_count), ("FFT Grid:", grid_selector)]:
+        label = QLabel(text)
+        label.setStyleSheet("color: white;")
+        aperture_row.addWidget(label)
+        aperture_row.addWidget(widget)
+        aperture_row.addSpacing(15)
+    aperture_row.addStretch()
+    controls_layout.addLayout(aperture_row, 2, 0, 1, 3)
+    controls_layout.addWidget(far_field_status, 3, 0, 1, 3)
+    
     layout.addWidget(controls_frame)
     
     # Create matplotlib canvas for visualization
-    canvas = MatplotlibCanvas(width=8, height=5)
+    canvas = mpl_canvas.MatplotlibCanvas(width=11, height=5)
     layout.addWidget(canvas)
     
-    # Set up the figure with subplots
-    gs = canvas.fig.add_gridspec(2, 2, height_ratios=[1, 1.5])
-    ax_paths = canvas.fig.add_subplot(gs[0, :])
-    ax_combined = canvas.fig.add_subplot(gs[1, :])
+    # Waves on the left, far-field image on the right
+    gs = canvas.fig.add_gridspec(2, 2, height_ratios=[1, 1.5], width_ratios=[1.4, 1])
+    ax_paths = canvas.fig.add_subplot(gs[0, 0])
+    ax_combined = canvas.fig.add_subplot(gs[1, 0])
+    ax_far = canvas.fig.add_subplot(gs[:, 1])
+    
+    # Build every plot once; updates only move the data and retitle
+    wave_x = np.linspace(0, 10, 1000)
+    path_lines = mcollections.LineCollection([], linewidths=1.5)
+    ax_paths.add_collection(path_lines)
+    combined_line, = ax_combined.plot([], [], color='#F1C40F', linewidth=2)
+    paths_title = ax_paths.set_title('Individual Path Amplitudes', color='white')
+    combined_title = ax_combined.set_title('Combined Amplitude (Interference)', color='white')
+    ax_combined.set_xlabel('Position', color='white')
+    
+    # Style the plots for dark mode
+    for ax in [ax_paths, ax_combined]:
+        ax.set_xlim(0, 10)
+        ax.set_ylim(-1.1, 1.1)
+        ax.set_yticks([-1, -0.5, 0, 0.5, 1])
+        ax.grid(True, linestyle='--', alpha=0.3, color='white')
+    
+    # Intensity is normalized to its in-phase peak; the square-root scale shows the side fringes
+    half = min(FAR_FIELD_CROP, int(grid_selector.currentText())) // 2
+    far_image = ax_far.imshow(np.zeros((2, 2)), cmap='inferno', norm=mcolors.PowerNorm(0.5, vmin=0, vmax=1),
+                              origin='lower', interpolation='nearest', extent=(-half, half, -half, half))
+    ax_far.set_title('Far-Field Intensity', color='white')
+    ax_far.set_xlabel('$k_x$', color='white')
+    ax_far.set_ylabel('$k_y$', color='white')
+    for ax in [ax_paths, ax_combined, ax_far]:
+        ax.set_facecolor('#253443')
+        for spine in ax.spines.values():
+            spine.set_color('white')
+        ax.tick_params(colors='white')
     
-    def update_visualization():
-        # Clear previous plots
-        ax_paths.clear()
-        ax_combined.clear()
-        
+    # Far fields are built on a worker thread and kept for the last few geometries
+    jobs = JobRunner(parent=interf_window)
+    far_field = [None]  # Using a list to allow modification in nested scope
+    far_field_cache = {}  # (aperture, paths, grid, mask file) -> FarField
+    custom_mask = [None]  # Mask file of the custom aperture
+    previous_aperture = [0]
+    
+    def current_paths():
+        return 2 if aperture_selector.currentIndex() == 0 else path_count.value()
+    
+    def build_far_field(kind, paths, size, mask_path, progress=None):
+        # Runs on the worker thread
+        start = time.perf_counter()
+        if kind == 0:
+            aperture = interference.double_slit(size)
+        elif kind == 1:
+            aperture = interference.grating(size, paths)
+        else:
+            aperture = interference.custom_aperture(interference.mask_from_file(mask_path, size), paths)
+        result = interference.FarField(aperture, FAR_FIELD_CROP, progress=progress)
+        return result, time.perf_counter() - start
+    
+    def rebuild_far_field():
+        key = (aperture_selector.currentIndex(), current_paths(), int(grid_selector.currentText()),
+               custom_mask[0])
+        path_count.setEnabled(key[0] != 0)
+        cached = far_field_cache.get(key)
+        if cached is not None:
+            jobs.cancel("far_field")
+            far_field[0] = cached
+            update_visualization()
+            return
+        # Keep showing the old pattern until the new one arrives
+        far_field[0] = None
+        jobs.submit("far_field", build_far_field, *key, report_progress=True)
+        update_visualization()
+    
+    def show_far_field(key, result):
+        result, elapsed = result
+        result_key = (aperture_selector.currentIndex(), current_paths(), result.size, custom_mask[0])
+        far_field_cache[result_key] = result
+        while len(far_field_cache) > FAR_FIELD_CACHE_SIZE:
+            del far_field_cache[next(iter(far_field_cache))]
+        far_field[0] = result
+        half = result.crop // 2
+        far_image.set_extent((-half, half, -half, half))
+        far_field_status.setText(f"grid: {result.size}x{result.size}   FFT: {elapsed * 1000:.0f} ms   "
+                                 f"spectra: {result.nbytes / 2 ** 20:.1f} MiB")
+        update_visualization()
+    
+    def choose_aperture(index):
+        if index == 2:
+            path, _ = QFileDialog.getOpenFileName(interf_window, "Open Aperture Mask", "",
+                                                  "Masks (*.png *.jpg *.jpeg *.bmp *.npy)")
+            if not path:
+                # Cancelled: go back to the previous aperture
+                aperture_selector.blockSignals(True)
+                aperture_selector.setCurrentIndex(previous_aperture[0])
+                aperture_selector.blockSignals(False)
+                return
+            custom_mask[0] = path
+        previous_aperture[0] = index
+        rebuild_far_field()
+    
+    jobs.result.connect(show_far_field)
+    jobs.progress.connect(lambda key, fraction: far_field_status.setText(f"computing far field... {fraction:.0%}"))
+    jobs.failed.connect(lambda key, message: far_field_status.setText(message))
+    
+    @instrumentation.timed_update("interference")
+    def update_visualization(preview=False):
+        n = current_paths()
         # Get phases from sliders (0 to 2π)
-        phase1 = path1_phase.value() * (2 * np.pi / 100)
-        phase2 = path2_phase.value() * (2 * np.pi / 100)
+        phase1 = path1_phase.value() * (2 * np.pi / SLIDER_STEPS)
+        phase2 = path2_phase.value() * (2 * np.pi / SLIDER_STEPS)
         
         # Update display labels
-        if abs(phase1 - np.pi) < 0.1:
-            path1_display.setText("Path 1 Phase = π")
-        elif abs(phase1 - 2*np.pi) < 0.1 or phase1 < 0.1:
-            path1_display.setText("Path 1 Phase = 0")
-        else:
-            path1_display.setText(f"Path 1 Phase = {phase1:.2f}")
-            
-        if abs(phase2 - np.pi) < 0.1:
-            path2_display.setText("Path 2 Phase = π")
-        elif abs(phase2 - 2*np.pi) < 0.1 or phase2 < 0.1:
-            path2_display.setText("Path 2 Phase = 0")
-        else:
-            path2_display.setText(f"Path 2 Phase = {phase2:.2f}")
-        
-        # Create x values for the wave plot
-        x = np.linspace(0, 10, 1000)
-        
-        # Create waves with the respective phases
-        amplitude = 0.5
-        wave1 = amplitude * np.sin(x - phase1)
-        wave2 = amplitude * np.sin(x - phase2)
-        
-        # Combined wave (interference)
-        combined = wave1 + wave2
-        
-        # Plot individual waves
-        ax_paths.plot(x, wave1, color='#3498DB', label='Path 1')
-        ax_paths.plot(x, wave2, color='#E74C3C', label='Path 2')
-        ax_paths.set_title('Individual Path Amplitudes', color='white')
-        ax_paths.legend()
-        ax_paths.set_ylim(-1.1, 1.1)
-        ax_paths.set_yticks([-1, -0.5, 0, 0.5, 1])
-        
-        # Plot combined wave (interference)
-        ax_combined.plot(x, combined, color='#F1C40F', linewidth=2)
-        ax_combined.set_title('Combined Amplitude (Interference)', color='white')
-        ax_combined.set_ylim(-1.1, 1.1)
-        ax_combined.set_yticks([-1, -0.5, 0, 0.5, 1])
-        ax_combined.set_xlabel('Position', color='white')
-        
-        # Calculate the phase difference and interference type
-        phase_diff = abs((phase1 - phase2) % (2 * np.pi))
-        if phase_diff < 0.1 or abs(phase_diff - 2*np.pi) < 0.1:
+        for display, index, phase in [(path1_display, 1, phase1), (path2_display, n, phase2)]:
+            if abs(phase - np.pi) < 0.1:
+                display.setText(f"Path {index} Phase = π")
+            elif abs(phase - 2*np.pi) < 0.1 or phase < 0.1:
+                display.setText(f"Path {index} Phase = 0")
+            else:
+                display.setText(f"Path {index} Phase = {phase:.2f}")
+        
+        # Equal amplitudes, so the combined wave stays within ±1
+        phases = interference.path_phases(phase1, phase2, n)
+        amplitudes = np.full(n, 1.0 / n)
+        
+        # Waves with the respective phases (coarser while a slider is dragged)
+        step = 5 if preview else 1
+        x = wave_x[::step]
+        waves = interference.path_waves(amplitudes, phases, x)
+        combined = waves.sum(axis=0)
+        
+        intensity = None
+        if far_field[0] is not None and far_field[0].num_paths == n:
+            intensity = far_field[0].intensity(amplitudes, phases)
+            if preview:
+                intensity = intensity[::2, ::2]
+        visibility = interference.on_axis_visibility(amplitudes, phases)
+        
+        instrumentation.mark("artists")
+        path_lines.set_segments(np.stack([np.broadcast_to(x, waves.shape), waves], axis=-1))
+        path_lines.set_color(['#3498DB', '#E74C3C'] if n == 2 else
+                             plt.colormaps['cool'](np.linspace(0, 1, n)))
+        paths_title.set_text(f'Individual Path Amplitudes ({n} paths)')
+        path2_label.setText(f"Path {n} Phase:")
+        combined_line.set_data(x, combined)
+        if intensity is not None:
+            far_image.set_data(intensity)
+        
+        # Interference type from the on-axis intensity relative to all paths in phase
+        if visibility > 0.99:
             interf_type = "Constructive Interference"
-        elif abs(phase_diff - np.pi) < 0.1:
+        elif visibility < 0.01:
             interf_type = "Destructive Interference"
         else:
             interf_type = "Partial Interference"
         
-        ax_combined.set_title(f'Combined Amplitude: {interf_type}', color='white')
-        
-        # Style the plots for dark mode
-        for ax in [ax_paths, ax_combined]:
-            ax.set_facecolor('#253443')
-            for spine in ax.spines.values():
-                spine.set_color('white')
-            ax.tick_params(colors='white')
-            ax.grid(True, linestyle='--', alpha=0.3, color='white')
+        combined_title.set_text(f'Combined Amplitude: {interf_type}')
         
-        # Update the canvas
-        canvas.draw()
+        # Update the canvas; while a slider is dragged only the changing artists are redrawn
+        if preview:
+            animator.blit()
+        else:
+            animator.release()
+            canvas.draw()
+    
+    # Blits the data artists over a cached background on demand (it never runs its timer)
+    animator = BlitAnimator(canvas, [path_lines, combined_line, far_image, paths_title, combined_title],
+                            None, name="interference")
     
-    # Connect sliders to update function
-    path1_phase.valueChanged.connect(update_visualization)
-    path2_phase.valueChanged.connect(update_visualization)
+    # Connect sliders through a scheduler that renders at most once per frame
+    scheduler = RenderScheduler(update_visualization, parent=interf_window)
+    scheduler.attach(path1_phase)
+    scheduler.attach(path2_phase)
+    aperture_selector.currentIndexChanged.connect(choose_aperture)
+    path_count.valueChanged.connect(lambda: rebuild_far_field())
+    grid_selector.currentIndexChanged.connect(lambda: rebuild_far_field())
     
     # Initial visualization
-    update_visualization()
+    rebuild_far_field()
     
     # Explanation text
     explanation = QLabel(
@@ -935,6 +1257,9 @@ def visualize_interference():
         "maximizing the probability of detecting the particle.</li>"
         "<li>When the paths are out of phase (180° difference), <b>destructive interference</b> occurs, "
         "potentially canceling out and reducing the probability to zero.</li>"
+        "<li>The image shows the far-field pattern behind the aperture, where each slit, grating line or "
+        "mask zone is one path. With more than two paths the phases step evenly from the first to the "
+        "last path, steering the bright fringes sideways.</li>"
         "</ul>"
         "<p>This is the fundamental principle behind phenomena like the double-slit experiment and quantum computing algorithms.</p>"
     )
@@ -942,17 +1267,1287 @@ def visualize_interference():
     explanation.setStyleSheet("color: #ECF0F1; margin: 20px 0;")
     layout.addWidget(explanation)
     
+    # Record / replay bar
+    trajectory = trajectory_panel.TrajectoryPanel(
+        "interference", (path1_phase, path2_phase, aperture_selector, path_count, grid_selector),
+        parent=interf_window)
+    layout.addWidget(trajectory)
+    
     # Set the layout and show the window
     interf_window.setLayout(layout)
     interf_window.show()
     
     # Keep references to prevent garbage collection
     interf_window.canvas = canvas
-    interf_window.controls = (path1_phase, path2_phase)
+    interf_window.scheduler = scheduler
+    interf_window.animator = animator
+    interf_window.jobs = jobs
+    interf_window.controls = (path1_phase, path2_phase, aperture_selector, path_count, grid_selector)
+    interf_window.trajectory = trajectory
     
     return interf_window
 
 
+# Interference window: most paths, cropped far-field size and far fields kept per window
+MAX_INTERFERENCE_PATHS = 32
+FAR_FIELD_CROP = 512
+FAR_FIELD_CACHE_SIZE = 4
+
+
+# Noise levels offered by the Bloch grid and measurement windows (probability of a
+# depolarizing error and of amplitude damping per gate and qubit, and of a readout
+# flip), Monte Carlo trajectories averaged, and the largest register simulated noisy
+NOISE_LEVELS = (0.0, 0.001, 0.005, 0.01, 0.02, 0.05)
+NOISE_TRAJECTORIES = 500
+MAX_NOISY_QUBITS = 10
+
+
+def noise_selector(style):
+    """Combo box of NOISE_LEVELS"""
+    selector = QComboBox()
+    selector.addItems(["None"] + [f"{level:.1%}" for level in NOISE_LEVELS[1:]])
+    selector.setStyleSheet(style)
+    return selector
+
+
+def noisy_result(circuit, level, progress=None):
+    """Trajectory-averaged simulation of a circuit at one of NOISE_LEVELS"""
+    model = noise.NoiseModel(level, level, level)
+    return noise.TrajectorySimulator(model, NOISE_TRAJECTORIES, seed=0).run(circuit, progress=progress)
+
+
+# Bloch grid: largest register (wide non-Clifford states run on the MPS backend),
+# bond dimensions offered for it, and total time and Trotter steps of the Ising quench
+MAX_GRID_QUBITS = 100
+GRID_BOND_CHOICES = (8, 16, 32, 64, 128)
+ISING_TIME = 4.0
+ISING_STEPS = 20
+
+
+def visualize_bloch_grid():
+    """Function to visualize every qubit of a multi-qubit state on its own Bloch sphere"""
+    # Create a new window for the Bloch grid
+    grid_window = QWidget()
+    grid_window.setWindowTitle("Multi-Qubit Bloch Grid")
+    grid_window.setGeometry(200, 200, 1000, 800)
+    grid_window.setStyleSheet("background-color: #1A2930;")
+    
+    layout = QVBoxLayout()
+    
+    # Title
+    title = QLabel("Multi-Qubit Bloch Grid")
+    title.setFont(QFont('Arial', 16, QFont.Weight.Bold))
+    title.setStyleSheet("color: #1ABC9C; margin-bottom: 20px;")
+    title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+    layout.addWidget(title)
+    
+    # Controls frame
+    controls_frame = QFrame()
+    controls_frame.setStyleSheet("background-color: #253443; border-radius: 6px; padding: 10px;")
+    controls_layout = QGridLayout(controls_frame)
+    
+    # State family selection
+    preset_selector = QComboBox()
+    preset_selector.addItems(["Rotated product state", "Growing GHZ chain", "Rotated Bell pairs",
+                              "Ising chain quench"])
+    preset_selector.setStyleSheet("""
+        QComboBox {
+            background-color: #2C3E50;
+            color: white;
+            border-radius: 4px;
+            padding: 5px;
+            min-width: 200px;
+        }
+        QComboBox QAbstractItemView {
+            background-color: #2C3E50;
+            color: white;
+            selection-background-color: #1ABC9C;
+        }
+    """)
+    
+    # Number of qubits
+    qubit_control = QSpinBox()
+    qubit_control.setRange(1, MAX_GRID_QUBITS)
+    qubit_control.setValue(16)
+    qubit_control.setStyleSheet("background-color: #2C3E50; color: white; padding: 3px;")
+    
+    # Bond dimension limit of the MPS backend
+    bond_selector = QComboBox()
+    bond_selector.addItems([str(bond) for bond in GRID_BOND_CHOICES])
+    bond_selector.setCurrentIndex(GRID_BOND_CHOICES.index(32))
+    bond_selector.setStyleSheet(preset_selector.styleSheet())
+    
+    # Family parameter
+    param_slider = QSlider(Qt.Orientation.Horizontal)
+    param_slider.setRange(0, SLIDER_STEPS)
+    param_slider.setValue(SLIDER_STEPS // 2)
+    param_slider.setStyleSheet("""
+        QSlider::groove:horizontal {
+            height: 8px;
+            background: #34495E;
+            border-radius: 4px;
+        }
+        QSlider::handle:horizontal {
+            background: #1ABC9C;
+            width: 16px;
+            margin: -4px 0;
+            border-radius: 8px;
+        }
+    """)
+    
+    # Gate noise, simulated with Monte Carlo trajectories
+    noise_control = noise_selector(preset_selector.styleSheet())
+    
+    # Status line: backend, simulation time and number of redrawn cells
+    status_display = QLabel()
+    status_display.setStyleSheet("color: white; font-family: monospace;")
+    
+    for row, (text, widget) in enumerate([("State Family:", preset_selector),
+                                          ("Qubits:", qubit_control),
+                                          ("Parameter:", param_slider),
+                                          ("MPS Max Bond:", bond_selector),
+                                          ("Noise:", noise_control)]):
+        label = QLabel(text)
+        label.setStyleSheet("color: white;")
+        controls_layout.addWidget(label, row, 0)
+        controls_layout.addWidget(widget, row, 1)
+    controls_layout.addWidget(status_display, 5, 0, 1, 2)
+    
+    layout.addWidget(controls_frame)
+    
+    # Create matplotlib canvas for visualization
+    canvas = mpl_canvas.MatplotlibCanvas(width=8, height=6)
+    canvas.fig.patch.set_facecolor('#1A2930')
+    layout.addWidget(canvas, 1)
+    
+    # Entanglement entropy across every bond of the chain
+    profile_canvas = mpl_canvas.MatplotlibCanvas(width=8, height=1.6)
+    profile_canvas.fig.patch.set_facecolor('#1A2930')
+    profile_canvas.fig.subplots_adjust(left=0.07, right=0.99, bottom=0.28, top=0.9)
+    profile_ax = profile_canvas.fig.add_subplot(111)
+    profile_ax.set_facecolor('#253443')
+    profile_ax.tick_params(colors='white', labelsize=8)
+    profile_ax.set_xlabel("bond (qubits 0..k | k+1..n-1)", color='white', fontsize=8)
+    profile_ax.set_ylabel("S (bits)", color='white', fontsize=8)
+    profile_line, = profile_ax.plot([], [], color='#1ABC9C', marker='o', markersize=3)
+    layout.addWidget(profile_canvas)
+    
+    def preset_ops(preset, n, t):
+        if preset == 0:
+            # Each qubit rotated a little further than the previous one
+            return [("ry", [q], [np.pi * t * (q + 1) / n]) for q in range(n)]
+        if preset == 1:
+            # The first k qubits form a GHZ state, the rest stay in |+⟩
+            k = int(round(t * (n - 1)))
+            ops = [("h", [0])] + [("cx", [q, q + 1]) for q in range(k)]
+            return ops + [("h", [q]) for q in range(k + 1, n)]
+        if preset == 2:
+            # Neighbouring pairs entangled by a partial rotation before CX
+            ops = [("ry", [q], [np.pi * t]) for q in range(0, n, 2)]
+            return ops + [("cx", [q, q + 1]) for q in range(0, n - 1, 2)]
+        # Transverse-field Ising chain evolved for time ISING_TIME * t from |0...0⟩ (Trotter steps)
+        dt = ISING_TIME * t / ISING_STEPS
+        ops = []
+        for _ in range(ISING_STEPS):
+            ops += [("rzz", [q, q + 1], [2 * dt]) for q in range(n - 1)]
+            ops += [("rx", [q], [2 * dt]) for q in range(n)]
+        return ops
+    
+    grid = [None]  # Using a list to allow modification in nested scope
+    
+    # Simulations run on a worker thread; moving a control again supersedes them
+    jobs = JobRunner(parent=grid_window)
+    
+    def rebuild_grid():
+        if grid[0] is not None:
+            grid[0].disconnect()
+        canvas.fig.clear()
+        grid[0] = bloch_grid.BlochGrid(canvas, qubit_control.value())
+        canvas.draw_idle()
+        update_visualization()
+    
+    def simulate(circuit, backend, options, progress=None):
+        # Runs on the worker thread
+        start = time.perf_counter()
+        if backend == "trajectories":
+            # Mixed states have no single entropy profile
+            vectors = noisy_result(circuit, options["level"], progress).bloch_vectors()
+            return backend, vectors, None, None, time.perf_counter() - start
+        result = backends.run(circuit, backend, progress=progress, **options)
+        vectors = result.bloch_vectors()
+        entropies = result.entanglement_entropies()
+        report = result.report() if backend == "mps" else None
+        return backend, vectors, entropies, report, time.perf_counter() - start
+    
+    def update_visualization():
+        n = qubit_control.value()
+        circuit = (n, preset_ops(preset_selector.currentIndex(), n, param_slider.value() / SLIDER_STEPS))
+        level = NOISE_LEVELS[noise_control.currentIndex()]
+        if level:
+            if n > MAX_NOISY_QUBITS:
+                jobs.cancel("grid")
+                status_display.setText(f"Noisy states are limited to {MAX_NOISY_QUBITS} qubits")
+                return
+            jobs.submit("grid", simulate, circuit, "trajectories", {"level": level}, report_progress=True)
+            return
+        backend = backends.select_backend(circuit)
+        options = {}
+        if backend == "mps":
+            options["max_bond"] = GRID_BOND_CHOICES[bond_selector.currentIndex()]
+        jobs.submit("grid", simulate, circuit, backend, options, report_progress=True)
+    
+    def show_profile(entropies):
+        if entropies is None:
+            entropies = np.zeros(0)
+        bonds = np.arange(len(entropies))
+        profile_line.set_data(bonds, entropies)
+        profile_ax.set_xlim(-0.5, max(len(entropies) - 0.5, 0.5))
+        profile_ax.set_ylim(0, max(1.0, float(np.max(entropies, initial=0)) * 1.15))
+        profile_canvas.draw_idle()
+    
+    @instrumentation.timed_update("bloch_grid")
+    def show_result(key, result):
+        backend, vectors, entropies, report, elapsed = result
+        if len(vectors) != grid[0].num_qubits:
+            return  # The grid was rebuilt for another size meanwhile
+        instrumentation.mark("artists")
+        changed = grid[0].set_vectors(vectors)
+        show_profile(entropies)
+        if backend == "trajectories":
+            backend = f"{NOISE_TRAJECTORIES} noisy trajectories"
+        text = (f"backend: {backend}   simulate: {elapsed * 1000:.1f} ms   "
+                f"cells redrawn: {len(changed)}/{len(vectors)}")
+        if report is not None:
+            text += (f"\nbond: {report['max_bond']}/{report['bond_limit']}   "
+                     f"truncation error: {report['truncation_error']:.2e} "
+                     f"(fidelity ~{report['fidelity']:.4f})   "
+                     f"memory: {report['nbytes'] / 2 ** 20:.2f} MiB "
+                     f"(dense: 2^{report['dense_nbytes'].bit_length() - 1} B)")
+        status_display.setText(text)
+    
+    jobs.result.connect(show_result)
+    jobs.progress.connect(lambda key, fraction: status_display.setText(f"simulating... {fraction:.0%}"))
+    jobs.failed.connect(lambda key, message: status_display.setText(message))
+    
+    # Connect controls to update functions
+    preset_selector.currentIndexChanged.connect(lambda: update_visualization())
+    param_slider.valueChanged.connect(lambda: update_visualization())
+    bond_selector.currentIndexChanged.connect(lambda: update_visualization())
+    noise_control.currentIndexChanged.connect(lambda: update_visualization())
+    qubit_control.valueChanged.connect(rebuild_grid)
+    
+    # Initial visualization
+    rebuild_grid()
+    
+    # Description label
+    description = QLabel(
+        "<p>Each sphere shows the reduced state of one qubit. Entangled qubits have vectors shorter than "
+        "the sphere's radius; a qubit that is maximally entangled with the rest sits at the centre.</p>"
+        "<p>Clifford states (such as the GHZ chain) are simulated with a stabilizer tableau. Other states "
+        "wider than 20 qubits run on a matrix product state whose bonds keep at most the chosen number of "
+        "Schmidt values; the status line reports the weight discarded doing so. The strip below the grid "
+        "is the entanglement entropy across each bond. Only spheres whose vector changes are redrawn.</p>"
+        "<p>With noise, every gate depolarizes and damps the qubits it touches. The spheres then show "
+        "the average over Monte Carlo trajectories, run in parallel worker processes: vectors shrink "
+        "as the state becomes mixed.</p>"
+    )
+    description.setWordWrap(True)
+    description.setStyleSheet("color: #ECF0F1; margin: 20px 0;")
+    layout.addWidget(description)
+    
+    # Record / replay bar
+    trajectory = trajectory_panel.TrajectoryPanel(
+        "bloch_grid", (preset_selector, qubit_control, param_slider, bond_selector, noise_control),
+        parent=grid_window)
+    layout.addWidget(trajectory)
+    
+    # Set the layout and show the window
+    grid_window.setLayout(layout)
+    grid_window.show()
+    
+    # Keep references to prevent garbage collection
+    grid_window.canvas = canvas
+    grid_window.grid = grid
+    grid_window.jobs = jobs
+    grid_window.profile_canvas = profile_canvas
+    grid_window.controls = (preset_selector, qubit_control, param_slider, bond_selector, noise_control)
+    grid_window.trajectory = trajectory
+    
+    return grid_window
+
+
+# Measurement window: largest register, histogram bars shown and shot targets
+MAX_MEASURED_QUBITS = 20
+MAX_HISTOGRAM_BARS = 32
+SHOT_TARGETS = [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8]
+# Each streamed frame adds this fraction of the shots drawn so far (at least
+# 1000), so totals grow log-evenly; batches are also capped to SAMPLE_BUDGET
+# seconds of sampling per frame
+STREAM_GROWTH = 0.1
+SAMPLE_BUDGET = 0.008
+
+
+def visualize_measurement():
+    """Function to visualize measurement statistics converging as shots accumulate"""
+    # Create a new window for measurement statistics
+    meas_window = QWidget()
+    meas_window.setWindowTitle("Measurement Statistics")
+    meas_window.setGeometry(200, 200, 1000, 750)
+    meas_window.setStyleSheet("background-color: #1A2930;")
+    
+    layout = QVBoxLayout()
+    
+    # Title
+    title = QLabel("Measurement Statistics")
+    title.setFont(QFont('Arial', 16, QFont.Weight.Bold))
+    title.setStyleSheet("color: #1ABC9C; margin-bottom: 20px;")
+    title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+    layout.addWidget(title)
+    
+    # Controls frame
+    controls_frame = QFrame()
+    controls_frame.setStyleSheet("background-color: #253443; border-radius: 6px; padding: 10px;")
+    controls_layout = QGridLayout(controls_frame)
+    
+    # State family selection
+    preset_selector = QComboBox()
+    preset_selector.addItems(["Rotated product state", "Partial GHZ state", "Random circuit"])
+    preset_selector.setStyleSheet("""
+        QComboBox {
+            background-color: #2C3E50;
+            color: white;
+            border-radius: 4px;
+            padding: 5px;
+            min-width: 200px;
+        }
+        QComboBox QAbstractItemView {
+            background-color: #2C3E50;
+            color: white;
+            selection-background-color: #1ABC9C;
+        }
+    """)
+    
+    # Number of measured qubits
+    qubit_control = QSpinBox()
+    qubit_control.setRange(1, MAX_MEASURED_QUBITS)
+    qubit_control.setValue(4)
+    qubit_control.setStyleSheet("background-color: #2C3E50; color: white; padding: 3px;")
+    
+    # Family parameter (rotation angle, or the random circuit's seed)
+    param_slider = QSlider(Qt.Orientation.Horizontal)
+    param_slider.setRange(0, SLIDER_STEPS)
+    param_slider.setValue(SLIDER_STEPS // 2)
+    param_slider.setStyleSheet("""
+        QSlider::groove:horizontal {
+            height: 8px;
+            background: #34495E;
+            border-radius: 4px;
+        }
+        QSlider::handle:horizontal {
+            background: #1ABC9C;
+            width: 16px;
+            margin: -4px 0;
+            border-radius: 8px;
+        }
+    """)
+    
+    # Number of shots to stream before stopping
+    shots_selector = QComboBox()
+    shots_selector.addItems([f"{shots:,}" for shots in SHOT_TARGETS])
+    shots_selector.setCurrentIndex(3)
+    shots_selector.setStyleSheet(preset_selector.styleSheet())
+    
+    # Gate and readout noise, simulated with Monte Carlo trajectories
+    noise_control = noise_selector(preset_selector.styleSheet())
+    
+    start_button = QPushButton("Start")
+    reset_button = QPushButton("Reset")
+    for button in (start_button, reset_button):
+        button.setCursor(Qt.CursorShape.PointingHandCursor)
+        button.setStyleSheet("""
+            QPushButton {
+                background-color: #2C3E50;
+                color: white;
+                border-radius: 4px;
+                padding: 6px 15px;
+            }
+            QPushButton:hover {
+                background-color: #34495E;
+            }
+        """)
+    
+    # Status line: shots drawn, sampling rate and distance from the exact distribution
+    status_display = QLabel()
+    status_display.setStyleSheet("color: white; font-family: monospace;")
+    
+    for row, (text, widget) in enumerate([("State Family:", preset_selector),
+                                          ("Qubits:", qubit_control),
+                                          ("Parameter:", param_slider),
+                                          ("Shots:", shots_selector),
+                                          ("Noise:", noise_control)]):
+        label = QLabel(text)
+        label.setStyleSheet("color: white;")
+        controls_layout.addWidget(label, row, 0)
+        controls_layout.addWidget(widget, row, 1)
+    buttons = QHBoxLayout()
+    buttons.addWidget(start_button)
+    buttons.addWidget(reset_button)
+    buttons.addStretch()
+    controls_layout.addLayout(buttons, 5, 0, 1, 2)
+    controls_layout.addWidget(status_display, 6, 0, 1, 2)
+    
+    layout.addWidget(controls_frame)
+    
+    # Create matplotlib canvas for visualization
+    canvas = mpl_canvas.MatplotlibCanvas(width=8, height=5)
+    canvas.fig.patch.set_facecolor('#1A2930')
+    layout.addWidget(canvas, 1)
+    ax = canvas.fig.add_subplot(111)
+    # Room for vertical bitstring labels; fixed so rebuilds skip a layout pass
+    canvas.fig.subplots_adjust(left=0.08, right=0.97, top=0.9, bottom=0.3)
+    
+    def preset_ops(preset, n, t):
+        if preset == 0:
+            # Each qubit rotated a little further than the previous one
+            return [("ry", [q], [np.pi * t * (q + 1) / n]) for q in range(n)]
+        if preset == 1:
+            # cos(πt/2)|0...0⟩ + sin(πt/2)|1...1⟩
+            return [("ry", [0], [np.pi * t])] + [("cx", [q, q + 1]) for q in range(n - 1)]
+        # Four layers of random rotations and CX ladders, seeded by the parameter
+        rng = np.random.default_rng(int(round(t * SLIDER_STEPS)))
+        ops = []
+        for layer in range(4):
+            ops += [("ry", [q], [rng.uniform(0, np.pi)]) for q in range(n)]
+            ops += [("rz", [q], [rng.uniform(0, 2 * np.pi)]) for q in range(n)]
+            ops += [("cx", [q, q + 1]) for q in range(layer % 2, n - 1, 2)]
+        return ops
+    
+    sampler = [None]  # ShotSampler of the current state
+    ideal = [None]  # Noiseless probabilities when the sampled ones are noisy
+    histogram = {}  # Bars, exact markers and title of the current histogram
+    batch_limit = [SHOT_TARGETS[-1]]  # Most shots one frame can sample within SAMPLE_BUDGET
+    last_batch = [0, 0.0]  # Shots and seconds of the last streamed batch
+    
+    # States are simulated on a worker thread
+    jobs = JobRunner(parent=meas_window)
+    
+    def simulate(circuit, level, progress=None):
+        # Runs on the worker thread
+        start = time.perf_counter()
+        if not level:
+            probabilities = backends.run(circuit, "statevector", progress=progress).probabilities()
+            return probabilities, None, time.perf_counter() - start
+        noiseless = backends.run(circuit, "statevector").probabilities()
+        probabilities = noisy_result(circuit, level, progress).probabilities()
+        return probabilities, noiseless, time.perf_counter() - start
+    
+    def update_state():
+        n = qubit_control.value()
+        circuit = (n, preset_ops(preset_selector.currentIndex(), n, param_slider.value() / SLIDER_STEPS))
+        level = NOISE_LEVELS[noise_control.currentIndex()]
+        if level and n > MAX_NOISY_QUBITS:
+            jobs.cancel("state")
+            status_display.setText(f"Noisy states are limited to {MAX_NOISY_QUBITS} qubits")
+            return
+        jobs.submit("state", simulate, circuit, level, report_progress=True)
+    
+    def show_state(key, result):
+        probabilities, noiseless, elapsed = result
+        streaming = animator.running
+        if streaming:
+            animator.stop()
+        ideal[0] = noiseless
+        sampler[0] = sampling.ShotSampler(probabilities)
+        rebuild_histogram()
+        if streaming:
+            animator.start()
+    
+    def rebuild_histogram():
+        probs = sampler[0].probabilities
+        n = qubit_control.value()
+        # Up to MAX_HISTOGRAM_BARS outcomes: all of them, or the most probable ones in index order
+        if len(probs) > MAX_HISTOGRAM_BARS:
+            shown = np.sort(np.argsort(probs)[::-1][:MAX_HISTOGRAM_BARS])
+        else:
+            shown = np.arange(len(probs))
+        positions = np.arange(len(shown))
+        
+        ax.clear()
+        bars = ax.bar(positions, np.zeros(len(shown)), color='#1ABC9C', width=0.7, label='Measured')
+        marker_size = 200 / max(len(shown), 8)
+        exact, = ax.plot(positions, probs[shown], linestyle='none', marker='_', zorder=3,
+                         markersize=marker_size, markeredgewidth=2, color='#F1C40F',
+                         label='Exact' if ideal[0] is None else 'Noisy average')
+        markers = [exact]
+        if ideal[0] is not None:
+            markers += ax.plot(positions, ideal[0][shown], linestyle='none', marker='_', zorder=3,
+                               markersize=marker_size, markeredgewidth=2, color='#E74C3C', label='Ideal')
+        ax.set_xticks(positions)
+        ax.set_xticklabels([format(int(i), f"0{n}b") for i in shown], rotation=90 if n > 4 else 0,
+                           fontsize=8 if n > 6 else 10)
+        ax.set_xlim(-0.6, len(shown) - 0.4)
+        top = max(float(probs[shown].max()), 1e-9)
+        if ideal[0] is not None:
+            top = max(top, float(ideal[0][shown].max()))
+        ax.set_ylim(0, top * 1.25)
+        ax.set_ylabel('Frequency', color='white')
+        ax.set_xlabel('Outcome (qubit 0 rightmost)' if len(shown) == len(probs) else
+                      f'{len(shown)} most likely of {len(probs):,} outcomes (qubit 0 rightmost)', color='white')
+        ax.set_facecolor('#253443')
+        for spine in ax.spines.values():
+            spine.set_color('white')
+        ax.tick_params(colors='white')
+        ax.legend(loc='upper right')
+        histogram.update(bars=list(bars), shown=shown, title=ax.set_title('', color='white'))
+        # The markers are blitted too so the moving bars never cover them
+        animator.artists = histogram["bars"] + markers + [histogram["title"]]
+        render_counts()
+        canvas.draw()
+    
+    def render_counts():
+        instrumentation.mark("artists")
+        current = sampler[0]
+        frequencies = current.counts[histogram["shown"]] / max(current.shots, 1)
+        for bar, height in zip(histogram["bars"], frequencies):
+            bar.set_height(height)
+        histogram["title"].set_text(f"{current.shots:,} shots   "
+                                    f"total variation distance {current.total_variation():.4f}")
+        status_display.setText(f"shots: {current.shots:,}   last batch: {last_batch[0]:,} "
+                               f"in {last_batch[1] * 1000:.1f} ms")
+    
+    def stream_frame():
+        # One animation frame: draw a batch of shots and move the bars
+        current = sampler[0]
+        if current is None:
+            return
+        remaining = SHOT_TARGETS[shots_selector.currentIndex()] - current.shots
+        if remaining > 0:
+            batch = min(remaining, max(1000, int(current.shots * STREAM_GROWTH)), batch_limit[0])
+            start = time.perf_counter()
+            current.draw(batch)
+            elapsed = max(time.perf_counter() - start, 1e-6)
+            last_batch[:] = [batch, elapsed]
+            batch_limit[0] = max(1000, int(batch * SAMPLE_BUDGET / elapsed))
+        else:
+            # Target reached: stop once this frame has been drawn
+            QTimer.singleShot(0, pause)
+        render_counts()
+    
+    def pause():
+        animator.stop()
+        start_button.setText("Start")
+    
+    def toggle_streaming():
+        if animator.running:
+            pause()
+            return
+        if sampler[0] is None:
+            return
+        if sampler[0].shots >= SHOT_TARGETS[shots_selector.currentIndex()]:
+            sampler[0].reset()
+        animator.start()
+        start_button.setText("Pause")
+    
+    def reset_counts():
+        if sampler[0] is None:
+            return
+        sampler[0].reset()
+        render_counts()
+        if not animator.running:
+            canvas.draw()
+    
+    def run_shots(total):
+        """Draw ``total`` shots at once and show them (for exports and benchmarks)"""
+        sampler[0].reset()
+        sampler[0].draw(total)
+        render_counts()
+        canvas.draw()
+    
+    # The bars are redrawn by blitting over the static axes while shots stream in
+    animator = BlitAnimator(canvas, [], stream_frame, fps=30, name="measurement")
+    
+    jobs.result.connect(show_state)
+    jobs.progress.connect(lambda key, fraction: status_display.setText(f"simulating... {fraction:.0%}"))
+    jobs.failed.connect(lambda key, message: status_display.setText(message))
+    
+    # Connect controls to update functions
+    preset_selector.currentIndexChanged.connect(lambda: update_state())
+    param_slider.valueChanged.connect(lambda: update_state())
+    qubit_control.valueChanged.connect(lambda: update_state())
+    noise_control.currentIndexChanged.connect(lambda: update_state())
+    start_button.clicked.connect(lambda: toggle_streaming())
+    reset_button.clicked.connect(lambda: reset_counts())
+    
+    # Initial visualization
+    update_state()
+    
+    # Description label
+    description = QLabel(
+        "<p>Measuring a state gives one outcome per shot with the probabilities |amplitude|². Press "
+        "<b>Start</b> to stream shots into the histogram and watch the measured frequencies (bars) "
+        "converge on the exact probabilities (markers); the error falls roughly as 1/√shots.</p>"
+        "<p>Shots are counted without storing individual results, so tens of millions of them take "
+        "well under a second.</p>"
+        "<p>With noise, each gate depolarizes and damps the qubits it touches and every readout may "
+        "flip. Shots are then drawn from the average of Monte Carlo trajectories (markers), shown "
+        "against the ideal probabilities (red).</p>"
+    )
+    description.setWordWrap(True)
+    description.setStyleSheet("color: #ECF0F1; margin: 20px 0;")
+    layout.addWidget(description)
+    
+    # Record / replay bar
+    trajectory = trajectory_panel.TrajectoryPanel(
+        "measurement", (preset_selector, qubit_control, param_slider, shots_selector, noise_control),
+        parent=meas_window)
+    layout.addWidget(trajectory)
+    
+    # Set the layout and show the window
+    meas_window.setLayout(layout)
+    meas_window.show()
+    
+    # Keep references to prevent garbage collection
+    meas_window.canvas = canvas
+    meas_window.animator = animator
+    meas_window.jobs = jobs
+    meas_window.run_shots = run_shots
+    meas_window.controls = (preset_selector, qubit_control, param_slider, shots_selector, noise_control)
+    meas_window.trajectory = trajectory
+    
+    return meas_window
+
+
+# Circuit viewer: sample sizes, wheel zoom step and the largest circuit
+# whose amplitudes are simulated (gates x 2^qubits amplitude updates)
+MAX_SAMPLE_QUBITS = 128
+MAX_SAMPLE_LAYERS = 5000
+ZOOM_STEP = 1.25
+MAX_AMPLITUDE_QUBITS = 16
+MAX_AMPLITUDE_WORK = 2 ** 27
+# Wider circuits up to this many gates run on the MPS backend at this bond dimension
+MAX_MPS_GATES = 5000
+VIEWER_MAX_BOND = 32
+# Largest circuit the Optimized view runs the pass pipeline on (about 2 s per 150k gates)
+MAX_OPTIMIZED_GATES = 250000
+# Memory for the statevector checkpoints a re-simulation resumes from
+VIEWER_CHECKPOINT_BYTES = 64 * 2 ** 20
+
+
+def draw_amplitudes(canvas, ax, result, ylim=None, hatch='///'):
+    """Replace ``ax`` with the amplitude bar chart of a simulation result, in the dark theme"""
+    ax.clear()
+    ax.set_axis_on()
+    visualize_circuit.plot_amplitudes(ax, result, hatch)
+    if ylim is not None:
+        ax.set_ylim(*ylim)
+    ax.set_facecolor('#253443')
+    for spine in ax.spines.values():
+        spine.set_color('white')
+    ax.tick_params(colors='white', labelsize=8)
+    ax.title.set_color('white')
+    ax.yaxis.label.set_color('white')
+    canvas.draw()
+
+
+def visualize_circuit_viewer():
+    """Function to browse large circuits loaded from OpenQASM files or generated samples"""
+    # Create a new window for the circuit viewer
+    circ_window = QWidget()
+    circ_window.setWindowTitle("Quantum Circuit Visualization")
+    circ_window.setGeometry(200, 200, 1100, 800)
+    circ_window.setStyleSheet("background-color: #1A2930;")
+    
+    layout = QVBoxLayout()
+    
+    # Title
+    title = QLabel("Quantum Circuit Visualization")
+    title.setFont(QFont('Arial', 16, QFont.Weight.Bold))
+    title.setStyleSheet("color: #1ABC9C; margin-bottom: 20px;")
+    title.setAlignment(Qt.AlignmentFlag.AlignCenter)
+    layout.addWidget(title)
+    
+    # Controls frame
+    controls_frame = QFrame()
+    controls_frame.setStyleSheet("background-color: #253443; border-radius: 6px; padding: 10px;")
+    controls_layout = QHBoxLayout(controls_frame)
+    
+    # Generated sample circuits
+    sample_selector = QComboBox()
+    sample_selector.addItems(["GHZ chain", "Quantum Fourier transform", "Random layers"])
+    sample_selector.setStyleSheet("""
+        QComboBox {
+            background-color: #2C3E50;
+            color: white;
+            border-radius: 4px;
+            padding: 5px;
+            min-width: 180px;
+        }
+        QComboBox QAbstractItemView {
+            background-color: #2C3E50;
+            color: white;
+            selection-background-color: #1ABC9C;
+        }
+    """)
+    
+    qubit_control = QSpinBox()
+    qubit_control.setRange(2, MAX_SAMPLE_QUBITS)
+    qubit_control.setValue(5)
+    qubit_control.setStyleSheet("background-color: #2C3E50; color: white; padding: 3px;")
+    
+    # Layers of the random sample (each is a rotation per qubit and a CX brick row)
+    layer_control = QSpinBox()
+    layer_control.setRange(1, MAX_SAMPLE_LAYERS)
+    layer_control.setValue(20)
+    layer_control.setStyleSheet(qubit_control.styleSheet())
+    
+    # The circuit as written, or after the optimizer's pass pipeline
+    circuit_selector = QComboBox()
+    circuit_selector.addItems(["Original", "Optimized"])
+    circuit_selector.setStyleSheet(sample_selector.styleSheet().replace("min-width: 180px", "min-width: 90px"))
+    
+    button_style = """
+        QPushButton {
+            background-color: #2C3E50;
+            color: white;
+            border-radius: 4px;
+            padding: 6px 15px;
+        }
+        QPushButton:hover {
+            background-color: #34495E;
+        }
+    """
+    open_button = QPushButton("Open QASM...")
+    fit_button = QPushButton("Fit")
+    for button in (open_button, fit_button):
+        button.setCursor(Qt.CursorShape.PointingHandCursor)
+        button.setStyleSheet(button_style)
+    
+    for text, widget in [("Sample:", sample_selector), ("Qubits:", qubit_control),
+                         ("Layers:", layer_control), ("Circuit:", circuit_selector)]:
+        label = QLabel(text)
+        label.setStyleSheet("color: white;")
+        controls_layout.addWidget(label)
+        controls_layout.addWidget(widget)
+    controls_layout.addStretch()
+    controls_layout.addWidget(open_button)
+    controls_layout.addWidget(fit_button)
+    
+    layout.addWidget(controls_frame)
+    
+    # Gate count, column count and what the viewport currently draws
+    status_display = QLabel()
+    status_display.setStyleSheet("color: white; font-family: monospace;")
+    layout.addWidget(status_display)
+    
+    # Circuit canvas; only its viewport is ever drawn
+    canvas = mpl_canvas.MatplotlibCanvas(width=10, height=5)
+    canvas.fig.patch.set_facecolor('#1A2930')
+    canvas.fig.subplots_adjust(left=0.08, right=0.98, top=0.97, bottom=0.1)
+    ax = canvas.fig.add_subplot(111)
+    layout.addWidget(canvas, 3)
+    
+    column_bar = QScrollBar(Qt.Orientation.Horizontal)
+    layout.addWidget(column_bar)
+    
+    # Amplitudes of small circuits, on their own canvas so panning never redraws them
+    amplitude_canvas = mpl_canvas.MatplotlibCanvas(width=10, height=2.5)
+    amplitude_canvas.fig.patch.set_facecolor('#1A2930')
+    amplitude_ax = amplitude_canvas.fig.add_subplot(111)
+    # Room for vertical basis-state labels; fixed so redraws skip a layout pass
+    amplitude_canvas.fig.subplots_adjust(left=0.08, right=0.98, top=0.85, bottom=0.35)
+    layout.addWidget(amplitude_canvas, 2)
+    
+    def sample_ops(kind, n, layers):
+        if kind == 0:
+            return [("h", [0])] + [("cx", [q, q + 1]) for q in range(n - 1)]
+        if kind == 1:
+            ops = []
+            for target in reversed(range(n)):
+                ops.append(("h", [target]))
+                ops += [("cp", [control, target], [np.pi / 2 ** (target - control)])
+                        for control in reversed(range(target))]
+            return ops + [("swap", [q, n - 1 - q]) for q in range(n // 2)]
+        rng = np.random.default_rng(layers)
+        ops = []
+        for layer in range(layers):
+            ops += [("ry", [q], [rng.uniform(0, np.pi)]) for q in range(n)]
+            ops += [("cx", [q, q + 1]) for q in range(layer % 2, n - 1, 2)]
+        return ops
+    
+    view = [None]  # CircuitView of the loaded circuit
+    source = [None]  # Path of the loaded QASM file; None for the samples
+    layouts = {}  # Optimized? -> (CircuitLayout, build time, pass report) of the loaded circuit
+    drag = {}  # Mouse position and view at the start of a pan
+    layout_status = [""]  # Gate, column and index size readout of the loaded circuit
+    state_status = [""]  # How much of the circuit the last simulation had to run
+    restored_view = [None]  # Viewport of the replayed record, kept over layouts it triggers
+    # Reloading an edited circuit resumes from the last checkpoint before the first change
+    resimulator = incremental.IncrementalSimulator(max_bytes=VIEWER_CHECKPOINT_BYTES)
+    
+    # Parsing, layout and simulation run on a worker thread
+    jobs = JobRunner(parent=circ_window)
+    
+    def build_layout(path, kind, n, layers, original, optimized, progress=None):
+        # Runs on the worker thread; ``original`` is the layout already built, if any
+        start = time.perf_counter()
+        if original is None:
+            if path is None:
+                circuit_layout = circuit_view.CircuitLayout((n, sample_ops(kind, n, layers)))
+            else:
+                program = qasm.load_qasm(path)
+                circuit_layout = circuit_view.CircuitLayout(program.circuit, program.qubit_labels)
+            original = (circuit_layout, time.perf_counter() - start, None)
+            if not optimized:
+                return original, original
+            start = time.perf_counter()
+        circuit_layout = original[0]
+        if len(circuit_layout) > MAX_OPTIMIZED_GATES:
+            raise ValueError(f"{len(circuit_layout):,} gates: too many to optimize here "
+                             f"(limit {MAX_OPTIMIZED_GATES:,})")
+        result = optimizer.optimize((circuit_layout.num_qubits, circuit_layout.ops))
+        labels = [circuit_layout.labels[q] for q in result.qubits]
+        optimized_layout = circuit_view.CircuitLayout(result.circuit, labels)
+        return original, (optimized_layout, time.perf_counter() - start, result.report)
+    
+    def simulate(circuit, backend, progress=None):
+        # Runs on the worker thread
+        if backend == "mps":
+            result = backends.run(circuit, "mps", progress=progress, max_bond=VIEWER_MAX_BOND)
+            result.likely_amplitudes(visualize_circuit.MAX_PLOTTED_STATES)  # Plotted from the cache
+            return result, ""
+        result = resimulator.run(circuit, progress=progress)
+        stats = resimulator.stats()
+        note = (f"   simulated columns {stats['resumed_at']:,}-{stats['columns']:,} "
+                f"({stats['checkpoints']} checkpoints, {stats['nbytes'] / 2 ** 20:.0f} MiB)")
+        return result, note
+    
+    def load_circuit():
+        layouts.clear()
+        show_variant()
+    
+    def show_variant():
+        # Toggling between the original and optimized circuit reuses both once built
+        optimized = circuit_selector.currentIndex() == 1
+        jobs.cancel("state")
+        if optimized in layouts:
+            jobs.cancel("layout")
+            show_layout(*layouts[optimized])
+            return
+        original = layouts.get(False)
+        jobs.submit("layout", build_layout, source[0], sample_selector.currentIndex(),
+                    qubit_control.value(), layer_control.value(), original, optimized)
+        status_display.setText("optimizing circuit..." if original is not None else "laying out circuit...")
+    
+    def show_layout(circuit_layout, elapsed, report=None):
+        if view[0] is None:
+            view[0] = circuit_view.CircuitView(ax, circuit_layout)
+        else:
+            view[0].set_layout(circuit_layout)
+        if restored_view[0] is not None:
+            # A replayed record's viewport wins over the default fit
+            view[0].set_view(*restored_view[0])
+        layout_status[0] = (f"{len(circuit_layout):,} gates  {circuit_layout.num_qubits} qubits  "
+                            f"{circuit_layout.num_columns:,} columns  index "
+                            f"{circuit_layout.nbytes / 2 ** 20:.1f} MiB  built in {elapsed * 1000:.0f} ms")
+        if report is not None:
+            layout_status[0] += "\noptimized: " + optimizer.format_report(report)
+        state_status[0] = ""
+        render()
+        
+        amplitude_ax.clear()
+        n = circuit_layout.num_qubits
+        if n <= MAX_AMPLITUDE_QUBITS and len(circuit_layout) * 2 ** n <= MAX_AMPLITUDE_WORK:
+            backend = "statevector"
+        elif n > MAX_AMPLITUDE_QUBITS and len(circuit_layout) <= MAX_MPS_GATES:
+            backend = "mps"
+        else:
+            backend = None
+        if backend is None:
+            amplitude_ax.set_axis_off()
+            amplitude_ax.text(0.5, 0.5, "Circuit too large to simulate here", ha='center',
+                              va='center', color='white', transform=amplitude_ax.transAxes)
+            amplitude_canvas.draw()
+        elif not circuit_view.is_simulable(circuit_layout):
+            amplitude_ax.set_axis_off()
+            amplitude_ax.text(0.5, 0.5, "Circuit uses gates the simulator does not know", ha='center',
+                              va='center', color='white', transform=amplitude_ax.transAxes)
+            amplitude_canvas.draw()
+        else:
+            jobs.submit("state", simulate, (n, circuit_layout.ops), backend, report_progress=True)
+    
+    def on_result(key, result):
+        if key == "layout":
+            original, shown = result
+            layouts[False] = original
+            layouts[shown[2] is not None] = shown
+            show_layout(*shown)
+        else:
+            result, state_status[0] = result
+            draw_amplitudes(amplitude_canvas, amplitude_ax, result)
+            show_status()
+    
+    def on_failed(key, message):
+        status_display.setText(message)
+        if key == "layout" and source[0] is not None:
+            # Fall back to the sample circuit
+            source[0] = None
+    
+    jobs.result.connect(on_result)
+    jobs.progress.connect(lambda key, fraction: show_status(f"   simulating... {fraction:.0%}"))
+    jobs.failed.connect(on_failed)
+    
+    def choose_file():
+        path, _ = QFileDialog.getOpenFileName(circ_window, "Open OpenQASM Circuit", "",
+                                              "OpenQASM (*.qasm *.qasm3);;All files (*)")
+        if path:
+            load_file(path)
+    
+    def load_file(path):
+        source[0] = path
+        restored_view[0] = None
+        load_circuit()
+    
+    def load_sample():
+        source[0] = None
+        layer_control.setEnabled(sample_selector.currentIndex() == 2)
+        load_circuit()
+    
+    def on_sample_control():
+        if trajectory.restoring:
+            if source[0] is not None:
+                return  # A replay keeps the open QASM file and only restores its viewport
+        else:
+            restored_view[0] = None
+        load_sample()
+    
+    def on_circuit_selector():
+        if not trajectory.restoring:
+            restored_view[0] = None
+        show_variant()
+    
+    @instrumentation.timed_update("circuit")
+    def render(preview=False):
+        current = view[0]
+        if current is None:
+            return
+        instrumentation.mark("artists")
+        # Gate labels are left out while the view is being dragged
+        current.redraw(labels=not (preview or drag))
+        sync_scrollbar()
+        canvas.draw()
+        show_status()
+    
+    def show_status(extra=""):
+        current = view[0]
+        status_display.setText(f"{layout_status[0]}   drawn: {current.drawn:,} gates ({current.mode})"
+                               f"{state_status[0]}{extra}")
+    
+    def sync_scrollbar():
+        x0, x1, _, _ = view[0].view()
+        width = int(round(x1 - x0))
+        column_bar.blockSignals(True)
+        column_bar.setRange(0, max(view[0].layout.num_columns - width, 0))
+        column_bar.setPageStep(max(width, 1))
+        column_bar.setValue(int(round(x0 + 0.5)))
+        column_bar.blockSignals(False)
+    
+    def scroll_to(value):
+        if view[0] is not None:
+            x0, _, _, _ = view[0].view()
+            view[0].pan(columns=value - 0.5 - x0)
+    
+    def pan(columns=0.0, wires=0.0):
+        """Move the view by whole columns and wires (for benchmarks and key bindings)"""
+        view[0].pan(columns, wires)
+        scheduler.request()
+    
+    def on_scroll(event):
+        if event.inaxes is not ax or view[0] is None:
+            return
+        factor = 1 / ZOOM_STEP if event.button == 'up' else ZOOM_STEP
+        # Shift + wheel zooms the wires, the plain wheel the columns
+        view[0].zoom(factor, event.xdata, event.ydata, axis='y' if event.key == 'shift' else 'x')
+        scheduler.request()
+    
+    def on_press(event):
+        if event.inaxes is ax and event.button == 1 and view[0] is not None:
+            drag.update(x=event.x, y=event.y, view=view[0].view())
+    
+    def on_motion(event):
+        if not drag:
+            return
+        x0, x1, y0, y1 = drag["view"]
+        bbox = ax.get_window_extent()
+        dx = (event.x - drag["x"]) * (x1 - x0) / bbox.width
+        # Wire 0 is at the top, so dragging up shows higher-numbered wires
+        dy = (event.y - drag["y"]) * (y1 - y0) / bbox.height
+        view[0].set_view(x0 - dx, x1 - dx, y0 + dy, y1 + dy)
+        scheduler.request()
+    
+    def on_release(event):
+        if drag:
+            drag.clear()
+            scheduler.request()  # Full render with labels
+    
+    def fit():
+        if view[0] is not None:
+            view[0].fit()
+            scheduler.request()
+    
+    # Pans, zooms and scroll bar moves are coalesced into one render per frame
+    scheduler = RenderScheduler(render, parent=circ_window)
+    scheduler.attach(column_bar)
+    canvas.mpl_connect('scroll_event', on_scroll)
+    canvas.mpl_connect('button_press_event', on_press)
+    canvas.mpl_connect('motion_notify_event', on_motion)
+    canvas.mpl_connect('button_release_event', on_release)
+    
+    # Connect controls to update functions
+    sample_selector.currentIndexChanged.connect(lambda: on_sample_control())
+    qubit_control.valueChanged.connect(lambda: on_sample_control())
+    layer_control.valueChanged.connect(lambda: on_sample_control())
+    circuit_selector.currentIndexChanged.connect(lambda: on_circuit_selector())
+    column_bar.valueChanged.connect(scroll_to)
+    open_button.clicked.connect(lambda: choose_file())
+    fit_button.clicked.connect(lambda: fit())
+    
+    # Initial visualization
+    load_sample()
+    
+    # Description label
+    description = QLabel(
+        "<p>Open an OpenQASM 2 or 3 file, or pick a generated sample. Drag to pan, use the wheel to "
+        "zoom along the circuit and Shift + wheel to zoom across the wires.</p>"
+        "<p>Gates are laid out once into columns and only the visible part is drawn: labelled gates "
+        "close up, plain boxes further out and a gate-density map for the whole circuit, so even "
+        "100,000-gate circuits pan smoothly.</p>"
+        "<p>Switch Circuit to Optimized to see the circuit after cancelling inverse gate pairs, moving "
+        "gates through the gates they commute with, fusing single-qubit gates into U gates and "
+        "dropping unused qubits. The status line lists the gates and depth each pass removed, and "
+        "the amplitudes are simulated from the circuit shown.</p>"
+        "<p>Simulated states are checkpointed along the circuit, so reopening a QASM file after "
+        "editing it only re-simulates from the last checkpoint before the first changed gate.</p>"
+    )
+    description.setWordWrap(True)
+    description.setStyleSheet("color: #ECF0F1; margin: 20px 0;")
+    layout.addWidget(description)
+    
+    # Record / replay bar: sample controls plus the viewport
+    def replay_view(record, preview):
+        if record["view"][1] > record["view"][0]:
+            # Also applied to the layout the restored controls may still be building
+            restored_view[0] = tuple(record["view"])
+            if view[0] is not None:
+                view[0].set_view(*restored_view[0])
+                render(preview)
+    
+    trajectory = trajectory_panel.TrajectoryPanel(
+        "circuit", (sample_selector, qubit_control, layer_control, circuit_selector),
+        fields=[("view", "f8", (4,))],
+        capture=lambda: {"view": view[0].view() if view[0] is not None else (0, 0, 0, 0)},
+        restore=replay_view, parent=circ_window)
+    layout.addWidget(trajectory)
+    
+    # Set the layout and show the window
+    circ_window.setLayout(layout)
+    circ_window.show()
+    
+    # Keep references to prevent garbage collection
+    circ_window.canvas = canvas
+    circ_window.scheduler = scheduler
+    circ_window.jobs = jobs
+    circ_window.load_file = load_file
+    circ_window.pan = pan
+    circ_window.view = view
+    circ_window.controls = (sample_selector, qubit_control, layer_control, circuit_selector)
+    circ_window.trajectory = trajectory
+    
+    return circ_window
+
+
+# Circuit builder: widest register (all 2^5 amplitudes fit the bar chart, so
+# edits move the bars instead of redrawing the plot), and checkpoint memory
+MAX_BUILDER_QUBITS = 5
+BUILDER_CHECKPOINT_BYTES = 16 * 2 ** 20
+
+
+def visualize_circuit_builder():
+    """Function to build a circuit by drag and drop, with its state shown live.
+
+    Returns the page widget; the main window embeds it in its content area.
+    """
+    page = QWidget()
+    page.setStyleSheet("background-color: #1A2930;")
+    
+    layout = QVBoxLayout(page)
+    
+    # Qubit count, clear button and the edit / simulation readout
+    controls_frame = QFrame()
+    controls_frame.setStyleSheet("background-color: #253443; border-radius: 6px; padding: 6px;")
+    controls_layout = QHBoxLayout(controls_frame)
+    
+    qubit_label = QLabel("Qubits:")
+    qubit_label.setStyleSheet("color: white;")
+    qubit_control = QSpinBox()
+    qubit_control.setRange(1, MAX_BUILDER_QUBITS)
+    qubit_control.setValue(3)
+    qubit_control.setStyleSheet("background-color: #2C3E50; color: white; padding: 3px;")
+    
+    clear_button = QPushButton("Clear")
+    clear_button.setCursor(Qt.CursorShape.PointingHandCursor)
+    clear_button.setStyleSheet("""
+        QPushButton {
+            background-color: #2C3E50;
+            color: white;
+            border-radius: 4px;
+            padding: 6px 15px;
+        }
+        QPushButton:hover {
+            background-color: #34495E;
+        }
+    """)
+    
+    status_display = QLabel()
+    status_display.setStyleSheet("color: white; font-family: monospace;")
+    
+    controls_layout.addWidget(qubit_label)
+    controls_layout.addWidget(qubit_control)
+    controls_layout.addWidget(clear_button)
+    controls_layout.addSpacing(20)
+    controls_layout.addWidget(status_display, 1)
+    layout.addWidget(controls_frame)
+    
+    # Gate palette: drag a tile onto a wire
+    palette = QHBoxLayout()
+    palette.setSpacing(4)
+    for name, params in circuit_builder.PALETTE:
+        palette.addWidget(circuit_builder.GateTile(name, params))
+    palette.addStretch()
+    layout.addLayout(palette)
+    
+    # Editor on a horizontally scrolling strip, starting from a GHZ circuit
+    grid = circuit_builder.CircuitGrid(qubit_control.value())
+    editor = circuit_builder.CircuitEditor(grid)
+    editor.drop_gate("h", (), 0, 0)
+    for q in range(1, grid.num_qubits):
+        editor.drop_gate("cx", (), q, q - 1)
+    scroll = QScrollArea()
+    scroll.setWidget(editor)
+    scroll.setWidgetResizable(True)
+    scroll.setStyleSheet("border: none;")
+    layout.addWidget(scroll, 2)
+    
+    # One QPainter Bloch sphere per qubit (the reduced state of each wire)
+    views_layout = QHBoxLayout()
+    views = [bloch_painter.BlochView(f"q{q}", compact=True) for q in range(MAX_BUILDER_QUBITS)]
+    for view in views:
+        views_layout.addWidget(view)
+    layout.addLayout(views_layout, 2)
+    
+    amplitude_canvas = mpl_canvas.MatplotlibCanvas(width=8, height=2.5)
+    amplitude_canvas.fig.patch.set_facecolor('#1A2930')
+    amplitude_ax = amplitude_canvas.fig.add_subplot(111)
+    amplitude_canvas.fig.subplots_adjust(left=0.08, right=0.98, top=0.85, bottom=0.3)
+    layout.addWidget(amplitude_canvas, 2)
+    # Blits the amplitude bars over the cached axes and labels (it never runs its timer)
+    animator = BlitAnimator(amplitude_canvas, [], None, name="circuit_builder")
+    plotted_qubits = [None]  # Register whose bars are on the canvas
+    
+    # Edits re-simulate from the last checkpoint before the first changed gate,
+    # on a worker thread so the editor repaints straight away
+    resimulator = incremental.IncrementalSimulator(max_bytes=BUILDER_CHECKPOINT_BYTES)
+    # One worker, so runs happen in submission order and the simulator's last
+    # run is never older than the last delivered result
+    jobs = JobRunner(workers=1, parent=page)
+    latest = [None]  # Newest simulation result, drawn once per frame
+    # First gate changed since the last delivered result: superseded jobs may
+    # never have run, or stopped at their next progress call, so each job
+    # covers every edit made since then
+    first_changed = [0]
+    readout = {"edit": "", "state": ""}
+    
+    def show_status():
+        status_display.setText(f"{len(grid):,} gates  {len(grid.columns):,} columns"
+                               f"{readout['edit']}{readout['state']}")
+    
+    def simulate(index):
+        first_changed[0] = min(first_changed[0], index)
+        jobs.submit("state", resimulator.run, (grid.num_qubits, grid.operations()), first_changed[0],
+                    report_progress=True)
+        show_status()
+    
+    def on_repainted(milliseconds):
+        readout["edit"] = f"   edit to repaint {milliseconds:.1f} ms"
+        show_status()
+    
+    def on_result(key, result):
+        stats = resimulator.stats()
+        readout["state"] = (f"   simulated columns {stats['resumed_at']:,}-{stats['columns']:,} "
+                            f"of {stats['columns']:,}")
+        first_changed[0] = len(grid)
+        latest[0] = result
+        scheduler.request()
+    
+    @instrumentation.timed_update("circuit_builder")
+    def render(preview=False):
+        result = latest[0]
+        if result is None:
+            return
+        n = result.num_qubits
+        vectors = density.reduced_bloch_vectors(result.state, n)
+        for q, view in enumerate(views):
+            view.setVisible(q < n)
+            if q < n:
+                view.set_vector(*vectors[q])
+        instrumentation.mark("amplitudes")
+        if plotted_qubits[0] == n:
+            # Same basis states: only the bar heights change
+            state = result.state
+            for bar, height in zip(animator.artists, np.concatenate([state.real, state.imag])):
+                bar.set_height(height)
+            animator.blit()
+        else:
+            animator.release()
+            # Plain bars: hatching would triple the cost of every blit
+            draw_amplitudes(amplitude_canvas, amplitude_ax, result, ylim=(-1.05, 1.05), hatch=None)
+            animator.artists = list(amplitude_ax.patches)
+            plotted_qubits[0] = n
+        show_status()
+    
+    scheduler = RenderScheduler(render, parent=page)
+    jobs.result.connect(on_result)
+    jobs.failed.connect(lambda key, message: status_display.setText(message))
+    editor.edited.connect(simulate)
+    editor.repainted.connect(on_repainted)
+    qubit_control.valueChanged.connect(editor.set_num_qubits)
+    clear_button.clicked.connect(lambda: editor.clear())
+    
+    description = QLabel(
+        "Drag gates from the palette onto the wires; two-qubit gates take the wire they are dropped "
+        "on and the one below. Drag a placed gate to move it, drag it off the circuit or double-click "
+        "it to delete it, and turn the mouse wheel over a rotation to change its angle by π/8. Only "
+        "the changed columns are repainted, and the state is re-simulated from the last checkpoint "
+        "before the edit."
+    )
+    description.setWordWrap(True)
+    description.setStyleSheet("color: #ECF0F1;")
+    layout.addWidget(description)
+    
+    simulate(0)
+    
+    # Keep references to prevent garbage collection
+    page.editor = editor
+    page.circuit_grid = grid
+    page.jobs = jobs
+    page.scheduler = scheduler
+    page.canvas = amplitude_canvas
+    page.animator = animator
+    page.views = tuple(views)
+    page.controls = (qubit_control,)
+    
+    return page
+
+
 class QuantumVisualizer(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -1067,10 +2662,22 @@ class QuantumVisualizer(QMainWindow):
         btn_interference.clicked.connect(self.show_interference)
         advanced_layout.addWidget(btn_interference)
         
+        btn_grid = StyledButton("Multi-Qubit Bloch Grid", "grid_icon.png")
+        btn_grid.clicked.connect(self.show_bloch_grid)
+        advanced_layout.addWidget(btn_grid)
+        
+        btn_measurement = StyledButton("Measurement Statistics", "measure_icon.png")
+        btn_measurement.clicked.connect(self.show_measurement)
+        advanced_layout.addWidget(btn_measurement)
+        
         btn_circuit = StyledButton("Quantum Circuit Visualization", "circuit_icon.png")
         btn_circuit.clicked.connect(self.show_circuit)
         advanced_layout.addWidget(btn_circuit)
         
+        btn_builder = StyledButton("Circuit Builder", "builder_icon.png")
+        btn_builder.clicked.connect(self.show_builder)
+        advanced_layout.addWidget(btn_builder)
+        
         # Add groups to sidebar
         sidebar_layout.addWidget(basic_group)
         sidebar_layout.addWidget(advanced_group)
@@ -1087,8 +2694,28 @@ class QuantumVisualizer(QMainWindow):
         info_label = QLabel("Version 2.0.0\nⓒ Quantum Labs 2025")
         info_label.setStyleSheet("color: #7F8C8D; font-size: 10px;")
         
+        memory_btn = QPushButton("Memory Report")
+        memory_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        memory_btn.setStyleSheet("color: #7F8C8D; font-size: 10px; text-align: left; border: none;")
+        memory_btn.clicked.connect(self.show_memory_report)
+        
+        # Opt-in per-phase timing with an fps/latency overlay on every canvas
+        self.instrument_btn = QPushButton("Instrumentation: Off")
+        self.instrument_btn.setCheckable(True)
+        self.instrument_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.instrument_btn.setStyleSheet(memory_btn.styleSheet())
+        self.instrument_btn.toggled.connect(self.set_instrumentation)
+        
+        trace_btn = QPushButton("Dump Trace...")
+        trace_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        trace_btn.setStyleSheet(memory_btn.styleSheet())
+        trace_btn.clicked.connect(self.dump_trace)
+        
         info_layout.addWidget(info_title)
         info_layout.addWidget(info_label)
+        info_layout.addWidget(memory_btn)
+        info_layout.addWidget(self.instrument_btn)
+        info_layout.addWidget(trace_btn)
         
         sidebar_layout.addWidget(info_frame)
         
@@ -1163,40 +2790,129 @@ class QuantumVisualizer(QMainWindow):
         container.setLayout(main_layout)
         self.setCentralWidget(container)
         
-        # Reference to keep visualization windows from being garbage collected
-        self.open_windows = []
+        # Owns the visualization windows: one per kind, freed when closed
+        self.windows = WindowManager(self)
+        # Circuit builder page, embedded in the content area on first use
+        self.builder = None
     
     def show_circuit(self):
-        draw_circuit()
+        self.windows.open("circuit", visualize_circuit_viewer)
+    
+    def show_builder(self):
+        if self.builder is None:
+            self.builder = visualize_circuit_builder()
+            self.content_stack.addWidget(self.builder)
+        self.content_stack.setCurrentWidget(self.builder)
     
     def show_bloch(self):
-        bloch_sphere()
+        self.windows.open("bloch", visualize_bloch)
     
     def show_quantum_states(self):
-        window = visualize_quantum_states()
-        self.open_windows.append(window)  # Keep reference
+        self.windows.open("quantum_states", visualize_quantum_states)
     
     def show_entanglement(self):
-        window = visualize_entanglement()
-        self.open_windows.append(window)  # Keep reference
+        self.windows.open("entanglement", visualize_entanglement)
     
     def show_superposition(self):
-        window = visualize_superposition()
-        self.open_windows.append(window)  # Keep reference
+        self.windows.open("superposition", visualize_superposition)
     
     def show_interference(self):
-        window = visualize_interference()
-        self.open_windows.append(window)  # Keep reference
-
+        self.windows.open("interference", visualize_interference)
+    
+    def show_bloch_grid(self):
+        self.windows.open("bloch_grid", visualize_bloch_grid)
+    
+    def show_measurement(self):
+        self.windows.open("measurement", visualize_measurement)
+    
+    def show_memory_report(self):
+        stats = unitary_cache.default_cache.stats()
+        report = (f"{self.windows.memory_report()}\n\n"
+                  f"Unitary cache: {stats['entries']} matrices, {format_bytes(stats['nbytes'])} "
+                  f"of {format_bytes(stats['max_bytes'])}\n"
+                  f"  {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%}), "
+                  f"{stats['evictions']} evictions")
+        box = QMessageBox(QMessageBox.Icon.Information, "Memory Report", f"<pre>{report}</pre>",
+                          QMessageBox.StandardButton.Ok, self)
+        limit_btn = box.addButton("Unitary Cache Limit...", QMessageBox.ButtonRole.ActionRole)
+        box.exec()
+        if box.clickedButton() is limit_btn:
+            self.set_unitary_cache_limit()
+    
+    def set_unitary_cache_limit(self):
+        cache = unitary_cache.default_cache
+        mib, ok = QInputDialog.getInt(self, "Unitary Cache Limit",
+                                      "Memory for cached gate and fused block matrices (MiB):",
+                                      max(1, cache.max_bytes // 2 ** 20), 1, 4096)
+        if ok:
+            # Evicts least recently used matrices down to the new limit
+            cache.set_max_bytes(mib * 2 ** 20)
+    
+    def set_instrumentation(self, enabled):
+        instrumentation.set_enabled(enabled)
+        self.instrument_btn.setText(f"Instrumentation: {'On' if enabled else 'Off'}")
+    
+    def dump_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Trace", "quantum_visualizer_trace.json",
+                                              "Trace files (*.json)")
+        if not path:
+            return
+        count = instrumentation.dump_trace(path)
+        for name, phases in instrumentation.summary().items():
+            timings = "  ".join(f"{phase} {mean:.1f} ms" for phase, (_, mean) in phases.items())
+            print(f"[trace] {name}: {timings}", flush=True)
+        print(f"[trace] wrote {count} events to {path}", flush=True)
+    
+    def closeEvent(self, event):
+        # Visualization windows are top-level, so close them with the main window
+        self.windows.close_all()
+        super().closeEvent(event)
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
+def run(argv=None):
+    parser = argparse.ArgumentParser(description="Quantum Visualizer")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print an import/construct timing breakdown once the window is up")
+    parser.add_argument("--prewarm", action="store_true",
+                        help="import numpy, matplotlib and qiskit in the background after start-up")
+    parser.add_argument("--instrument", action="store_true",
+                        help="start with per-phase timing and canvas overlays enabled")
+    args, qt_args = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    
+    profiler = None
+    if args.profile_startup:
+        profiler = StartupProfiler(start=_startup_begin)
+        profiler.mark("eager imports (PyQt6)", at=_startup_imports_done)
+        lazy_imports.import_callback = lambda name, seconds: print(
+            f"[startup] lazy import {name}: {seconds * 1000:.1f} ms", flush=True)
+    
+    app = QApplication(sys.argv[:1] + qt_args)
     
     # Set application-wide styles
     app.setStyle("Fusion")
+    if profiler:
+        profiler.mark("QApplication")
     
     # Create and show the main window
     window = QuantumVisualizer()
+    if profiler:
+        profiler.mark("QuantumVisualizer construction")
+    if args.instrument:
+        window.instrument_btn.setChecked(True)
     window.show()
+    if profiler:
+        profiler.mark("window.show()")
+    
+    def after_first_tick():
+        if profiler:
+            profiler.mark("first event loop tick")
+            profiler.report()
+        if args.prewarm:
+            prewarm(PREWARM_MODULES)
+    
+    QTimer.singleShot(0, after_first_tick)
     
-    sys.exit(app.exec())
\ No newline at end of file
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(run())
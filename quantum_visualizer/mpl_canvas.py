@@ -0,0 +1,20 @@
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from mpl_toolkits.mplot3d import Axes3D  # Registers the '3d' projection
+
+import instrumentation
+
+
+class MatplotlibCanvas(FigureCanvas):
+    def __init__(self, width=8, height=6, dpi=100):
+        # A bare Figure is owned by this canvas alone; plt.figure() would also
+        # register it with pyplot, which keeps it alive after the window closes
+        self.fig = Figure(figsize=(width, height), dpi=dpi)
+        super().__init__(self.fig)
+        self.setStyleSheet("background-color: transparent;")
+        instrumentation.register_canvas(self)
+
+    def draw(self):
+        # Rasterization time shows up as the "draw" phase when instrumented
+        with instrumentation.draw(self):
+            super().draw()
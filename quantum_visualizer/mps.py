@@ -0,0 +1,318 @@
+"""Matrix-product-state simulator for long, weakly entangled qubit chains.
+
+The state of n qubits is a chain of tensors A[k] of shape (χl, 2, χr), one
+per qubit (site k is qubit k), whose product over the bond indices gives the
+amplitudes. Memory is O(n χ²) instead of 2**n, so shallow or nearest-neighbour
+circuits on 50-100 qubits fit in a few MiB as long as the bond dimension χ
+stays small.
+
+Gates on non-adjacent qubits are routed next to each other with SWAPs. After
+each multi-qubit gate the touched block is split again with SVDs and every
+bond keeps at most ``max_bond`` singular values (and none whose weight is
+below ``cutoff``). The discarded weight is accumulated, so every result says
+how far truncation may have taken it from the exact state.
+"""
+import numpy as np
+
+from density import bloch_vector
+from gates import NON_UNITARY_SKIP, SWAP, circuit_operations
+from unitary_cache import default_cache
+
+DEFAULT_MAX_BOND = 64
+# Singular values whose squared weight is below this fraction are always dropped
+DEFAULT_CUTOFF = 1e-12
+# Largest MPS contracted into a dense statevector
+MAX_DENSE_QUBITS = 24
+# Shots sampled together; memory is SAMPLE_CHUNK * χ amplitudes
+SAMPLE_CHUNK = 4096
+
+
+class MatrixProductState:
+    """Chain of site tensors with a tracked orthogonality center.
+
+    Tensors left of ``center`` are left-orthonormal and those right of it
+    right-orthonormal, so the norm and every local quantity live on the
+    center tensor. Gates move the center to where they act with QR sweeps.
+    Tensors are replaced, never modified in place, so ``copy`` is cheap.
+    """
+
+    def __init__(self, num_qubits, max_bond=DEFAULT_MAX_BOND, cutoff=DEFAULT_CUTOFF,
+                 dtype=np.complex128):
+        site = np.zeros((1, 2, 1), dtype=dtype)
+        site[0, 0, 0] = 1
+        self.num_qubits = num_qubits
+        self.tensors = [site] * num_qubits
+        self.max_bond = max_bond
+        self.cutoff = cutoff
+        self.center = 0
+        # Sum of the discarded weights and product of the kept ones
+        self.truncation_error = 0.0
+        self.fidelity = 1.0
+        self.truncations = 0
+
+    def copy(self):
+        other = object.__new__(MatrixProductState)
+        other.__dict__.update(self.__dict__)
+        other.tensors = list(self.tensors)
+        return other
+
+    @property
+    def bond_dimensions(self):
+        return [tensor.shape[2] for tensor in self.tensors[:-1]]
+
+    @property
+    def nbytes(self):
+        return sum(tensor.nbytes for tensor in self.tensors)
+
+    def move_center(self, site):
+        """QR-sweep the orthogonality center to ``site``"""
+        tensors = self.tensors
+        while self.center < site:
+            c = self.center
+            left, _, right = tensors[c].shape
+            q, r = np.linalg.qr(tensors[c].reshape(left * 2, right))
+            tensors[c] = q.reshape(left, 2, -1)
+            tensors[c + 1] = np.tensordot(r, tensors[c + 1], axes=(1, 0))
+            self.center += 1
+        while self.center > site:
+            c = self.center
+            left, _, right = tensors[c].shape
+            q, r = np.linalg.qr(tensors[c].reshape(left, 2 * right).T)
+            tensors[c] = q.T.reshape(-1, 2, right)
+            tensors[c - 1] = np.tensordot(tensors[c - 1], r.T, axes=(2, 0))
+            self.center -= 1
+
+    def apply(self, matrix, qubits):
+        """Apply a k-qubit gate (Qiskit ordering: ``qubits[0]`` is the lowest bit)"""
+        if len(qubits) == 1:
+            q = qubits[0]
+            self.tensors[q] = np.einsum('ij,ajb->aib', matrix, self.tensors[q])
+            return
+
+        sites = sorted(qubits)
+        start = sites[0]
+        # Bring the gate's qubits next to each other, apply, then swap back
+        swaps = []
+        for i, site in enumerate(sites[1:], 1):
+            for s in range(site, start + i, -1):
+                self._apply_block(SWAP, s - 1, [0, 1])
+                swaps.append(s - 1)
+        self._apply_block(matrix, start, [sites.index(q) for q in qubits])
+        for s in reversed(swaps):
+            self._apply_block(SWAP, s, [0, 1])
+
+    def _apply_block(self, matrix, start, positions):
+        """Apply a gate to sites start..start+k-1; gate qubit j sits at ``start + positions[j]``"""
+        k = len(positions)
+        self.move_center(start)
+        theta = self.tensors[start]
+        for i in range(1, k):
+            theta = np.tensordot(theta, self.tensors[start + i], axes=(-1, 0))
+        # Gate tensor axis a is qubit k-1-a, outputs first: contract its inputs
+        gate = np.asarray(matrix, dtype=theta.dtype).reshape((2,) * (2 * k))
+        theta = np.tensordot(gate, theta, axes=([2 * k - 1 - j for j in range(k)],
+                                                [1 + positions[j] for j in range(k)]))
+        # Now (out_{k-1}, ..., out_0, left, right): back to (left, site_0, ..., site_{k-1}, right)
+        order = [k] + [k - 1 - positions.index(i) for i in range(k)] + [k + 1]
+        self._split(theta.transpose(order), start, k)
+
+    def _split(self, theta, start, k):
+        """Split a (left, 2, ..., 2, right) block into k sites with truncated SVDs"""
+        for i in range(k - 1):
+            left = theta.shape[0]
+            u, s, vh = np.linalg.svd(theta.reshape(left * 2, -1), full_matrices=False)
+            keep = self._truncate(s)
+            self.tensors[start + i] = u[:, :keep].reshape(left, 2, keep)
+            theta = (s[:keep, None] * vh[:keep]).reshape((keep,) + theta.shape[2:])
+        self.tensors[start + k - 1] = theta
+        self.center = start + k - 1
+
+    def _truncate(self, s):
+        """Number of singular values to keep; renormalizes ``s`` in place"""
+        weights = s ** 2
+        total = weights.sum()
+        keep = max(1, min(self.max_bond, int(np.count_nonzero(weights > self.cutoff * total))))
+        discarded = weights[keep:].sum() / total if total > 0 else 0.0
+        # Weight below the cutoff is round-off (an exact state leaves ~1e-33),
+        # dropped without counting as a truncation
+        if discarded > self.cutoff:
+            self.truncation_error += discarded
+            self.fidelity *= 1 - discarded
+            self.truncations += 1
+            s[:keep] *= np.sqrt(total / weights[:keep].sum())
+        return keep
+
+    def profiles(self):
+        """Single-qubit density matrices (n, 2, 2) and bond entropies in bits (n-1,).
+
+        One sweep of the center from left to right on a copy: at each site
+        the center tensor gives the qubit's reduced density matrix, and its
+        singular values across the right bond are the Schmidt coefficients.
+        """
+        mps = self.copy()
+        mps.move_center(0)
+        n = self.num_qubits
+        rhos = np.empty((n, 2, 2), dtype=complex)
+        entropies = np.zeros(max(n - 1, 0))
+        for k in range(n):
+            mps.move_center(k)
+            tensor = mps.tensors[k]
+            rho = np.einsum('aib,ajb->ij', tensor, tensor.conj())
+            rhos[k] = rho / np.trace(rho).real
+            if k < n - 1:
+                left, _, right = tensor.shape
+                s = np.linalg.svd(tensor.reshape(left * 2, right), compute_uv=False)
+                p = s ** 2 / np.sum(s ** 2)
+                p = p[p > 1e-12]
+                entropies[k] = -np.sum(p * np.log2(p))
+        return rhos, entropies
+
+    def amplitude(self, bits):
+        """Amplitude of the basis state with qubit q in ``bits[q]``"""
+        vector = np.ones(1, dtype=self.tensors[0].dtype)
+        for tensor, bit in zip(self.tensors, bits):
+            vector = vector @ tensor[:, bit, :]
+        return vector[0]
+
+    def sample(self, shots, rng):
+        """(shots, n) array of 0/1 outcomes for every qubit, drawn site by site"""
+        mps = self.copy()
+        mps.move_center(0)
+        n = self.num_qubits
+        samples = np.empty((shots, n), dtype=np.uint8)
+        for start in range(0, shots, SAMPLE_CHUNK):
+            count = min(SAMPLE_CHUNK, shots - start)
+            # Left environment of each shot; sites to the right are right-orthonormal,
+            # so the marginal of the next qubit is just the norm of each branch
+            env = np.ones((count, 1), dtype=mps.tensors[0].dtype)
+            for q, tensor in enumerate(mps.tensors):
+                v0 = env @ tensor[:, 0, :]
+                v1 = env @ tensor[:, 1, :]
+                p0 = np.sum(np.abs(v0) ** 2, axis=1)
+                p1 = np.sum(np.abs(v1) ** 2, axis=1)
+                ones = rng.random(count) * (p0 + p1) >= p0
+                env = np.where(ones[:, None], v1, v0)
+                env /= np.sqrt(np.where(ones, p1, p0))[:, None]
+                samples[start:start + count, q] = ones
+        return samples
+
+    def to_statevector(self):
+        """Dense amplitudes in the statevector simulator's ordering (qubit q is bit q)"""
+        if self.num_qubits > MAX_DENSE_QUBITS:
+            raise ValueError(f"{self.num_qubits} qubits is too many for a dense statevector "
+                             f"(at most {MAX_DENSE_QUBITS})")
+        psi = np.ones((1,), dtype=self.tensors[0].dtype)
+        for tensor in self.tensors:
+            psi = np.tensordot(psi, tensor, axes=(-1, 0))
+        # Axes are (qubit 0, ..., qubit n-1, 1); the flat index has qubit n-1 first
+        return np.ascontiguousarray(psi[..., 0].transpose()).reshape(-1)
+
+
+class MPSResult:
+    def __init__(self, mps, measured_qubits=()):
+        self.mps = mps
+        self.num_qubits = mps.num_qubits
+        self.measured_qubits = tuple(measured_qubits)
+        self._profiles = None
+        self._likely = {}
+
+    def _profile(self):
+        if self._profiles is None:
+            self._profiles = self.mps.profiles()
+        return self._profiles
+
+    def bloch_vectors(self):
+        """(n, 3) array of single-qubit reduced Bloch vectors"""
+        rhos, _ = self._profile()
+        return np.array([bloch_vector(rho) for rho in rhos]).reshape(self.num_qubits, 3)
+
+    def entanglement_entropies(self):
+        """Entropy in bits between qubits 0..k and k+1..n-1, for each bond k"""
+        return self._profile()[1]
+
+    def amplitude(self, bitstring):
+        """Amplitude of a basis state given as a bitstring, qubit 0 rightmost"""
+        return self.mps.amplitude([int(bit) for bit in reversed(bitstring)])
+
+    def likely_amplitudes(self, count, shots=4096, seed=None):
+        """Exact amplitudes of the ``count`` most frequently sampled basis states.
+
+        Returns (bitstrings, amplitudes) in ascending basis order. Listing
+        all 2**n amplitudes is out of the question for a long chain, but the
+        states that carry the weight are the ones sampling finds. Results are
+        cached, so a worker thread can compute them before they are plotted.
+        """
+        key = (count, shots, seed)
+        if key not in self._likely:
+            samples = self.mps.sample(shots, np.random.default_rng(seed))
+            rows, frequencies = np.unique(samples, axis=0, return_counts=True)
+            rows = rows[np.argsort(frequencies, kind="stable")[::-1][:count]]
+            bitstrings = sorted("".join(map(str, row[::-1])) for row in rows)
+            self._likely[key] = bitstrings, np.array([self.amplitude(b) for b in bitstrings])
+        return self._likely[key]
+
+    def to_statevector(self):
+        return self.mps.to_statevector()
+
+    def sample(self, shots, seed=None):
+        """(shots, len(measured_qubits)) array of 0/1 outcomes; all qubits if none were measured"""
+        samples = self.mps.sample(shots, np.random.default_rng(seed))
+        if self.measured_qubits:
+            samples = samples[:, list(self.measured_qubits)]
+        return samples
+
+    def counts(self, shots, seed=None):
+        """Measurement counts keyed by bitstring, qubit 0 rightmost"""
+        qubits = sorted(set(self.measured_qubits or range(self.num_qubits)))
+        samples = self.mps.sample(shots, np.random.default_rng(seed))[:, qubits[::-1]]
+        rows, frequencies = np.unique(samples, axis=0, return_counts=True)
+        return {"".join(map(str, row)): int(count) for row, count in zip(rows, frequencies)}
+
+    def report(self):
+        """Bond dimensions, truncation and memory, for status lines"""
+        bonds = self.mps.bond_dimensions
+        return {
+            "max_bond": max(bonds, default=1),
+            "bond_limit": self.mps.max_bond,
+            "truncation_error": float(self.mps.truncation_error),
+            "fidelity": float(self.mps.fidelity),
+            "truncations": self.mps.truncations,
+            "nbytes": self.mps.nbytes,
+            "dense_nbytes": 2 ** self.num_qubits * self.mps.tensors[0].itemsize,
+        }
+
+
+class MPSSimulator:
+    """Matrix-product-state simulator; memory and time grow with the bond dimension, not 2**n.
+
+    Exact while no bond needs more than ``max_bond`` singular values. Past
+    that, each split keeps the largest ``max_bond`` and the result reports
+    the discarded weight. Measurements and barriers are skipped, so ``run``
+    returns the pre-measurement state like the statevector simulator.
+    """
+
+    def __init__(self, max_bond=DEFAULT_MAX_BOND, cutoff=DEFAULT_CUTOFF, dtype=np.complex128):
+        self.max_bond = max_bond
+        self.cutoff = cutoff
+        self.dtype = dtype
+
+    def run(self, circuit, progress=None):
+        """Simulate a circuit; ``progress(fraction)`` is called about 100 times if given"""
+        num_qubits, ops = circuit_operations(circuit)
+        mps = MatrixProductState(num_qubits, self.max_bond, self.cutoff, self.dtype)
+
+        measured = []
+        report_every = max(1, len(ops) // 100)
+        for i, op in enumerate(ops):
+            if progress is not None and i % report_every == 0:
+                progress(i / len(ops))
+            if op.name == "measure":
+                measured.extend(op.qubits)
+                continue
+            if op.name in NON_UNITARY_SKIP:
+                continue
+            if op.name == "reset":
+                raise ValueError("reset is not supported by the MPS simulator")
+            mps.apply(default_cache.operation(op, self.dtype), op.qubits)
+
+        return MPSResult(mps, measured)
@@ -0,0 +1,310 @@
+"""Noisy circuit simulation by Monte Carlo quantum trajectories.
+
+Instead of evolving a 4**n density matrix, each trajectory evolves a pure
+2**n statevector in which every noise channel is replaced by one randomly
+chosen Kraus operator (a Pauli error for depolarizing noise, a decay or a
+renormalized no-decay step for amplitude damping). The density matrix is the
+average over trajectories, so everything linear in it, such as Bloch vectors
+and outcome probabilities, is estimated by averaging those of the pure
+trajectory states, with an error that falls as 1/sqrt(trajectories).
+
+Trajectories are independent, so they are split into chunks with their own
+seeds and run in a process pool; each chunk returns only sums, and the
+results are the same whatever the number of workers. Within a chunk a batch
+of statevectors is advanced together, so every gate is one NumPy call for
+the whole batch. Readout error acts on the classical outcomes and is
+applied exactly to the averaged distribution.
+"""
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from density import reduced_bloch_vectors
+from gates import NON_UNITARY_SKIP, X, Y, Z, circuit_operations
+from sampling import ShotSampler, marginal_probabilities
+from simulator import apply_gate
+from unitary_cache import default_cache
+
+DEFAULT_TRAJECTORIES = 1000
+# Amplitudes held per batch of trajectories (64 MiB at complex128)
+MAX_BATCH_AMPLITUDES = 2 ** 22
+# Trajectories per seeded chunk: at least CHUNK_TRAJECTORIES, more for small
+# registers so a chunk holds about CHUNK_AMPLITUDES. Chunks do not depend on the
+# worker count, so neither do results; larger chunks share more noise-free
+# branches (see _Branches) and pay less per-call overhead
+CHUNK_TRAJECTORIES = 64
+CHUNK_AMPLITUDES = 2 ** 16
+
+_PAULIS = (X, Y, Z)
+
+
+class NoiseModel(namedtuple("NoiseModel", ["depolarizing", "amplitude_damping", "readout_error"],
+                            defaults=(0.0, 0.0, 0.0))):
+    """Error probabilities per gate and qubit, plus a symmetric readout bit flip.
+
+    After every gate each qubit it acts on is depolarized with probability
+    ``depolarizing`` (X, Y or Z, equally likely) and then decays towards
+    |0⟩ with probability ``amplitude_damping``. Each measured bit is read
+    out flipped with probability ``readout_error``.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, depolarizing=0.0, amplitude_damping=0.0, readout_error=0.0):
+        for name, value in zip(cls._fields, (depolarizing, amplitude_damping, readout_error)):
+            if not 0 <= value <= 1:
+                raise ValueError(f"{name} must be a probability, got {value}")
+        return super().__new__(cls, float(depolarizing), float(amplitude_damping), float(readout_error))
+
+    @property
+    def noiseless(self):
+        return not any(self)
+
+
+class _Branches:
+    """Distinct trajectory states with the number of trajectories that share each.
+
+    Trajectories only differ after a noise event picks a different Kraus
+    operator, so instead of evolving every trajectory they start as one
+    state with a count, and at each channel the count of every state is
+    split (multinomially) between the outcomes. A branch is created only
+    for outcomes that some trajectory actually took. Statistically this is
+    the same as running the trajectories one by one, but with weak noise
+    most of them share a state for most of the circuit.
+
+    New branches go into a new block rather than being copied onto the
+    existing states; blocks are merged once there are MAX_BLOCKS of them.
+    Each block is [states (m, 2**n), counts (m,), squared norms (m,)]:
+    states are left unnormalized.
+    """
+
+    MAX_BLOCKS = 4
+
+    def __init__(self, num_qubits, count):
+        self.num_qubits = num_qubits
+        states = np.zeros((1, 2 ** num_qubits), dtype=complex)
+        states[0, 0] = 1
+        self.blocks = [[states, np.array([count]), np.ones(1)]]
+
+    def apply(self, matrix, qubits):
+        for block in self.blocks:
+            block[0] = apply_gate(block[0], matrix, qubits, self.num_qubits)
+
+    def _add(self, new):
+        """Add blocks of new branches; merge, dropping branches no trajectory is left in"""
+        self.blocks.extend(new)
+        if len(self.blocks) > self.MAX_BLOCKS:
+            merged = [np.concatenate(parts) for parts in zip(*self.blocks)]
+            keep = merged[1] > 0
+            self.blocks = [[part[keep] for part in merged]]
+
+    def depolarize(self, q, p, rng):
+        """Each trajectory gets X, Y or Z on qubit ``q`` with probability p/3 each"""
+        new = []
+        for block in self.blocks:
+            states, counts, norms = block
+            splits = rng.multinomial(counts, [1 - p, p / 3, p / 3, p / 3])
+            for pauli, matrix in enumerate(_PAULIS, 1):
+                rows = np.flatnonzero(splits[:, pauli])
+                if len(rows):
+                    new.append([apply_gate(states[rows], matrix, [q], self.num_qubits),
+                                splits[rows, pauli], norms[rows]])
+            block[1] = splits[:, 0]
+        self._add(new)
+
+    def amplitude_damp(self, q, gamma, rng):
+        """Each trajectory decays qubit ``q`` to |0⟩ with probability gamma * P(q = 1)"""
+        new = []
+        for block in self.blocks:
+            states, counts, norms = block
+            view = states.reshape(len(states), 2 ** (self.num_qubits - 1 - q), 2, 2 ** q)
+            ones = view[:, :, 1, :]
+            p1 = np.einsum('abc,abc->a', ones.real, ones.real) + np.einsum('abc,abc->a', ones.imag, ones.imag)
+            jumps = rng.binomial(counts, np.clip(gamma * p1 / norms, 0, 1))
+            rows = np.flatnonzero(jumps)
+            if len(rows):
+                # K1 = sqrt(γ)|0⟩⟨1|: the |1⟩ half moves to |0⟩
+                decayed = np.zeros((len(rows),) + view.shape[1:], dtype=complex)
+                decayed[:, :, 0, :] = view[rows, :, 1, :]
+                new.append([decayed.reshape(len(rows), -1), jumps[rows], p1[rows]])
+            # K0 = |0⟩⟨0| + sqrt(1-γ)|1⟩⟨1| for the trajectories that did not decay
+            ones *= np.sqrt(1 - gamma)
+            block[1] = counts - jumps
+            block[2] = norms - gamma * p1
+            left = block[1] > 0
+            if not left.all():
+                # A branch every trajectory decayed out of can have a zero norm
+                block[:] = [part[left] for part in block]
+        self.blocks = [block for block in self.blocks if len(block[1])]
+        self._add(new)
+
+    def totals(self):
+        """Count-weighted sums of the Bloch vectors and outcome probabilities of all branches"""
+        bloch = np.zeros((self.num_qubits, 3))
+        probabilities = np.zeros(2 ** self.num_qubits)
+        for states, counts, norms in self.blocks:
+            # Branches no trajectory is left in may not have a state to normalize
+            taken = counts > 0
+            states, counts, norms = states[taken], counts[taken], norms[taken]
+            states = states / np.sqrt(norms)[:, None]
+            weights = counts.astype(float)
+            bloch += np.tensordot(weights, reduced_bloch_vectors(states, self.num_qubits), axes=1)
+            probabilities += weights @ (np.abs(states) ** 2)
+        return bloch, probabilities
+
+
+def run_trajectories(circuit, noise, trajectories, seed=None):
+    """Sums over ``trajectories`` noisy runs: (Bloch vectors (n, 3), probabilities (2**n,)).
+
+    Runs in a pool worker, so it takes and returns only picklable values.
+    """
+    num_qubits, ops = circuit_operations(circuit)
+    rng = np.random.default_rng(seed)
+    # At most one state per trajectory, so this bounds the memory of a batch
+    batch = max(1, min(trajectories, MAX_BATCH_AMPLITUDES >> num_qubits))
+    bloch_sum = np.zeros((num_qubits, 3))
+    probability_sum = np.zeros(2 ** num_qubits)
+    matrices = [None if op.name in NON_UNITARY_SKIP else default_cache.operation(op)
+                for op in ops]
+
+    for start in range(0, trajectories, batch):
+        branches = _Branches(num_qubits, min(batch, trajectories - start))
+        for op, matrix in zip(ops, matrices):
+            if matrix is None:
+                continue
+            branches.apply(matrix, op.qubits)
+            for q in op.qubits:
+                if noise.depolarizing:
+                    branches.depolarize(q, noise.depolarizing, rng)
+                if noise.amplitude_damping:
+                    branches.amplitude_damp(q, noise.amplitude_damping, rng)
+        bloch, probabilities = branches.totals()
+        bloch_sum += bloch
+        probability_sum += probabilities
+    return bloch_sum, probability_sum
+
+
+def apply_readout_error(probabilities, num_bits, error):
+    """Outcome distribution after flipping each bit independently with probability ``error``"""
+    tensor = np.asarray(probabilities, dtype=float).reshape((2,) * num_bits)
+    for axis in range(num_bits):
+        tensor = (1 - error) * tensor + error * np.flip(tensor, axis=axis)
+    return tensor.reshape(-1)
+
+
+_pools = {}
+
+
+def _pool(workers):
+    """Process pool shared by every simulation with this many workers"""
+    pool = _pools.get(workers)
+    if pool is None:
+        # Started from JobRunner threads of a Qt process, which forking would
+        # copy with other threads' locks held
+        pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+    return pool
+
+
+class NoisyResult:
+    def __init__(self, num_qubits, noise, trajectories, bloch_sum, probability_sum, measured_qubits=()):
+        self.num_qubits = num_qubits
+        self.noise = noise
+        self.trajectories = trajectories
+        self.measured_qubits = tuple(measured_qubits)
+        self._bloch = bloch_sum / trajectories
+        self._state_probabilities = probability_sum / trajectories
+
+    def bloch_vectors(self):
+        """(n, 3) array of trajectory-averaged Bloch vectors"""
+        return self._bloch
+
+    def probabilities(self):
+        """Measured outcome distribution, readout error included.
+
+        Bit b of the index is the b-th lowest measured qubit (all qubits if
+        none were measured), so bitstrings read as in ``counts``.
+        """
+        qubits = sorted(set(self.measured_qubits or range(self.num_qubits)))
+        probs = marginal_probabilities(self._state_probabilities, qubits, self.num_qubits)
+        if self.noise.readout_error:
+            probs = apply_readout_error(probs, len(qubits), self.noise.readout_error)
+        return probs
+
+    def sample(self, shots, seed=None):
+        """(shots, len(measured_qubits)) array of 0/1 outcomes; all qubits if none were measured"""
+        qubits = sorted(set(self.measured_qubits or range(self.num_qubits)))
+        indices = ShotSampler(self.probabilities(), seed).sample(shots)
+        bits = ((indices[:, None] >> np.arange(len(qubits))[None, :]) & 1).astype(np.uint8)
+        if self.measured_qubits:
+            # Back to the order the qubits were measured in
+            bits = bits[:, [qubits.index(q) for q in self.measured_qubits]]
+        return bits
+
+    def counts(self, shots, seed=None):
+        """Measurement counts keyed by bitstring, qubit 0 rightmost"""
+        probs = self.probabilities()
+        sampler = ShotSampler(probs, seed)
+        sampler.draw(shots)
+        return sampler.counts_dict(int(np.log2(len(probs))))
+
+
+class TrajectorySimulator:
+    """Noisy statevector simulation averaged over Monte Carlo trajectories.
+
+    Memory per worker is one batch of statevectors (MAX_BATCH_AMPLITUDES
+    amplitudes at most, and at least one state), never a 4**n density
+    matrix. With ``workers`` > 1 (default: one per CPU) chunks of
+    trajectories run in a process pool. ``seed`` makes results
+    reproducible for any worker count.
+    """
+
+    def __init__(self, noise=NoiseModel(), trajectories=DEFAULT_TRAJECTORIES, workers=None, seed=None):
+        self.noise = noise
+        self.trajectories = trajectories
+        self.workers = workers
+        self.seed = seed
+
+    def run(self, circuit, progress=None):
+        """Simulate a circuit; ``progress(fraction)`` is called as chunks finish and may raise to abort"""
+        num_qubits, ops = circuit_operations(circuit)
+        for op in ops:
+            if op.name == "reset":
+                raise ValueError("reset is not supported by the trajectory simulator")
+        measured = [q for op in ops if op.name == "measure" for q in op.qubits]
+        circuit = (num_qubits, ops)
+
+        workers = self.workers or os.cpu_count() or 1
+        chunk = max(CHUNK_TRAJECTORIES, CHUNK_AMPLITUDES >> num_qubits)
+        chunks = -(-self.trajectories // chunk)
+        sizes = [len(part) for part in np.array_split(np.arange(self.trajectories), chunks)]
+        seeds = np.random.SeedSequence(self.seed).spawn(chunks)
+
+        bloch_sum = np.zeros((num_qubits, 3))
+        probability_sum = np.zeros(2 ** num_qubits)
+        if workers == 1:
+            for done, (size, seed) in enumerate(zip(sizes, seeds)):
+                if progress is not None:
+                    progress(done / chunks)
+                bloch, probabilities = run_trajectories(circuit, self.noise, size, seed)
+                bloch_sum += bloch
+                probability_sum += probabilities
+        else:
+            futures = [_pool(workers).submit(run_trajectories, circuit, self.noise, size, seed)
+                       for size, seed in zip(sizes, seeds)]
+            try:
+                for done, future in enumerate(as_completed(futures)):
+                    bloch, probabilities = future.result()
+                    bloch_sum += bloch
+                    probability_sum += probabilities
+                    if progress is not None:
+                        progress((done + 1) / chunks)
+            finally:
+                # Superseded or failed: drop the chunks that have not started
+                for future in futures:
+                    future.cancel()
+
+        return NoisyResult(num_qubits, self.noise, self.trajectories, bloch_sum, probability_sum, measured)
@@ -0,0 +1,253 @@
+"""Optimization passes over circuits in the simulators' ``(num_qubits, [Operation, ...])`` format.
+
+Every pass returns an equivalent circuit, exactly and including global
+phase, so the optimized circuit shows the same amplitudes as the original:
+
+- ``commute`` moves single-qubit gates back past multi-qubit gates they
+  commute with: phase gates past controls and diagonal gates, X rotations
+  past CX targets. That brings them next to gates they can cancel or fuse
+  with, e.g. ``CX, Rz(control), CX`` becomes ``Rz, CX, CX``.
+- ``cancel`` drops identity gates and adjacent pairs whose product is the
+  identity (H H, CX CX, S Sdg, Rz(a) Rz(-a), ...). A removal exposes the
+  gates on either side, so ``H X X H`` disappears completely.
+- ``fuse`` multiplies each run of single-qubit gates on a wire into one
+  ``u`` gate that carries the exact product matrix. A product equal to a
+  named gate keeps that name, and runs of Clifford gates are left as they
+  are, so Clifford circuits stay on the stabilizer backend.
+- ``dead_qubits`` drops wires that no gate touches and renumbers the rest.
+
+Measurements, resets, barriers and gates without a known matrix are never
+moved, merged or moved past. ``optimize`` runs a pipeline of passes and
+reports the gate count and depth after each one.
+"""
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from gates import CONTROLS, FIXED_GATES, NON_UNITARY_SKIP, PARAMETRIC_GATES, Operation, circuit_operations
+from stabilizer import is_clifford
+
+ATOL = 1e-9
+
+# Single-qubit gates that commute with Z (diagonal) or with X
+Z_AXIS_GATES = {"z", "s", "sdg", "t", "tdg", "rz", "p", "u1"}
+X_AXIS_GATES = {"x", "rx", "sx", "sxdg"}
+# Multi-qubit gates that are diagonal in the computational basis
+DIAGONAL_GATES = {"cz", "ccz", "cp", "cu1", "crz", "rzz"}
+# Instructions with no effect on the state, ignored by ``dead_qubits`` (``cancel``
+# drops only the identities; barriers and delays stay in the circuit)
+IDLE = {"barrier", "delay", "id", "i"}
+# Named single-qubit gates a fused product can collapse to ("id" is dropped)
+_NAMED_1Q = [name for name, matrix in FIXED_GATES.items() if matrix.shape == (2, 2)]
+_NAMED_1Q_MATRICES = np.stack([FIXED_GATES[name] for name in _NAMED_1Q])
+
+PassReport = namedtuple("PassReport", ["name", "gates", "depth", "seconds"])
+# ``qubits[i]`` is the original index of wire i of ``circuit``
+OptimizedCircuit = namedtuple("OptimizedCircuit", ["circuit", "qubits", "report"])
+
+
+def _matrix(op):
+    """Unitary of an operation, or None for measurements, barriers and unknown gates"""
+    if op.matrix is not None:
+        return op.matrix
+    if op.name in FIXED_GATES:
+        return FIXED_GATES[op.name]
+    if op.name in PARAMETRIC_GATES:
+        return PARAMETRIC_GATES[op.name](*op.params)
+    return None
+
+
+def _is_unitary(op):
+    return op.matrix is not None or op.name in FIXED_GATES or op.name in PARAMETRIC_GATES
+
+
+def gate_count(circuit):
+    _, ops = circuit
+    return sum(op.name != "barrier" for op in ops)
+
+
+def depth(circuit):
+    """Longest chain of gates sharing a wire (barriers do not count)"""
+    num_qubits, ops = circuit
+    levels = [0] * num_qubits
+    for op in ops:
+        if op.name == "barrier" or not op.qubits:
+            continue
+        level = 1 + max(levels[q] for q in op.qubits)
+        for q in op.qubits:
+            levels[q] = level
+    return max(levels, default=0)
+
+
+def _commutes_on(op, qubit, axis):
+    # Whether a single-qubit gate about ``axis`` on ``qubit`` commutes with multi-qubit ``op``
+    if len(op.qubits) < 2:
+        return False
+    if axis == "z":
+        return op.name in DIAGONAL_GATES or qubit in op.qubits[:CONTROLS.get(op.name, 0)]
+    return op.name in ("cx", "ccx") and qubit == op.qubits[-1]
+
+
+def commute_gates(circuit):
+    """Move single-qubit gates as early as commutation with multi-qubit gates allows"""
+    num_qubits, ops = circuit_operations(circuit)
+    # Gates get sort keys: (i,) in place, or the key of the gate they now
+    # follow extended by their own index; a stable sort then emits the order
+    keys = [None] * len(ops)
+    wires = [[] for _ in range(num_qubits)]  # Indices on each wire, in the new order
+    for j, op in enumerate(ops):
+        key = (j,)
+        axis = "z" if op.name in Z_AXIS_GATES else "x" if op.name in X_AXIS_GATES else None
+        if len(op.qubits) == 1 and axis is not None:
+            wire = wires[op.qubits[0]]
+            position = len(wire)
+            while position and _commutes_on(ops[wire[position - 1]], op.qubits[0], axis):
+                position -= 1
+            if position < len(wire):
+                key = (keys[wire[position - 1]] if position else (-1,)) + (j,)
+            wire.insert(position, j)
+        else:
+            for q in op.qubits:
+                wires[q].append(j)
+        keys[j] = key
+    order = sorted(range(len(ops)), key=keys.__getitem__)
+    return num_qubits, [ops[i] for i in order]
+
+
+def _is_inverse(first, second, atol=ATOL):
+    if first.qubits != second.qubits:
+        return False
+    a, b = _matrix(first), _matrix(second)
+    if a is None or b is None or a.shape != b.shape:
+        return False
+    return np.allclose(b @ a, np.eye(len(a)), atol=atol)
+
+
+def cancel_inverses(circuit, atol=ATOL):
+    """Remove identity gates and adjacent gate pairs that multiply to the identity"""
+    num_qubits, ops = circuit_operations(circuit)
+    kept = [True] * len(ops)
+    wires = [[] for _ in range(num_qubits)]  # Surviving gates on each wire
+    for j, op in enumerate(ops):
+        if op.name in ("id", "i"):
+            kept[j] = False
+            continue
+        previous = {wires[q][-1] if wires[q] else None for q in op.qubits}
+        if len(previous) == 1:
+            i = previous.pop()
+            if i is not None and _is_inverse(ops[i], op, atol):
+                kept[i] = kept[j] = False
+                for q in op.qubits:
+                    wires[q].pop()
+                continue
+        for q in op.qubits:
+            wires[q].append(j)
+    return num_qubits, [op for op, keep in zip(ops, kept) if keep]
+
+
+def _wrap(angle):
+    return float(np.angle(np.exp(1j * angle)))
+
+
+def u_angles(matrix, atol=ATOL):
+    """(theta, phi, lam) with ``matrix`` = e^(i·alpha) U(theta, phi, lam) for some alpha"""
+    (m00, m01), (m10, m11) = matrix
+    theta = 2 * np.arctan2(abs(m10), abs(m00))
+    alpha = np.angle(m00) if abs(m00) > atol else np.angle(m10)
+    phi = np.angle(m10) - alpha if abs(m00) > atol and abs(m10) > atol else 0.0
+    lam = np.angle(-m01) - alpha if abs(m01) > atol else np.angle(m11) - alpha - phi
+    return float(theta), _wrap(phi), _wrap(lam)
+
+
+def _fuse(run, qubit, atol):
+    if len(run) == 1:
+        return run
+    product = np.eye(2, dtype=complex)
+    for op in run:
+        product = _matrix(op) @ product
+    matches = np.flatnonzero(np.abs(_NAMED_1Q_MATRICES - product).max(axis=(1, 2)) <= atol)
+    if len(matches):
+        name = _NAMED_1Q[matches[0]]
+        return [] if name == "id" else [Operation(name, (qubit,))]
+    if is_clifford((qubit + 1, run)):
+        return run
+    return [Operation("u", (qubit,), u_angles(product, atol), product)]
+
+
+def fuse_single_qubit_gates(circuit, atol=ATOL):
+    """Replace each run of single-qubit gates on a wire by one gate"""
+    num_qubits, ops = circuit_operations(circuit)
+    fused = []
+    runs = {}  # Wire -> single-qubit gates waiting to be fused
+
+    def flush(qubit):
+        run = runs.pop(qubit, None)
+        if run:
+            fused.extend(_fuse(run, qubit, atol))
+
+    for op in ops:
+        if len(op.qubits) == 1 and op.name not in NON_UNITARY_SKIP and _is_unitary(op):
+            runs.setdefault(op.qubits[0], []).append(op)
+            continue
+        for q in op.qubits:
+            flush(q)
+        fused.append(op)
+    for q in sorted(runs):
+        flush(q)
+    return num_qubits, fused
+
+
+def remove_idle_qubits(circuit):
+    """Drop wires no gate touches; returns (circuit, kept) with kept[i] the old index of wire i"""
+    num_qubits, ops = circuit_operations(circuit)
+    kept = sorted({q for op in ops if op.name not in IDLE for q in op.qubits})
+    if len(kept) == num_qubits:
+        return (num_qubits, ops), list(range(num_qubits))
+    wire = {q: i for i, q in enumerate(kept)}
+    renumbered = []
+    for op in ops:
+        qubits = tuple(wire[q] for q in op.qubits if q in wire)
+        if qubits:
+            renumbered.append(op._replace(qubits=qubits))
+    return (len(kept), renumbered), kept
+
+
+PASSES = {
+    "commute": commute_gates,
+    "cancel": cancel_inverses,
+    "fuse": fuse_single_qubit_gates,
+    "dead_qubits": remove_idle_qubits,
+}
+DEFAULT_PASSES = ("commute", "cancel", "fuse", "dead_qubits")
+
+
+def optimize(circuit, passes=DEFAULT_PASSES):
+    """Run the named passes in order; returns an OptimizedCircuit
+
+    ``report`` starts with the original circuit and has one PassReport per
+    pass with the gate count and depth after it.
+    """
+    circuit = circuit_operations(circuit)
+    qubits = list(range(circuit[0]))
+    report = [PassReport("original", gate_count(circuit), depth(circuit), 0.0)]
+    for name in passes:
+        start = time.perf_counter()
+        if name == "dead_qubits":
+            circuit, kept = remove_idle_qubits(circuit)
+            qubits = [qubits[q] for q in kept]
+        else:
+            circuit = PASSES[name](circuit)
+        report.append(PassReport(name, gate_count(circuit), depth(circuit), time.perf_counter() - start))
+    return OptimizedCircuit(circuit, qubits, report)
+
+
+def format_report(report):
+    """One line: total change, then the signed gate/depth change of each pass"""
+    first, last = report[0], report[-1]
+    change = last.gates / first.gates - 1 if first.gates else 0.0
+    parts = [f"gates {first.gates:,} -> {last.gates:,} ({change:+.0%})  "
+             f"depth {first.depth:,} -> {last.depth:,}"]
+    for before, after in zip(report, report[1:]):
+        parts.append(f"{after.name} {after.gates - before.gates:+,}/{after.depth - before.depth:+,}")
+    return "   ".join(parts)
@@ -0,0 +1,143 @@
+"""Recording of visualization trajectories to memory-mapped .npy files.
+
+A trajectory is a sequence of fixed-size records (a NumPy structured dtype
+with a ``time`` field plus whatever a window captures: control positions,
+animation frame, Bloch vectors, ...). ``TrajectoryRecorder`` appends them
+through a memory map that grows in chunks, so recording costs the same per
+frame however long the session runs, and ``Trajectory`` reads a finished
+file back with ``np.load(mmap_mode="r")``: a frame is read from the page
+cache when it is asked for and the recording never has to fit in RAM.
+
+Files are ordinary .npy arrays of records. numpy pads the header so the
+length can be rewritten in place; the header always holds the number of
+complete records, so a recording interrupted between flushes still loads.
+"""
+import bisect
+import os
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+
+def record_dtype(fields):
+    """Structured dtype for ``fields`` [(name, dtype, shape)], with a leading ``time``"""
+    return np.dtype([("time", "f8")] + [(name, dtype, shape) for name, dtype, shape in fields])
+
+
+class TrajectoryRecorder:
+    """Appends records to a .npy file through a memory map grown ``chunk`` records at a time"""
+
+    def __init__(self, path, fields, chunk=4096):
+        self.path = path
+        self.dtype = record_dtype(fields)
+        self.chunk = chunk
+        self.count = 0
+        self.capacity = 0
+        self._map = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "wb") as f:
+            self._write_header(f, 0)
+            self.offset = f.tell()
+        self._grow()
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def nbytes(self):
+        return self.count * self.dtype.itemsize
+
+    def _write_header(self, f, length):
+        f.seek(0)
+        npy_format.write_array_header_1_0(f, {"descr": npy_format.dtype_to_descr(self.dtype),
+                                              "fortran_order": False, "shape": (length,)})
+
+    def _grow(self):
+        if self._map is not None:
+            self._map.flush()
+            self._map = None
+        self.capacity += self.chunk
+        # Extend the file, then map the whole record area again
+        with open(self.path, "r+b") as f:
+            f.truncate(self.offset + self.capacity * self.dtype.itemsize)
+        self._map = np.memmap(self.path, dtype=self.dtype, mode="r+", offset=self.offset,
+                              shape=(self.capacity,))
+
+    def append(self, time, **values):
+        """Write one record; fields that are not given stay zero"""
+        if self.count == self.capacity:
+            self._grow()
+        record = self._map[self.count]
+        record["time"] = time
+        for name, value in values.items():
+            record[name] = value
+        self.count += 1
+        return self.count - 1
+
+    def flush(self):
+        """Make the records so far durable and visible to readers of the file"""
+        if self._map is None:
+            return
+        self._map.flush()
+        with open(self.path, "r+b") as f:
+            self._write_header(f, self.count)
+            if f.tell() != self.offset:
+                raise RuntimeError("npy header changed size; the recording would be corrupted")
+
+    def close(self):
+        """Flush and trim the unused capacity off the end of the file"""
+        if self._map is None:
+            return
+        self.flush()
+        self._map = None
+        with open(self.path, "r+b") as f:
+            f.truncate(self.offset + self.count * self.dtype.itemsize)
+
+
+class Trajectory:
+    """Read-only view of a recorded trajectory; records are paged in on access"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            version = npy_format.read_magic(f)
+            read_header = (npy_format.read_array_header_1_0 if version == (1, 0)
+                           else npy_format.read_array_header_2_0)
+            shape, _, dtype = read_header(f)
+        self.dtype = dtype
+        if shape[0] == 0:
+            self.records = np.zeros(0, dtype=dtype)  # An empty file cannot be mapped
+        else:
+            self.records = np.load(path, mmap_mode="r")
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        """One record as a dict of field values (copied out of the map)"""
+        record = self.records[index]
+        return {name: np.array(record[name]) if record[name].shape else record[name].item()
+                for name in self.dtype.names}
+
+    @property
+    def fields(self):
+        return self.dtype.names
+
+    @property
+    def duration(self):
+        return float(self.records[-1]["time"]) if len(self) else 0.0
+
+    def index_at(self, time):
+        """Index of the last record at or before ``time``.
+
+        A Python binary search reads about log2(len) timestamps from the map;
+        np.searchsorted would first copy the whole strided ``time`` column.
+        """
+        index = bisect.bisect_right(self.records["time"], time) - 1
+        return min(max(index, 0), max(len(self) - 1, 0))
+
+    def close(self):
+        mm = getattr(self.records, "_mmap", None)
+        self.records = np.zeros(0, dtype=self.dtype)
+        if mm is not None:
+            mm.close()
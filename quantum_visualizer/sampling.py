@@ -0,0 +1,135 @@
+"""Measurement shot sampling from a probability vector, streamed into running counts.
+
+Shots are never stored as bitstrings. A batch either goes straight to counts
+with one multinomial draw, which costs O(outcomes) however many shots it
+holds, or through a Walker alias table as outcome indices (O(1) per shot)
+that are immediately binned. ``ShotSampler`` picks the cheaper of the two
+per batch, so 10^8 shots over a handful of outcomes take milliseconds, and
+1M-outcome distributions never build a 1M-wide multinomial per frame.
+"""
+import numpy as np
+
+# Largest batch drawn through the alias table at once; bounds the temporary
+# index and random arrays to a few MiB whatever the shot count
+ALIAS_CHUNK = 2 ** 20
+
+
+def marginal_probabilities(probabilities, qubits, num_qubits):
+    """Outcome probabilities of the given qubits, summed over all others.
+
+    Bit b of the returned index is the b-th lowest qubit in ``qubits``, so
+    bitstrings read with the highest measured qubit leftmost, as in ``counts``.
+    """
+    qubits = sorted(set(qubits))
+    if len(qubits) == num_qubits:
+        return np.asarray(probabilities, dtype=float)
+    tensor = np.asarray(probabilities, dtype=float).reshape((2,) * num_qubits)
+    # Qubit q is tensor axis n - 1 - q
+    traced = tuple(num_qubits - 1 - q for q in range(num_qubits) if q not in qubits)
+    return tensor.sum(axis=traced).reshape(-1)
+
+
+class AliasTable:
+    """Walker alias table: O(1) sampling of an index with the given probabilities.
+
+    Built with Vose's method, but in vectorized rounds: every under-full
+    bucket is paired with an over-full one in the same round by matching the
+    running sum of deficits against the running sum of surpluses. Over-full
+    buckets that drop below one become under-full for the next round, which
+    typically ends the construction in a handful of rounds.
+    """
+
+    def __init__(self, probabilities):
+        p = np.asarray(probabilities, dtype=float)
+        size = len(p)
+        scaled = p * (size / p.sum())
+        self.size = size
+        self.prob = np.ones(size)
+        self.alias = np.arange(size)
+
+        small = np.flatnonzero(scaled < 1)
+        large = np.flatnonzero(scaled >= 1)
+        while len(small) and len(large):
+            deficit = np.cumsum(1 - scaled[small])
+            surplus = np.cumsum(scaled[large] - 1)
+            # The over-full bucket whose surplus covers the end of each deficit
+            owner = np.minimum(np.searchsorted(surplus, deficit), len(large) - 1)
+            self.prob[small] = scaled[small]
+            self.alias[small] = large[owner]
+            np.subtract.at(scaled, large[owner], 1 - scaled[small])
+            small = large[scaled[large] < 1]
+            large = large[scaled[large] >= 1]
+        # Whatever is left is full up to rounding
+
+    def sample(self, shots, rng):
+        """Array of ``shots`` indices"""
+        u = rng.random(shots) * self.size
+        bucket = u.astype(np.int64)
+        np.minimum(bucket, self.size - 1, out=bucket)
+        return np.where(u - bucket < self.prob[bucket], bucket, self.alias[bucket])
+
+
+class ShotSampler:
+    """Accumulates measurement counts over a probability vector, batch by batch.
+
+    ``counts`` is a running histogram (one int64 per outcome) that each
+    ``draw`` adds to, so a UI can redraw it while shots stream in.
+    ``method`` is "multinomial", "alias" or "auto" (multinomial when the
+    batch has more shots than there are outcomes).
+    """
+
+    def __init__(self, probabilities, seed=None, method="auto"):
+        if method not in ("auto", "multinomial", "alias"):
+            raise ValueError(f"unknown sampling method '{method}'")
+        p = np.asarray(probabilities, dtype=float)
+        self.probabilities = p / p.sum()
+        self.method = method
+        self.rng = np.random.default_rng(seed)
+        self.counts = np.zeros(len(p), dtype=np.int64)
+        self.shots = 0
+        self._alias = None
+
+    @property
+    def num_outcomes(self):
+        return len(self.probabilities)
+
+    def reset(self):
+        self.counts[:] = 0
+        self.shots = 0
+
+    def draw(self, shots):
+        """Add ``shots`` samples to the running counts; returns the counts"""
+        shots = int(shots)
+        method = self.method
+        if method == "auto":
+            method = "multinomial" if shots >= self.num_outcomes else "alias"
+        if method == "multinomial":
+            self.counts += self.rng.multinomial(shots, self.probabilities)
+        else:
+            for start in range(0, shots, ALIAS_CHUNK):
+                indices = self.alias_table.sample(min(ALIAS_CHUNK, shots - start), self.rng)
+                self.counts += np.bincount(indices, minlength=self.num_outcomes)
+        self.shots += shots
+        return self.counts
+
+    def sample(self, shots):
+        """Outcome indices of ``shots`` individual shots (not added to the counts)"""
+        return self.alias_table.sample(int(shots), self.rng)
+
+    @property
+    def alias_table(self):
+        if self._alias is None:
+            self._alias = AliasTable(self.probabilities)
+        return self._alias
+
+    def frequencies(self):
+        return self.counts / max(self.shots, 1)
+
+    def total_variation(self):
+        """Total variation distance between the measured frequencies and the exact distribution"""
+        return 0.5 * float(np.abs(self.frequencies() - self.probabilities).sum())
+
+    def counts_dict(self, width):
+        """Nonzero counts keyed by ``width``-bit bitstrings"""
+        nonzero = np.flatnonzero(self.counts)
+        return {format(int(i), f"0{width}b"): int(self.counts[i]) for i in nonzero}
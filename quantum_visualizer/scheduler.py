@@ -0,0 +1,76 @@
+import time
+
+from PyQt6.QtCore import QObject, Qt, QTimer
+
+
+# One display frame at 60 Hz
+FRAME_INTERVAL_MS = 16
+
+
+class RenderScheduler(QObject):
+    """Coalesce bursts of parameter changes into at most one render per frame.
+
+    Controls call ``request()`` (or are wired up with ``attach``) instead of
+    redrawing directly. The first request arms a single-shot timer for the
+    start of the next frame; further requests before it fires are merged, and
+    ``render`` then reads the controls' current values, so the latest value is
+    always the one drawn. ``render(preview)`` gets ``preview=True`` while an
+    attached slider is held down; releasing it schedules a full-quality render.
+    """
+
+    def __init__(self, render, interval_ms=FRAME_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.render = render
+        self.interval = interval_ms / 1000
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._fire)
+
+        self.pending = False
+        self.dragging = set()
+        self.last_render = 0.0
+        self.last_was_preview = False
+        # Counters for the "requests per render" ratio
+        self.requests = 0
+        self.renders = 0
+
+    def attach(self, control):
+        """Schedule a render whenever a slider, spin box or combo box changes"""
+        if hasattr(control, "currentIndexChanged"):
+            control.currentIndexChanged.connect(self.request)
+        else:
+            control.valueChanged.connect(self.request)
+        if hasattr(control, "sliderPressed"):
+            control.sliderPressed.connect(lambda: self.dragging.add(control))
+            control.sliderReleased.connect(lambda: self._release(control))
+
+    def request(self, *_):
+        self.requests += 1
+        self.pending = True
+        if not self.timer.isActive():
+            # Render on the next event-loop pass, but no sooner than a frame
+            # after the previous render
+            wait = self.interval - (time.perf_counter() - self.last_render)
+            self.timer.start(max(0, int(wait * 1000)))
+
+    def flush(self):
+        """Render now if a request is pending (for exports and tests)"""
+        if self.pending:
+            self.timer.stop()
+            self._fire()
+
+    def _release(self, control):
+        self.dragging.discard(control)
+        if self.last_was_preview:
+            self.request()
+
+    def _fire(self):
+        if not self.pending:
+            return
+        self.pending = False
+        preview = bool(self.dragging)
+        self.last_render = time.perf_counter()
+        self.last_was_preview = preview
+        self.renders += 1
+        self.render(preview)
@@ -0,0 +1,165 @@
+import numpy as np
+
+from density import bond_entropies, reduced_bloch_vectors
+from gates import NON_UNITARY_SKIP, circuit_operations
+from sampling import ShotSampler, marginal_probabilities
+from unitary_cache import FUSION_QUBITS, FusedBlock, default_cache, fused_blocks
+
+# Smallest block worth one dense pass instead of its gates' own passes
+MIN_FUSED_GATES = 3
+
+
+def zero_state(num_qubits, dtype=np.complex128):
+    """Return |0...0⟩ as a flat array of 2**num_qubits amplitudes"""
+    state = np.zeros(2 ** num_qubits, dtype=dtype)
+    state[0] = 1
+    return state
+
+
+def apply_gate(state, matrix, qubits, num_qubits):
+    """Apply a k-qubit gate to a flat statevector without building a 2^n x 2^n matrix.
+
+    The state is viewed as an n-dimensional (2, 2, ..., 2) tensor, the gate
+    as a (2,)*2k tensor, and the gate's input axes are contracted with the
+    target qubits' axes. Qubit q is bit q of the basis index (Qiskit's
+    little-endian convention), which is tensor axis n - 1 - q. A stack of
+    states (..., 2**n) gets the gate applied to each of them.
+    """
+    k = len(qubits)
+    batch = state.shape[:-1]
+    tensor = state.reshape(batch + (2,) * num_qubits)
+    # Gate tensor axes run from the most significant qubit of the gate down
+    axes = [len(batch) + num_qubits - 1 - q for q in reversed(qubits)]
+
+    diagonal = np.diagonal(matrix)
+    if np.count_nonzero(matrix - np.diag(diagonal)) == 0:
+        # Diagonal gates (z, s, t, p, rz, cz, cp, ...) are an elementwise product
+        phases = diagonal.reshape((2,) * k)
+        shape = [1] * tensor.ndim
+        for axis in axes:
+            shape[axis] = 2
+        order = np.argsort(axes)
+        phases = np.transpose(phases, order).reshape(shape)
+        return (tensor * phases).reshape(state.shape)
+
+    if k == 1:
+        # (..., A, 2, B) view with the target qubit in the middle: mix the two halves
+        q = qubits[0]
+        view = state.reshape(batch + (2 ** (num_qubits - 1 - q), 2, 2 ** q))
+        v0, v1 = view[..., 0, :], view[..., 1, :]
+        out = np.empty_like(view)
+        out[..., 0, :] = matrix[0, 0] * v0 + matrix[0, 1] * v1
+        out[..., 1, :] = matrix[1, 0] * v0 + matrix[1, 1] * v1
+        return out.reshape(state.shape)
+
+    gate = matrix.reshape((2,) * (2 * k))
+    tensor = np.tensordot(gate, tensor, axes=(list(range(k, 2 * k)), axes))
+    tensor = np.moveaxis(tensor, list(range(k)), axes)
+    return np.ascontiguousarray(tensor).reshape(state.shape)
+
+
+class StatevectorResult:
+    def __init__(self, state, num_qubits, measured_qubits=()):
+        self.state = state
+        self.num_qubits = num_qubits
+        self.measured_qubits = tuple(measured_qubits)
+
+    @property
+    def amplitudes(self):
+        return self.state
+
+    def probabilities(self):
+        return np.abs(self.state) ** 2
+
+    def amplitude(self, bitstring):
+        """Amplitude of a basis state given as a bitstring, qubit 0 rightmost"""
+        return self.state[int(bitstring, 2)]
+
+    def bloch_vectors(self):
+        """(n, 3) array of single-qubit reduced Bloch vectors"""
+        return reduced_bloch_vectors(self.state, self.num_qubits)
+
+    def entanglement_entropies(self):
+        """Entropy in bits between qubits 0..k and k+1..n-1, for each bond k"""
+        return bond_entropies(self.state, self.num_qubits)
+
+    def sample(self, shots, seed=None):
+        """(shots, len(measured_qubits)) array of 0/1 outcomes; all qubits if none were measured"""
+        qubits = np.array(self.measured_qubits or range(self.num_qubits))
+        indices = ShotSampler(self.probabilities(), seed).sample(shots)
+        return ((indices[:, None] >> qubits[None, :]) & 1).astype(np.uint8)
+
+    def counts(self, shots, seed=None):
+        """Measurement counts keyed by bitstring, qubit 0 rightmost.
+
+        Counts come from one multinomial draw over the measured qubits'
+        marginal distribution, so no per-shot bitstrings are built.
+        """
+        qubits = sorted(set(self.measured_qubits or range(self.num_qubits)))
+        probs = marginal_probabilities(self.probabilities(), qubits, self.num_qubits)
+        sampler = ShotSampler(probs, seed)
+        sampler.draw(shots)
+        return sampler.counts_dict(len(qubits))
+
+
+class StatevectorSimulator:
+    """Dense statevector simulator using tensor contractions on the state array.
+
+    Memory is one array of 2**n complex amplitudes (16 MiB for 20 qubits at
+    complex128, half that with ``dtype=np.complex64``). Measurements and
+    barriers are skipped, so ``run`` returns the pre-measurement state.
+
+    Gates are fused into blocks of up to ``fusion_qubits`` qubits, and
+    blocks of at least MIN_FUSED_GATES gates are applied as one unitary from
+    ``cache`` (the shared ``UnitaryCache`` by default); ``fusion_qubits=0``
+    applies every gate on its own.
+    """
+
+    def __init__(self, dtype=np.complex128, fusion_qubits=FUSION_QUBITS, cache=None):
+        self.dtype = dtype
+        self.fusion_qubits = fusion_qubits
+        self.cache = cache if cache is not None else default_cache
+
+    def run(self, circuit, initial_state=None, progress=None):
+        """Simulate a circuit; ``progress(fraction)`` is called about 100 times if given"""
+        num_qubits, ops = circuit_operations(circuit)
+        if initial_state is None:
+            state = zero_state(num_qubits, self.dtype)
+        else:
+            state = np.array(initial_state, dtype=self.dtype).reshape(-1)
+
+        measured = []
+        report_every = max(1, len(ops) // 100)
+        done = next_report = 0
+        items = fused_blocks(ops, self.fusion_qubits) if self.fusion_qubits else ops
+        for item in items:
+            if progress is not None and done >= next_report:
+                progress(done / len(ops))
+                next_report = done + report_every
+            if isinstance(item, FusedBlock):
+                done += len(item.ops)
+                if len(item.ops) < MIN_FUSED_GATES:
+                    # Diagonal and single-qubit gates are cheaper one by one than as a dense block
+                    for op in item.ops:
+                        state = apply_gate(state, self.cache.operation(op, self.dtype), op.qubits, num_qubits)
+                else:
+                    qubits, matrix = self.cache.subcircuit(item.ops, self.dtype)
+                    state = apply_gate(state, matrix, qubits, num_qubits)
+                continue
+            op = item
+            done += 1
+            if op.name == "measure":
+                measured.extend(op.qubits)
+                continue
+            if op.name in NON_UNITARY_SKIP:
+                continue
+            if op.name == "reset":
+                raise ValueError("reset is not supported by the statevector simulator")
+            state = apply_gate(state, self.cache.operation(op, self.dtype), op.qubits, num_qubits)
+
+        return StatevectorResult(state, num_qubits, measured)
+
+
+def simulate(circuit):
+    """Run a circuit on the statevector simulator and return its amplitudes"""
+    return StatevectorSimulator().run(circuit).state
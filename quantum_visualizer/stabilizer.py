@@ -0,0 +1,363 @@
+import numpy as np
+
+from gates import circuit_operations
+
+
+# Gates the tableau can apply directly (or as a short sequence of H/S/CX)
+CLIFFORD_GATES = {"id", "i", "x", "y", "z", "h", "s", "sdg", "sx", "sxdg",
+                  "cx", "cy", "cz", "swap"}
+# Phase rotations that are Clifford when the angle is a multiple of π/2
+_QUARTER_TURN_GATES = {"p", "u1", "rz"}
+_STRUCTURAL = {"barrier", "measure", "reset", "delay"}
+
+
+def _quarter_turns(angle):
+    """Number of S gates equivalent to a phase rotation, or None if not Clifford"""
+    turns = angle / (np.pi / 2)
+    nearest = round(turns)
+    if abs(turns - nearest) > 1e-9:
+        return None
+    return nearest % 4
+
+
+def is_clifford(circuit):
+    """True if every instruction of the circuit can run on the stabilizer backend"""
+    _, ops = circuit_operations(circuit)
+    for op in ops:
+        if op.name in CLIFFORD_GATES or op.name in _STRUCTURAL:
+            continue
+        if op.name in _QUARTER_TURN_GATES and _quarter_turns(op.params[0]) is not None:
+            continue
+        return False
+    return True
+
+
+def _phase_exponent(x1, z1, x2, z2):
+    """Aaronson-Gottesman g: power of i picked up when multiplying Pauli 1 into Pauli 2"""
+    x1 = x1.astype(np.int8)
+    z1 = z1.astype(np.int8)
+    x2 = x2.astype(np.int8)
+    z2 = z2.astype(np.int8)
+    return np.where(
+        (x1 == 1) & (z1 == 1), z2 - x2,
+        np.where((x1 == 1) & (z1 == 0), z2 * (2 * x2 - 1),
+                 np.where((x1 == 0) & (z1 == 1), x2 * (1 - 2 * z2), 0)))
+
+
+class Tableau:
+    """Stabilizer tableau of n qubits (Aaronson & Gottesman, "CHP").
+
+    Rows 0..n-1 are destabilizers, rows n..2n-1 stabilizers and row 2n is
+    scratch space. Memory is O(n^2) bits and every gate is O(n).
+
+    The sign column is kept symbolically: ``r`` has one column for the
+    constant part and one per random measurement outcome drawn so far, all
+    over GF(2). Phases only ever combine by XOR, so after a single pass every
+    measurement outcome is an affine function of the random bits, and any
+    number of shots can be sampled from that function without re-running
+    the circuit.
+    """
+
+    def __init__(self, num_qubits):
+        n = num_qubits
+        self.num_qubits = n
+        self.x = np.zeros((2 * n + 1, n), dtype=bool)
+        self.z = np.zeros((2 * n + 1, n), dtype=bool)
+        idx = np.arange(n)
+        self.x[idx, idx] = True
+        self.z[n + idx, idx] = True
+        self.r = np.zeros((2 * n + 1, n + 1), dtype=bool)
+        self.num_random = 0
+
+    def copy(self):
+        other = Tableau.__new__(Tableau)
+        other.num_qubits = self.num_qubits
+        other.x = self.x.copy()
+        other.z = self.z.copy()
+        other.r = self.r.copy()
+        other.num_random = self.num_random
+        return other
+
+    # Gates -----------------------------------------------------------------
+
+    def h(self, a):
+        self.r[:, 0] ^= self.x[:, a] & self.z[:, a]
+        self.x[:, a], self.z[:, a] = self.z[:, a].copy(), self.x[:, a].copy()
+
+    def s(self, a):
+        self.r[:, 0] ^= self.x[:, a] & self.z[:, a]
+        self.z[:, a] ^= self.x[:, a]
+
+    def sdg(self, a):
+        self.r[:, 0] ^= self.x[:, a] & ~self.z[:, a]
+        self.z[:, a] ^= self.x[:, a]
+
+    def x_gate(self, a):
+        self.r[:, 0] ^= self.z[:, a]
+
+    def z_gate(self, a):
+        self.r[:, 0] ^= self.x[:, a]
+
+    def y_gate(self, a):
+        self.r[:, 0] ^= self.x[:, a] ^ self.z[:, a]
+
+    def cx(self, a, b):
+        self.r[:, 0] ^= self.x[:, a] & self.z[:, b] & ~(self.x[:, b] ^ self.z[:, a])
+        self.x[:, b] ^= self.x[:, a]
+        self.z[:, a] ^= self.z[:, b]
+
+    def cz(self, a, b):
+        self.h(b)
+        self.cx(a, b)
+        self.h(b)
+
+    def apply(self, name, qubits, params=()):
+        if name in ("id", "i"):
+            return
+        if name == "h":
+            self.h(*qubits)
+        elif name == "s":
+            self.s(*qubits)
+        elif name == "sdg":
+            self.sdg(*qubits)
+        elif name == "x":
+            self.x_gate(*qubits)
+        elif name == "y":
+            self.y_gate(*qubits)
+        elif name == "z":
+            self.z_gate(*qubits)
+        elif name == "sx":
+            # √X = H S H up to a global phase
+            self.h(*qubits)
+            self.s(*qubits)
+            self.h(*qubits)
+        elif name == "sxdg":
+            self.h(*qubits)
+            self.sdg(*qubits)
+            self.h(*qubits)
+        elif name == "cx":
+            self.cx(*qubits)
+        elif name == "cz":
+            self.cz(*qubits)
+        elif name == "cy":
+            control, target = qubits
+            self.sdg(target)
+            self.cx(control, target)
+            self.s(target)
+        elif name == "swap":
+            a, b = qubits
+            self.cx(a, b)
+            self.cx(b, a)
+            self.cx(a, b)
+        elif name in _QUARTER_TURN_GATES:
+            turns = _quarter_turns(params[0])
+            if turns is None:
+                raise ValueError(f"{name}({params[0]}) is not a Clifford gate")
+            for _ in range(turns):
+                self.s(*qubits)
+        else:
+            raise ValueError(f"Gate '{name}' is not supported by the stabilizer backend")
+
+    # Row operations and measurement ---------------------------------------
+
+    def _rowsum(self, targets, source):
+        """Multiply row ``source`` into each row in ``targets`` (vectorised over targets)"""
+        targets = np.atleast_1d(targets)
+        g = _phase_exponent(self.x[source], self.z[source], self.x[targets], self.z[targets])
+        flip = (g.sum(axis=1, dtype=np.int64) // 2) % 2 == 1
+        self.r[targets] ^= self.r[source]
+        self.r[targets, 0] ^= flip
+        self.x[targets] ^= self.x[source]
+        self.z[targets] ^= self.z[source]
+
+    def _product_into_scratch(self, rows):
+        """Set the scratch row to the ordered product of the given rows.
+
+        Writing each row as (-1)^r i^(x·z) X^x Z^z, moving every Z past the
+        later X factors contributes (-1)^(z_k·x_l) for k < l, so the phase of
+        the whole product follows from a prefix sum instead of one rowsum per
+        row.
+        """
+        scratch = 2 * self.num_qubits
+        xs, zs = self.x[rows], self.z[rows]
+        x_total = np.bitwise_xor.reduce(xs, axis=0) if len(rows) else np.zeros(self.num_qubits, bool)
+        z_total = np.bitwise_xor.reduce(zs, axis=0) if len(rows) else np.zeros(self.num_qubits, bool)
+
+        z_before = np.bitwise_xor.accumulate(zs, axis=0) ^ zs
+        exponent = (np.count_nonzero(xs & zs)
+                    + 2 * np.count_nonzero(z_before & xs)
+                    - np.count_nonzero(x_total & z_total))
+
+        self.x[scratch] = x_total
+        self.z[scratch] = z_total
+        self.r[scratch] = np.bitwise_xor.reduce(self.r[rows], axis=0) if len(rows) else False
+        self.r[scratch, 0] ^= (exponent % 4) // 2 == 1
+        return scratch
+
+    def measure(self, a):
+        """Measure qubit ``a`` in Z; returns the outcome as a symbolic GF(2) row"""
+        n = self.num_qubits
+        anticommuting = np.flatnonzero(self.x[n:2 * n, a]) + n
+        if len(anticommuting):
+            # Random outcome: a fresh random bit
+            p = anticommuting[0]
+            others = np.flatnonzero(self.x[:2 * n, a])
+            others = others[others != p]
+            if len(others):
+                self._rowsum(others, p)
+            self.x[p - n] = self.x[p]
+            self.z[p - n] = self.z[p]
+            self.r[p - n] = self.r[p]
+            self.x[p] = False
+            self.z[p] = False
+            self.z[p, a] = True
+            self.num_random += 1
+            if self.num_random >= self.r.shape[1]:
+                self.r = np.concatenate([self.r, np.zeros_like(self.r)], axis=1)
+            self.r[p] = False
+            self.r[p, self.num_random] = True
+            return self.r[p].copy()
+
+        # Deterministic outcome: the product of stabilizers equal to ±Z_a
+        rows = np.flatnonzero(self.x[:n, a]) + n
+        scratch = self._product_into_scratch(rows)
+        return self.r[scratch].copy()
+
+    def reset(self, a):
+        """Measure and conditionally flip, leaving the qubit in |0⟩"""
+        outcome = self.measure(a)
+        # Apply X^outcome: rows with a Z on qubit a pick up the outcome as a sign
+        self.r[np.flatnonzero(self.z[:, a])] ^= outcome
+
+    def expectation(self, a, pauli):
+        """⟨P_a⟩ for P in 'x', 'y', 'z': ±1 if ±P_a stabilizes the state, else 0"""
+        n = self.num_qubits
+        sx, sz = self.x[n:2 * n, a], self.z[n:2 * n, a]
+        dx, dz = self.x[:n, a], self.z[:n, a]
+        if pauli == "z":
+            commutes, selector = not sx.any(), dx
+        elif pauli == "x":
+            commutes, selector = not sz.any(), dz
+        else:
+            commutes, selector = not (sx ^ sz).any(), dx ^ dz
+        if not commutes:
+            return 0.0
+        # ±P_a is the product of the stabilizers whose destabilizers anticommute with it
+        scratch = self._product_into_scratch(np.flatnonzero(selector) + n)
+        sign = self.r[scratch]
+        if sign[1:self.num_random + 1].any():
+            # Sign depends on an earlier random outcome: averages to zero
+            return 0.0
+        return -1.0 if sign[0] else 1.0
+
+    def bloch_vectors(self):
+        """(n, 3) array of single-qubit Bloch vectors"""
+        vectors = np.zeros((self.num_qubits, 3))
+        for a in range(self.num_qubits):
+            for axis, pauli in enumerate("xyz"):
+                vectors[a, axis] = self.expectation(a, pauli)
+        return vectors
+
+    def bond_entropies(self):
+        """Entanglement entropy in bits across each cut between qubits k and k+1.
+
+        For a stabilizer state S(A) = rank(G_A) - |A|, where G_A is the
+        stabilizer generators restricted to A over GF(2). One elimination
+        over the columns in qubit order gives the rank of every prefix: it
+        is the number of pivots found in that prefix.
+        """
+        n = self.num_qubits
+        # Columns x_0, z_0, x_1, z_1, ...
+        matrix = np.empty((n, 2 * n), dtype=bool)
+        matrix[:, 0::2] = self.x[n:2 * n]
+        matrix[:, 1::2] = self.z[n:2 * n]
+        pivots = np.zeros(2 * n, dtype=int)
+        rank = 0
+        for column in range(2 * n):
+            rows = np.flatnonzero(matrix[rank:, column])
+            if len(rows):
+                pivot = rank + rows[0]
+                matrix[[rank, pivot]] = matrix[[pivot, rank]]
+                below = rank + 1 + np.flatnonzero(matrix[rank + 1:, column])
+                matrix[below] ^= matrix[rank]
+                rank += 1
+                pivots[column] = 1
+            if rank == n:
+                break
+        prefix_rank = np.cumsum(pivots)[1::2]
+        return (prefix_rank - np.arange(1, n + 1))[:-1].astype(float)
+
+
+class StabilizerResult:
+    def __init__(self, tableau, outcomes, measured_qubits, num_random):
+        # Tableau before the first measurement, used for the Bloch vectors
+        self.tableau = tableau
+        self.num_qubits = tableau.num_qubits
+        self.measured_qubits = tuple(measured_qubits)
+        # Row i: affine GF(2) form [constant, coeff_1, ..., coeff_k] of outcome i
+        self.outcomes = outcomes
+        self.num_random = num_random
+
+    def bloch_vectors(self):
+        return self.tableau.bloch_vectors()
+
+    def entanglement_entropies(self):
+        """Entropy in bits between qubits 0..k and k+1..n-1, for each bond k"""
+        return self.tableau.bond_entropies()
+
+    def sample(self, shots, seed=None):
+        """(shots, len(measured_qubits)) array of 0/1 outcomes"""
+        rng = np.random.default_rng(seed)
+        constant = self.outcomes[:, 0].astype(np.int64)
+        coefficients = self.outcomes[:, 1:self.num_random + 1].astype(np.int64)
+        bits = rng.integers(0, 2, size=(shots, self.num_random), dtype=np.int64)
+        return ((bits @ coefficients.T + constant) % 2).astype(np.uint8)
+
+    def counts(self, shots, seed=None):
+        """Measurement counts keyed by bitstring, qubit 0 rightmost"""
+        samples = self.sample(shots, seed)
+        order = np.argsort(self.measured_qubits)[::-1]
+        rows, frequencies = np.unique(samples[:, order], axis=0, return_counts=True)
+        return {"".join(map(str, row)): int(count) for row, count in zip(rows, frequencies)}
+
+
+class StabilizerSimulator:
+    """Clifford circuit simulator with polynomial time and memory in the qubit count"""
+
+    def run(self, circuit, progress=None):
+        num_qubits, ops = circuit_operations(circuit)
+        tableau = Tableau(num_qubits)
+        snapshot = None
+        outcomes = []
+        measured = []
+
+        report_every = max(1, len(ops) // 100)
+        for i, op in enumerate(ops):
+            if progress is not None and i % report_every == 0:
+                progress(i / len(ops))
+            if op.name in ("barrier", "delay"):
+                continue
+            if op.name in ("measure", "reset") and snapshot is None:
+                snapshot = tableau.copy()
+            if op.name == "measure":
+                for q in op.qubits:
+                    outcomes.append(tableau.measure(q))
+                    measured.append(q)
+            elif op.name == "reset":
+                for q in op.qubits:
+                    tableau.reset(q)
+            else:
+                tableau.apply(op.name, op.qubits, op.params)
+
+        if snapshot is None:
+            snapshot = tableau.copy()
+        if not measured:
+            # No explicit measurements: sample all qubits at the end
+            for q in range(num_qubits):
+                outcomes.append(tableau.measure(q))
+                measured.append(q)
+
+        width = tableau.r.shape[1]
+        outcomes = np.array([np.pad(row, (0, width - len(row))) for row in outcomes], dtype=bool)
+        return StabilizerResult(snapshot, outcomes.reshape(len(measured), width),
+                                measured, tableau.num_random)
@@ -0,0 +1,195 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import QFileDialog, QFrame, QHBoxLayout, QLabel, QPushButton, QSlider
+
+from recorder import Trajectory, TrajectoryRecorder
+from scheduler import RenderScheduler
+
+RECORD_FPS = 30
+# Directory for new recordings
+RECORDINGS_DIR = os.path.join(tempfile.gettempdir(), "quantum_visualizer_recordings")
+
+
+def control_value(control):
+    """Position of a slider, spin box or combo box; NaN for anything else"""
+    if hasattr(control, "currentIndex"):
+        return control.currentIndex()
+    if hasattr(control, "value"):
+        return control.value()
+    return np.nan
+
+
+def set_control_value(control, value):
+    if np.isnan(value):
+        return
+    if hasattr(control, "setCurrentIndex"):
+        control.setCurrentIndex(int(value))
+    elif hasattr(control, "setValue"):
+        control.setValue(int(value))
+
+
+class TrajectoryPanel(QFrame):
+    """Record button and replay timeline for one visualization window.
+
+    While recording, a timer samples the window RECORD_FPS times a second:
+    the position of each of its controls plus any extra ``fields`` returned
+    by ``capture()``. Records stream into a TrajectoryRecorder, so a session
+    of any length only costs disk space. Stopping opens the file for replay.
+    The timeline slider then restores the record under it: control positions
+    first, then ``restore(record, preview)`` for the extra fields, with
+    ``preview`` true while the timeline is being dragged; ``restoring`` is
+    true meanwhile, so control handlers can tell a replay from the user.
+    Each step reads a single record from the memory map, so scrubbing costs
+    the same at any point of an hours-long recording.
+    """
+
+    def __init__(self, name, controls, fields=(), capture=None, restore=None, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.controls = [c for c in controls if not np.isnan(control_value(c))]
+        self.fields = [("controls", "f8", (len(self.controls),))] + list(fields)
+        self.capture = capture
+        self.restore = restore
+        self.restoring = False
+        self.recorder = None
+        self.trajectory = None
+        self._start = 0.0
+
+        self.setStyleSheet("background-color: #253443; border-radius: 6px; padding: 4px;")
+        layout = QHBoxLayout(self)
+
+        button_style = """
+            QPushButton {
+                background-color: #2C3E50;
+                color: white;
+                border-radius: 4px;
+                padding: 5px 12px;
+            }
+            QPushButton:checked {
+                background-color: #C0392B;
+            }
+        """
+        self.record_button = QPushButton("● Record")
+        self.record_button.setCheckable(True)
+        self.record_button.setStyleSheet(button_style)
+        self.record_button.toggled.connect(self.set_recording)
+        open_button = QPushButton("Open...")
+        open_button.setStyleSheet(button_style)
+        open_button.clicked.connect(lambda: self.choose_recording())
+
+        self.timeline = QSlider(Qt.Orientation.Horizontal)
+        self.timeline.setEnabled(False)
+        self.status = QLabel("no recording")
+        self.status.setStyleSheet("color: white; font-family: monospace;")
+
+        layout.addWidget(self.record_button)
+        layout.addWidget(open_button)
+        layout.addWidget(self.timeline, 1)
+        layout.addWidget(self.status)
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.record_frame)
+        # Scrubbing restores at most one record per frame
+        self.scheduler = RenderScheduler(lambda preview: self.show_record(self.timeline.value(), preview),
+                                         parent=self)
+        self.scheduler.attach(self.timeline)
+
+    # Recording -------------------------------------------------------------
+
+    def set_recording(self, enabled):
+        if enabled:
+            self.start_recording()
+        else:
+            self.stop_recording()
+
+    def start_recording(self, path=None):
+        self.close_trajectory()
+        path = path or os.path.join(RECORDINGS_DIR, f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}.npy")
+        self.recorder = TrajectoryRecorder(path, self.fields)
+        self._start = time.perf_counter()
+        self.timeline.setEnabled(False)
+        self.timer.start(round(1000 / RECORD_FPS))
+        self.record_button.setText("■ Stop")
+
+    def record_frame(self):
+        values = {"controls": [control_value(c) for c in self.controls]}
+        if self.capture is not None:
+            values.update(self.capture())
+        self.recorder.append(time.perf_counter() - self._start, **values)
+        if len(self.recorder) % RECORD_FPS == 0:
+            # Once a second: make the file loadable and update the readout
+            self.recorder.flush()
+            self.status.setText(f"recording {len(self.recorder) / RECORD_FPS:7.1f} s  "
+                                f"{self.recorder.nbytes / 2 ** 20:.1f} MiB")
+
+    def stop_recording(self):
+        if self.recorder is None:
+            return
+        self.timer.stop()
+        self.recorder.close()
+        path = self.recorder.path
+        self.recorder = None
+        self.record_button.setText("● Record")
+        self.open_recording(path)
+
+    # Replay ----------------------------------------------------------------
+
+    def choose_recording(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Recording", RECORDINGS_DIR, "Recordings (*.npy)")
+        if path:
+            self.open_recording(path)
+
+    def open_recording(self, path):
+        if self.recorder is not None:
+            self.record_button.setChecked(False)
+        self.close_trajectory()
+        trajectory = Trajectory(path)
+        expected = [name for name, *_ in self.fields]
+        if list(trajectory.fields[1:]) != expected or \
+                trajectory.dtype["controls"].shape != (len(self.controls),):
+            trajectory.close()
+            self.status.setText("recording is from another visualization")
+            return None
+        self.trajectory = trajectory
+        self.timeline.blockSignals(True)
+        self.timeline.setRange(0, max(len(trajectory) - 1, 0))
+        self.timeline.setValue(0)
+        self.timeline.blockSignals(False)
+        self.timeline.setEnabled(len(trajectory) > 0)
+        self.show_record(0)
+        return trajectory
+
+    def show_record(self, index, preview=False):
+        """Restore the window to record ``index`` of the open recording"""
+        if self.trajectory is None or not len(self.trajectory):
+            self.status.setText("empty recording")
+            return
+        record = self.trajectory[index]
+        self.restoring = True
+        try:
+            for control, value in zip(self.controls, record["controls"]):
+                set_control_value(control, value)
+            if self.restore is not None:
+                self.restore(record, preview)
+        finally:
+            self.restoring = False
+        self.status.setText(f"{record['time']:7.1f} / {self.trajectory.duration:.1f} s  "
+                            f"frame {index + 1}/{len(self.trajectory)}")
+
+    def close_trajectory(self):
+        if self.trajectory is not None:
+            self.trajectory.close()
+            self.trajectory = None
+
+    def release(self):
+        """Finish any recording and unmap the replayed file (on window close)"""
+        self.timer.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        self.close_trajectory()
@@ -0,0 +1,200 @@
+"""Memoized gate matrices and subcircuit unitaries, shared by the simulators.
+
+``UnitaryCache`` keeps read-only matrices in an LRU dict capped at
+``max_bytes``: the least recently used entries are evicted first, and hits,
+misses and evictions are counted like ``lookup_tables.ParameterTable`` does.
+It holds two kinds of entries:
+
+- gates, keyed by name, parameters and dtype (the name fixes the qubit
+  count; gates that carry their own matrix, e.g. fused ``u`` gates, by its
+  shape and bytes), so a Trotter circuit builds each of its rotations once
+  instead of once per step
+- fused subcircuits, keyed by a structural hash: the gate names, parameters
+  and qubits renumbered 0..k-1. The same block of gates on another set of
+  qubits, or in the next Trotter step, reuses one precomputed unitary.
+
+The slider-driven windows (superposition, quantum states) do not go through
+it: their per-position phases and amplitudes are rows of
+``lookup_tables.ParameterTable``, already computed once per slider position.
+The main window's Memory Report shows the default cache's statistics and
+sets its memory cap.
+
+``fused_blocks`` groups a circuit into such blocks of at most
+``FUSION_QUBITS`` qubits. A two-qubit unitary costs the statevector
+simulator one pass over the state, the same as a single gate, so a block of
+CX, Rz and Rx gates on a pair is applied in one pass instead of several.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from gates import FIXED_GATES, NON_UNITARY_SKIP, PARAMETRIC_GATES
+
+# Widest fused block: past two qubits the block matrix grows faster than the passes saved
+FUSION_QUBITS = 2
+DEFAULT_MAX_BYTES = 16 * 2 ** 20
+
+# Gates on ``qubits`` (sorted) to be applied as one unitary
+FusedBlock = namedtuple("FusedBlock", ["qubits", "ops"])
+
+
+def _structure(op, local):
+    # Hashable description of one gate of a block, with block-local qubits; an
+    # attached matrix stands for the parameters, which may be arrays themselves
+    if op.matrix is not None:
+        return op.name, tuple(local[q] for q in op.qubits), op.matrix.shape, op.matrix.tobytes()
+    return op.name, tuple(local[q] for q in op.qubits), tuple(op.params), None
+
+
+class UnitaryCache:
+    """LRU cache of gate matrices and fused subcircuit unitaries.
+
+    Safe to share between the GUI thread and JobRunner worker threads.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> read-only matrix
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def gate(self, name, params=(), dtype=np.complex128):
+        """Matrix of a named gate (see ``gates.gate_matrix``)"""
+        dtype = np.dtype(dtype)
+        if name in FIXED_GATES and dtype == FIXED_GATES[name].dtype:
+            return FIXED_GATES[name]
+        params = tuple(params)
+        key = ("gate", name, params, dtype.str)
+        return self._get(key, lambda: self._gate_matrix(name, params).astype(dtype))
+
+    def operation(self, op, dtype=np.complex128):
+        """Matrix of an Operation, preferring the matrix attached to it"""
+        matrix = op.matrix
+        if matrix is None:
+            return self.gate(op.name, op.params, dtype)
+        dtype = np.dtype(dtype)
+        if matrix.dtype == dtype:
+            return matrix
+        key = ("matrix", matrix.shape, matrix.tobytes(), dtype.str)
+        return self._get(key, lambda: matrix.astype(dtype))
+
+    def subcircuit(self, ops, dtype=np.complex128):
+        """(qubits, unitary) of a sequence of gates; ``qubits`` is sorted and its
+        first entry is the least significant bit of the unitary's index"""
+        qubits = sorted({q for op in ops for q in op.qubits})
+        local = {q: i for i, q in enumerate(qubits)}
+        dtype = np.dtype(dtype)
+        key = ("block", len(qubits), dtype.str, tuple(_structure(op, local) for op in ops))
+        return tuple(qubits), self._get(key, lambda: self._block_unitary(ops, local, dtype))
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"entries": len(self._entries), "nbytes": self.nbytes, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def set_max_bytes(self, max_bytes):
+        """Change the memory cap, evicting entries as needed"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _get(self, key, compute):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+            self.misses += 1
+        # Computed outside the lock: building a block looks up its gates
+        value = np.ascontiguousarray(compute())
+        value.flags.writeable = False  # Shared with every caller
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = value
+                self.nbytes += value.nbytes
+                self._evict()
+        return value
+
+    def _evict(self):
+        # Least recently used first, always keeping the newest entry
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+
+    @staticmethod
+    def _gate_matrix(name, params):
+        if name in FIXED_GATES:
+            return FIXED_GATES[name]
+        if name in PARAMETRIC_GATES:
+            return PARAMETRIC_GATES[name](*params)
+        raise ValueError(f"Unknown gate '{name}'")
+
+    def _block_unitary(self, ops, local, dtype):
+        # Apply the gates to every basis state at once: row j becomes U|j⟩
+        from simulator import apply_gate
+        k = len(local)
+        rows = np.eye(2 ** k, dtype=dtype)
+        for op in ops:
+            rows = apply_gate(rows, self.operation(op, dtype), [local[q] for q in op.qubits], k)
+        return rows.T
+
+
+def fused_blocks(ops, max_qubits=FUSION_QUBITS):
+    """Group gates into FusedBlocks of at most ``max_qubits`` qubits, in an order
+    equivalent to ``ops``; measurements, barriers and wider gates pass through"""
+    open_blocks = {}  # qubit -> the open block on it ([qubit set, ops])
+
+    def close(block):
+        for q in block[0]:
+            del open_blocks[q]
+        return FusedBlock(tuple(sorted(block[0])), block[1])
+
+    for op in ops:
+        fusable = (op.name not in NON_UNITARY_SKIP and len(op.qubits) <= max_qubits
+                   and (op.matrix is not None or op.name in FIXED_GATES or op.name in PARAMETRIC_GATES))
+        touched = []
+        for q in op.qubits:
+            block = open_blocks.get(q)
+            if block is not None and not any(block is other for other in touched):
+                touched.append(block)
+        if fusable:
+            qubits = set(op.qubits).union(*(block[0] for block in touched))
+            if len(qubits) <= max_qubits:
+                # Blocks on disjoint qubits commute, so they merge in any order
+                merged = [qubits, [gate for block in touched for gate in block[1]] + [op]]
+                for q in qubits:
+                    open_blocks[q] = merged
+                continue
+        for block in touched:
+            yield close(block)
+        if fusable:
+            block = [set(op.qubits), [op]]
+            for q in op.qubits:
+                open_blocks[q] = block
+        else:
+            yield op
+
+    remaining = []
+    for block in open_blocks.values():
+        if not any(block is other for other in remaining):
+            remaining.append(block)
+    for block in remaining:
+        yield close(block)
+
+
+default_cache = UnitaryCache()
@@ -1,16 +1,94 @@
-from qiskit import QuantumCircuit
 import matplotlib.pyplot as plt
+import numpy as np
+from optimizer import format_report, optimize
+from qasm import dumps_qasm
+from simulator import StatevectorSimulator
 
-def draw_circuit():
-    qc = QuantumCircuit(2)
+# Largest number of basis states drawn in the amplitude plot
+MAX_PLOTTED_STATES = 32
+# Wider basis states are labelled in hex
+WIDE_LABEL_QUBITS = 16
+
+
+def sample_circuit(num_qubits=2):
+    """Bell circuit for two qubits, a GHZ chain for more"""
+    from qiskit import QuantumCircuit
+    qc = QuantumCircuit(num_qubits)
     qc.h(0)
-    qc.cx(0, 1)
+    for q in range(num_qubits - 1):
+        qc.cx(q, q + 1)
     qc.measure_all()
-    
-    qc.draw('mpl')
-    plt.show()
+    return qc
+
+
+def plot_amplitudes(ax, result, hatch='///'):
+    """Bar chart of the real and imaginary amplitudes of a StatevectorResult or MPSResult
+
+    ``hatch`` marks the imaginary bars; None draws them plain, which is
+    several times faster to redraw.
+    """
+    if not hasattr(result, "state"):
+        # MPS: exact amplitudes of the basis states that sampling finds most often
+        labels, amplitudes = result.likely_amplitudes(MAX_PLOTTED_STATES)
+        if result.num_qubits > WIDE_LABEL_QUBITS:
+            labels = [f"0x{int(label, 2):x}" for label in labels]
+    else:
+        state = result.state
+        if len(state) > MAX_PLOTTED_STATES:
+            # Only the most likely basis states for large registers
+            indices = np.sort(np.argsort(result.probabilities())[-MAX_PLOTTED_STATES:])
+        else:
+            indices = np.arange(len(state))
+        labels = [format(i, f"0{result.num_qubits}b") for i in indices]
+        amplitudes = state[indices]
+
+    x_pos = np.arange(len(labels))
+    ax.bar(x_pos, amplitudes.real, 0.35, label="Real", alpha=0.7, color='#3498DB')
+    ax.bar(x_pos + 0.35, amplitudes.imag, 0.35, label="Imag", alpha=0.7,
+           color='#E74C3C', hatch=hatch)
+    ax.set_xticks(x_pos + 0.175)
+    ax.set_xticklabels([f"|{label}⟩" for label in labels], rotation=90 if len(labels) > 8 else 0)
+    ax.set_ylabel('Amplitude')
+    ax.set_title('Statevector before measurement' if hasattr(result, "state")
+                 else 'Most likely basis states before measurement (MPS)')
+    ax.legend(loc='upper right')
 
-if __name__ == "__main__":
-    draw_circuit()
 
+def circuit_figures(qc, optimized=False):
+    """Return (circuit drawing, amplitude plot, StatevectorResult) for a circuit
 
+    With ``optimized`` the circuit first goes through the optimizer's passes,
+    both figures show the result and the drawing is titled with the pass report.
+    """
+    circuit = qc
+    report = None
+    if optimized:
+        from qiskit import QuantumCircuit
+        optimization = optimize(qc)
+        circuit, report = optimization.circuit, optimization.report
+        # Fused gates carry exact matrices; the drawing only needs their angles
+        qc = QuantumCircuit.from_qasm_str(dumps_qasm(*circuit))
+    circuit_fig = qc.draw('mpl')
+    if report is not None:
+        circuit_fig.suptitle(format_report(report), fontsize=8)
+
+    # Simulate the circuit and show its amplitudes next to the drawing
+    result = StatevectorSimulator().run(circuit)
+    amplitude_fig, ax = plt.subplots(figsize=(6, 4))
+    plot_amplitudes(ax, result)
+    amplitude_fig.tight_layout()
+    return circuit_fig, amplitude_fig, result
+
+
+def draw_circuit(qc=None, show=True, optimized=False):
+    if qc is None:
+        qc = sample_circuit()
+
+    _, _, result = circuit_figures(qc, optimized)
+
+    if show:
+        plt.show()
+    return result
+
+if __name__ == "__main__":
+    draw_circuit()
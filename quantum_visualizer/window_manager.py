@@ -0,0 +1,127 @@
+import gc
+
+from PyQt6.QtCore import QEvent, QObject, Qt, QTimer
+
+
+def current_rss():
+    """Resident set size of this process in bytes, or None where /proc is unavailable"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def format_bytes(size):
+    if size is None:
+        return "n/a"
+    sign = "-" if size < 0 else ""
+    return f"{sign}{abs(size) / 2 ** 20:.1f} MiB"
+
+
+def figure_canvases(window):
+    """Every matplotlib canvas embedded in a Qt window"""
+    from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
+    return window.findChildren(FigureCanvasQTAgg)
+
+
+def release_window(window):
+    """Stop a visualization window's timers and free its figures.
+
+    Animators and Bloch grids are detached from their canvases, background
+    jobs are cancelled, recordings are closed, every QTimer owned by the
+    window is stopped, each figure is cleared and the Python
+    attributes that tie canvases, closures and timers to the window are
+    dropped so the whole graph can be collected once Qt deletes the widget.
+    """
+    animator = getattr(window, "animator", None)
+    if animator is not None:
+        animator.disconnect()
+    grid = getattr(window, "grid", None)
+    if grid and grid[0] is not None:
+        grid[0].disconnect()
+    jobs = getattr(window, "jobs", None)
+    if jobs is not None:
+        jobs.shutdown()
+    trajectory = getattr(window, "trajectory", None)
+    if trajectory is not None:
+        trajectory.release()
+    timer = getattr(window, "timer", None)
+    if timer is not None:
+        timer.stop()
+    for child_timer in window.findChildren(QTimer):
+        child_timer.stop()
+
+    for canvas in figure_canvases(window):
+        canvas.figure.clear()
+    vars(window).clear()
+
+
+class WindowManager(QObject):
+    """Opens one window per visualization kind and frees it when it closes.
+
+    ``open(kind, factory)`` raises the existing window of that kind if there
+    is one and only calls ``factory`` otherwise. Windows are deleted on close
+    and released with ``release_window``.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.windows = {}  # kind -> QWidget
+        self.rss_at_open = {}  # kind -> RSS growth while the window was built
+
+    def open(self, kind, factory):
+        window = self.windows.get(kind)
+        if window is not None:
+            window.showNormal()
+            window.raise_()
+            window.activateWindow()
+            return window
+
+        before = current_rss()
+        window = factory()
+        after = current_rss()
+        window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        window.installEventFilter(self)
+        self.windows[kind] = window
+        self.rss_at_open[kind] = None if before is None else after - before
+        return window
+
+    def close_all(self):
+        for window in list(self.windows.values()):
+            window.close()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Close:
+            for kind, window in list(self.windows.items()):
+                if window is obj:
+                    del self.windows[kind]
+                    self.rss_at_open.pop(kind, None)
+                    release_window(window)
+        return False
+
+    def memory_report(self):
+        """Text table of open windows with their figures and memory use"""
+        import matplotlib.pyplot as plt
+        from matplotlib.figure import Figure
+        gc.collect()
+        live_figures = sum(isinstance(obj, Figure) for obj in gc.get_objects())
+
+        rows = []
+        for kind, window in self.windows.items():
+            canvases = figure_canvases(window)
+            pixels = sum(c.get_width_height()[0] * c.get_width_height()[1] for c in canvases)
+            rows.append((kind, len(canvases), pixels * 4, self.rss_at_open.get(kind)))
+
+        lines = [f"Process RSS: {format_bytes(current_rss())}",
+                 f"Live figures: {live_figures} (pyplot registry: {len(plt.get_fignums())})",
+                 "",
+                 f"{'Window':<18}{'Figures':>8}{'Agg buffers':>14}{'RSS at open':>14}"]
+        for kind, count, buffers, rss in rows:
+            lines.append(f"{kind:<18}{count:>8}{format_bytes(buffers):>14}{format_bytes(rss):>14}")
+        if not rows:
+            lines.append("(no open windows)")
+        return "\n".join(lines)